@@ -0,0 +1,123 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Micro-benchmark for job attachments file hashing. Reports the hashing throughput in GB/s of each
+file read mode of `hash_file`, and of the THREAD and PROCESS hashing backends, over a set of files.
+
+Usage:
+    python scripts/benchmark_hashing.py [--file-size-mb 256] [--file-count 8] [--directory DIR]
+"""
+
+import argparse
+import concurrent.futures
+import io
+import os
+import tempfile
+import time
+from typing import Callable, List
+
+from deadline.job_attachments._hashing import (
+    HashingBackend,
+    hash_file_in_pool,
+    hashing_process_pool,
+)
+from deadline.job_attachments.asset_manifests.hash_algorithms import (
+    HashAlgorithm,
+    HashFileReadMode,
+    hash_file,
+)
+
+
+def _hash_file_with_default_buffer(file_path: str, hash_alg: HashAlgorithm) -> str:
+    """The original implementation of hash_file, which reads io.DEFAULT_BUFFER_SIZE chunks, as a baseline."""
+    from xxhash import xxh3_128
+
+    hasher = xxh3_128()
+    with open(file_path, "rb") as file:
+        while True:
+            chunk = file.read(io.DEFAULT_BUFFER_SIZE)
+            if not chunk:
+                break
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def _create_files(directory: str, file_size: int, file_count: int) -> List[str]:
+    file_paths = []
+    block = os.urandom(min(file_size, 16 * 1024 * 1024))
+    for i in range(file_count):
+        file_path = os.path.join(directory, f"file_{i}.bin")
+        with open(file_path, "wb") as file:
+            remaining = file_size
+            while remaining > 0:
+                remaining -= file.write(block[:remaining])
+        file_paths.append(file_path)
+    return file_paths
+
+
+def _report(name: str, total_bytes: int, run: Callable[[], None]) -> None:
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<32} {total_bytes / elapsed / 1e9:8.3f} GB/s  ({elapsed:.3f} s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--file-size-mb", type=int, default=256, help="Size of each file in MiB.")
+    parser.add_argument("--file-count", type=int, default=8, help="Number of files to hash.")
+    parser.add_argument(
+        "--directory",
+        help="Directory to create the files in, e.g. on the file system to benchmark. Defaults to a temporary directory.",
+    )
+    args = parser.parse_args()
+
+    file_size = args.file_size_mb * 1024 * 1024
+    total_bytes = file_size * args.file_count
+    hash_alg = HashAlgorithm.XXH128
+
+    with tempfile.TemporaryDirectory(dir=args.directory) as directory:
+        file_paths = _create_files(directory, file_size, args.file_count)
+        print(f"Hashing {args.file_count} files of {args.file_size_mb} MiB in {directory}")
+        # Warm the page cache so that every mode reads the files from memory.
+        for file_path in file_paths:
+            hash_file(file_path, hash_alg)
+
+        _report(
+            "8 KiB reads (original)",
+            total_bytes,
+            lambda: [_hash_file_with_default_buffer(path, hash_alg) for path in file_paths],
+        )
+        for read_mode in HashFileReadMode:
+            _report(
+                f"read mode {read_mode.value}",
+                total_bytes,
+                lambda: [hash_file(path, hash_alg, read_mode) for path in file_paths],
+            )
+
+        for backend in HashingBackend:
+            with hashing_process_pool(backend) as process_pool:
+
+                def hash_all_files() -> None:
+                    with concurrent.futures.ThreadPoolExecutor() as executor:
+                        futures = [
+                            executor.submit(
+                                hash_file_in_pool,
+                                hash_file,
+                                path,
+                                hash_alg,
+                                file_size,
+                                process_pool,
+                            )
+                            for path in file_paths
+                        ]
+                        for future in concurrent.futures.as_completed(futures):
+                            future.result()
+
+                _report(f"{backend.value} backend, all files", total_bytes, hash_all_files)
+
+
+if __name__ == "__main__":
+    main()
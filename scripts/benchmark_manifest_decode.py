@@ -0,0 +1,75 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Micro-benchmark for decoding job attachments manifests. Reports the time to decode a generated
+v2023-03-03 manifest with the default fast structural validation, and with strict validation against
+the full JSON schema.
+
+Usage:
+    python scripts/benchmark_manifest_decode.py [--path-count 1000000] [--repeat 3]
+"""
+
+import argparse
+import time
+from typing import Any, Callable, List
+
+from deadline.job_attachments.asset_manifests.base_manifest import BaseManifestPath
+from deadline.job_attachments.asset_manifests.decode import decode_manifest
+from deadline.job_attachments.asset_manifests.hash_algorithms import HashAlgorithm
+from deadline.job_attachments.asset_manifests.v2023_03_03 import AssetManifest, ManifestPath
+
+
+def _generate_manifest(path_count: int) -> str:
+    paths: List[BaseManifestPath] = [
+        ManifestPath(
+            path=f"renders/shot_{i // 1000:04d}/frame_{i:07d}.exr",
+            hash=f"{i:032x}",
+            size=i,
+            mtime=1679079744833848 + i,
+        )
+        for i in range(path_count)
+    ]
+    manifest = AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=paths,
+        total_size=sum(path.size for path in paths),
+    )
+    return manifest.encode()
+
+
+def _report(name: str, path_count: int, repeat: int, run: Callable[[], Any]) -> None:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<24} {best:8.3f} s  ({path_count / best / 1e6:.2f} M paths/s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument(
+        "--path-count", type=int, default=1_000_000, help="Number of paths in the manifest."
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of times to decode, reporting the fastest."
+    )
+    args = parser.parse_args()
+
+    print(f"Generating a manifest with {args.path_count} paths...")
+    manifest_str = _generate_manifest(args.path_count)
+    print(f"Manifest size: {len(manifest_str) / 1e6:.1f} MB")
+
+    _report("fast (default)", args.path_count, args.repeat, lambda: decode_manifest(manifest_str))
+    _report(
+        "strict",
+        args.path_count,
+        args.repeat,
+        lambda: decode_manifest(manifest_str, strict=True),
+    )
+
+
+if __name__ == "__main__":
+    main()
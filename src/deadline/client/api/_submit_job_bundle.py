@@ -19,7 +19,7 @@ from deadline.client.api._job_attachment import _hash_attachments  # type: ignor
 
 from .. import api
 from ..exceptions import DeadlineOperationError, CreateJobWaiterCanceled
-from ..config import get_setting, set_setting, config_file
+from ..config import get_setting, set_setting, config_file, str2bool
 from ..job_bundle import deadline_yaml_dump
 from ..job_bundle.loader import (
     read_yaml_or_json,
@@ -34,11 +34,13 @@ from ..job_bundle.parameters import (
     JobParameter,
 )
 from ..job_bundle.submission import AssetReferences, split_parameter_args
+from ...job_attachments._discovery import scan_directories
 from ...job_attachments.exceptions import MisconfiguredInputsError
 from ...job_attachments.models import (
     JobAttachmentsFileSystem,
     AssetRootManifest,
     AssetUploadGroup,
+    FileRecord,
     JobAttachmentS3Settings,
 )
 from ...job_attachments.progress_tracker import ProgressReportMetadata
@@ -222,6 +224,7 @@ def create_job_from_job_bundle(
     if asset_references and "jobAttachmentSettings" in queue:
         # Extend input_filenames with all the files in the input_directories
         missing_directories: set[str] = set()
+        existing_directories: list[str] = []
         for directory in asset_references.input_directories:
             if not os.path.isdir(directory):
                 if require_paths_exist:
@@ -232,19 +235,20 @@ def create_job_from_job_bundle(
                     )
                     asset_references.referenced_paths.add(directory)
                 continue
+            existing_directories.append(directory)
 
-            is_dir_empty = True
-            for root, _, files in os.walk(directory):
-                if not files:
-                    continue
-                is_dir_empty = False
-                asset_references.input_filenames.update(
-                    os.path.normpath(os.path.join(root, file)) for file in files
-                )
+        # Keep the record of each file found, so the files aren't queried again when they're grouped and hashed.
+        file_records: dict[str, FileRecord] = {}
+        for directory, scan_result in scan_directories(existing_directories).items():
             # Empty directories just become references since there's nothing to upload
-            if is_dir_empty:
+            if not scan_result.file_records and not scan_result.unreadable_file_paths:
                 logger.info(f"Input directory '{directory}' is empty. Adding to referenced paths.")
                 asset_references.referenced_paths.add(directory)
+                continue
+            for file_record in scan_result.file_records:
+                file_records[file_record.path] = file_record
+                asset_references.input_filenames.add(file_record.path)
+            asset_references.input_filenames.update(scan_result.unreadable_file_paths)
         asset_references.input_directories.clear()
 
         if missing_directories:
@@ -278,24 +282,37 @@ def create_job_from_job_bundle(
             referenced_paths=sorted(asset_references.referenced_paths),
             storage_profile=storage_profile,
             require_paths_exist=require_paths_exist,
+            file_records=file_records,
         )
         if upload_group.asset_groups:
             if decide_cancel_submission_callback(upload_group):
                 print_function_callback("Job submission canceled.")
                 return None
 
-            _, asset_manifests = _hash_attachments(
-                asset_manager=asset_manager,
-                asset_groups=upload_group.asset_groups,
-                total_input_files=upload_group.total_input_files,
-                total_input_bytes=upload_group.total_input_bytes,
-                print_function_callback=print_function_callback,
-                hashing_progress_callback=hashing_progress_callback,
-            )
+            if str2bool(get_setting("settings.overlap_hashing_and_upload", config=config)):
+                attachment_settings = _hash_and_upload_attachments(  # type: ignore
+                    asset_manager,
+                    upload_group,
+                    print_function_callback,
+                    hashing_progress_callback,
+                    upload_progress_callback,
+                )
+            else:
+                _, asset_manifests = _hash_attachments(
+                    asset_manager=asset_manager,
+                    asset_groups=upload_group.asset_groups,
+                    total_input_files=upload_group.total_input_files,
+                    total_input_bytes=upload_group.total_input_bytes,
+                    print_function_callback=print_function_callback,
+                    hashing_progress_callback=hashing_progress_callback,
+                )
 
-            attachment_settings = _upload_attachments(  # type: ignore
-                asset_manager, asset_manifests, print_function_callback, upload_progress_callback
-            )
+                attachment_settings = _upload_attachments(  # type: ignore
+                    asset_manager,
+                    asset_manifests,
+                    print_function_callback,
+                    upload_progress_callback,
+                )
             attachment_settings["fileSystem"] = JobAttachmentsFileSystem(
                 job_attachments_file_system
             )
@@ -436,3 +453,46 @@ def _upload_attachments(
     print_function_callback(textwrap.indent(str(upload_summary), "    "))
 
     return attachment_settings.to_dict()
+
+
+@api.record_success_fail_telemetry_event(metric_name="cli_asset_upload")  # type: ignore
+def _hash_and_upload_attachments(
+    asset_manager: S3AssetManager,
+    upload_group: AssetUploadGroup,
+    print_function_callback: Callable = lambda msg: None,
+    hashing_progress_callback: Optional[Callable] = None,
+    upload_progress_callback: Optional[Callable] = None,
+    config: Optional[ConfigParser] = None,
+) -> Dict[str, Any]:
+    """
+    Starts the job attachments hashing and upload as a pipeline, uploading each file as soon as it's
+    hashed, and handles the progress reporting callbacks. Returns the attachment settings from the upload.
+    """
+
+    def _default_update_progress(progress_metadata: Dict[str, str]) -> bool:
+        return True
+
+    if not hashing_progress_callback:
+        hashing_progress_callback = _default_update_progress
+    if not upload_progress_callback:
+        upload_progress_callback = _default_update_progress
+
+    hashing_summary, upload_summary, _, attachment_settings = asset_manager.hash_and_upload_assets(
+        asset_groups=upload_group.asset_groups,
+        total_input_files=upload_group.total_input_files,
+        total_input_bytes=upload_group.total_input_bytes,
+        hash_cache_dir=config_file.get_cache_directory(),
+        s3_check_cache_dir=config_file.get_cache_directory(),
+        on_preparing_to_submit=hashing_progress_callback,
+        on_uploading_assets=upload_progress_callback,
+    )
+    telemetry_client = api.get_deadline_cloud_library_telemetry_client(config=config)
+    telemetry_client.record_hashing_summary(hashing_summary)
+    telemetry_client.record_upload_summary(upload_summary)
+
+    print_function_callback("Hashing Summary:")
+    print_function_callback(textwrap.indent(str(hashing_summary), "    "))
+    print_function_callback("Upload Summary:")
+    print_function_callback(textwrap.indent(str(upload_summary), "    "))
+
+    return attachment_settings.to_dict()
@@ -232,9 +232,11 @@ def _download_job_output(
     step_id: Optional[str],
     task_id: Optional[str],
     is_json_format: bool = False,
+    resume: bool = False,
 ):
     """
     Starts the download of job output and handles the progress reporting callback.
+    If `resume` is True, an interrupted download of the output is resumed.
     """
     deadline = api.get_boto3_client("deadline", config=config)
 
@@ -407,6 +409,9 @@ def _download_job_output(
             return job_output_downloader.download_job_output(
                 file_conflict_resolution=file_conflict_resolution,
                 on_downloading_files=on_downloading_files,
+                download_journal_dir=config_file.get_cache_directory(),
+                resume=resume,
+                hash_cache_dir=config_file.get_cache_directory(),
             )
 
         if not is_json_format:
@@ -605,13 +610,15 @@ def _assert_valid_path(path: str) -> None:
             FileConflictResolution.SKIP.name,
             FileConflictResolution.OVERWRITE.name,
             FileConflictResolution.CREATE_COPY.name,
+            FileConflictResolution.SYNC.name,
         ],
         case_sensitive=False,
     ),
     help="How to handle downloads if a file already exists:\n"
     "CREATE_COPY (default): Download the file with a new name, appending '(1)' to the end\n"
     "SKIP: Do not download the file\n"
-    "OVERWRITE: Download and replace the existing file",
+    "OVERWRITE: Download and replace the existing file\n"
+    "SYNC: Download and replace the existing file only if its contents differ",
 )
 @click.option(
     "--yes",
@@ -629,8 +636,13 @@ def _assert_valid_path(path: str) -> None:
     "JSON: Displays messages in JSON line format, so that the info can be easily "
     "parsed/consumed by custom scripts.",
 )
+@click.option(
+    "--resume",
+    is_flag=True,
+    help="Resume an interrupted download of the output, skipping the files that it completed.",
+)
 @_handle_error
-def job_download_output(step_id, task_id, output, **args):
+def job_download_output(step_id, task_id, output, resume, **args):
     """
     Download a job's output.
     """
@@ -647,7 +659,9 @@ def job_download_output(step_id, task_id, output, **args):
     is_json_format = True if output == "json" else False
 
     try:
-        _download_job_output(config, farm_id, queue_id, job_id, step_id, task_id, is_json_format)
+        _download_job_output(
+            config, farm_id, queue_id, job_id, step_id, task_id, is_json_format, resume
+        )
     except Exception as e:
         if is_json_format:
             error_one_liner = str(e).replace("\n", ". ")
@@ -125,6 +125,90 @@ SETTINGS: Dict[str, Dict[str, Any]] = {
             "This multiplier is used to calculate the size threshold. (Small files are defined as those smaller than or equal to the chunk size multiplied by this factor.)"
         ),
     },
+    "settings.file_hashing_backend": {
+        "default": "THREAD",
+        "description": (
+            "Where job attachments hashes files. THREAD hashes files on threads of the current process. "
+            "PROCESS also starts a process per CPU core to hash large files in, which can be faster for large files on machines with many cores. "
+            "(Note: PROCESS starts new Python processes, so only use it where the Python executable is a standalone interpreter, not an application such as a DCC.)"
+        ),
+    },
+    "settings.large_file_upload_mode": {
+        "default": "SERIAL",
+        "description": (
+            "How job attachments uploads 'large' files (see 'small_file_threshold_multiplier'.) SERIAL uploads them one at a time after the small files, "
+            "which wastes less bandwidth if an upload is cancelled. CONCURRENT uploads several of them at once alongside the small files, "
+            "within the 'upload_max_megabytes_in_flight' and 's3_max_pool_connections' limits, which can use more of a fast network connection."
+        ),
+    },
+    "settings.upload_max_megabytes_in_flight": {
+        "default": "2048",
+        "description": (
+            "The maximum total size, in megabytes, of the files that job attachments uploads at once. "
+            "Together with 's3_max_pool_connections', this limits the uploads in flight."
+        ),
+    },
+    "settings.overlap_hashing_and_upload": {
+        "default": "false",
+        "description": (
+            "When submitting a job with job attachments, whether to upload each input file as soon as it is hashed, "
+            "rather than hashing all of the input files before uploading any of them."
+        ),
+    },
+    "settings.adaptive_transfer_concurrency": {
+        "default": "false",
+        "description": (
+            "Whether job attachments adjusts how many files it transfers to and from S3 at once while transferring, "
+            "reducing it when S3 throttles requests or latency spikes, and increasing it while throughput rises, "
+            "up to 's3_max_pool_connections'."
+        ),
+    },
+    "settings.manifest_cache_megabytes": {
+        "default": "0",
+        "description": (
+            "The maximum size, in megabytes, of the local cache of job attachments manifests downloaded from S3. "
+            "Cached manifests are checked against S3 with a conditional request instead of being downloaded and decoded again. "
+            "If this value is 0, manifests are not cached."
+        ),
+    },
+    "settings.download_cache_megabytes": {
+        "default": "0",
+        "description": (
+            "The maximum size, in megabytes, of the cache of job attachments files shared by the sessions on this host. "
+            "Files that a previous session downloaded are copied from the cache instead of being downloaded again. "
+            "If this value is 0, downloaded files are not cached."
+        ),
+    },
+    "settings.download_cache_hardlinks": {
+        "default": "false",
+        "description": (
+            "Whether files from the download cache are hardlinked into session directories instead of copied. "
+            "Hardlinks take no extra space, but a session that modifies a hardlinked input file also modifies the cached file. "
+            "Files are always copied for sessions that set the group and permissions of their files, such as those that run as a job user."
+        ),
+    },
+    "settings.small_file_download_threshold_megabytes": {
+        "default": "8",
+        "description": (
+            "The size, in megabytes, up to which job attachments files are downloaded with a single S3 request, "
+            "using the file size from the manifest. Larger files are downloaded by the S3 transfer manager, in multiple parts over 8 megabytes. "
+            "If this value is 0, only empty files are downloaded with a single request."
+        ),
+    },
+    "settings.large_file_download_part_megabytes": {
+        "default": "0",
+        "description": (
+            "The size, in megabytes, of the parts in which large job attachments files are downloaded concurrently "
+            "and written directly into place. If this value is 0, large files are downloaded by the S3 transfer manager."
+        ),
+    },
+    "settings.large_file_download_max_concurrency": {
+        "default": "10",
+        "description": (
+            "The maximum number of parts of a large job attachments file downloaded at once, "
+            "when 'large_file_download_part_megabytes' is set."
+        ),
+    },
 }
 
 
@@ -102,8 +102,17 @@ def get_s3_max_pool_connections() -> int:
 
 
 @lru_cache(maxsize=MAX_SIZE_CACHE)
-def get_s3_transfer_manager(s3_client: BaseClient):
-    transfer_config = boto3.s3.transfer.TransferConfig()
+def get_s3_transfer_manager(s3_client: BaseClient, max_concurrency: Optional[int] = None):
+    """
+    Get a transfer manager of the given S3 client. If `max_concurrency` is given, the transfer
+    manager makes up to that many requests at once, across all of its transfers, and holds up to
+    that many parts of uploads in memory. Otherwise, it uses the defaults of boto3's TransferConfig.
+    """
+    transfer_config = boto3.s3.transfer.TransferConfig(max_concurrency=max_concurrency)
+    if max_concurrency is not None:
+        # These aren't arguments of boto3's TransferConfig, but are read by the transfer manager.
+        transfer_config.max_submission_concurrency = max_concurrency
+        transfer_config.max_in_memory_upload_chunks = max_concurrency
     return create_transfer_manager(client=s3_client, config=transfer_config)
 
 
@@ -0,0 +1,54 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Submission of tasks to executors with a bounded number of them pending at once.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+from typing import Any, Callable, Iterable, Iterator, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+# The most tasks that are submitted and not yet completed at once. This is well above the number of
+# workers of any executor, so that workers never wait for tasks, while keeping the memory used by the
+# pending futures (and their results) independent of the number of files.
+MAX_PENDING_TASKS = 1000
+
+
+def as_completed_bounded(
+    submissions: Iterable[Tuple[concurrent.futures.Executor, Callable[..., T], Tuple[Any, ...]]],
+    max_pending: int = MAX_PENDING_TASKS,
+) -> Iterator[concurrent.futures.Future[T]]:
+    """
+    Submits each (executor, function, arguments) of the given submissions, and yields the futures of
+    the tasks as they complete. Submissions are taken from the iterable only while fewer than
+    `max_pending` tasks are pending, so a generator of submissions is never expanded all at once,
+    and there are never more than `max_pending` futures held at once.
+
+    If iteration is stopped early, e.g. because the result of a task raised an exception, the tasks
+    that haven't started yet are cancelled.
+    """
+    if max_pending <= 0:
+        raise ValueError(
+            f"The maximum number of pending tasks must be positive, got {max_pending}."
+        )
+
+    pending: Set[concurrent.futures.Future[T]] = set()
+    try:
+        for executor, function, args in submissions:
+            if len(pending) >= max_pending:
+                done, pending = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                yield from done
+            pending.add(executor.submit(function, *args))
+
+        while pending:
+            done, pending = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            yield from done
+    finally:
+        for future in pending:
+            future.cancel()
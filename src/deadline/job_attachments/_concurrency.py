@@ -0,0 +1,287 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Adaptive control of how many S3 transfers run at once.
+"""
+from __future__ import annotations
+
+import logging
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Generator, List, Optional, Set, TypeVar
+
+from botocore.client import BaseClient
+
+from deadline.client.config import config_file
+
+from .exceptions import AssetSyncError
+from .progress_tracker import ProgressTracker
+
+logger = logging.getLogger("deadline.job_attachments")
+
+# How often (in seconds) the controller measures the throughput and adjusts the concurrency.
+ADAPTIVE_CONCURRENCY_SAMPLE_INTERVAL: float = 1.0
+# Throughput must rise by at least this fraction over the previous sample for the concurrency to grow.
+ADAPTIVE_CONCURRENCY_THROUGHPUT_GAIN: float = 0.05
+# A sample's median request latency above this multiple of the lowest seen counts as a latency spike.
+ADAPTIVE_CONCURRENCY_LATENCY_SPIKE_FACTOR: float = 3.0
+# The factors the concurrency is multiplied by on throttling, and on a latency spike.
+ADAPTIVE_CONCURRENCY_THROTTLE_DECREASE: float = 0.5
+ADAPTIVE_CONCURRENCY_LATENCY_DECREASE: float = 0.75
+
+# The error codes and HTTP status codes with which S3 throttles requests.
+S3_THROTTLING_ERROR_CODES = {"SlowDown", "Throttling", "RequestLimitExceeded", "TooManyRequests"}
+S3_THROTTLING_STATUS_CODES = {429, 503}
+
+T = TypeVar("T")
+
+
+class AdaptiveConcurrencyController:
+    """
+    Adjusts how many S3 transfers run at once with additive increase, multiplicative decrease (AIMD.)
+
+    Each transfer holds a slot while it runs, and at most `limit` slots are held at once. Once per
+    sample interval, as a slot is released, the controller:
+      - halves the limit if any request was throttled (e.g. a 503 SlowDown) during the sample,
+      - otherwise reduces the limit by a quarter if the median request latency spiked,
+      - otherwise grows the limit by one if all of the slots were in use and the throughput rose.
+
+    Throughput is measured from the processed bytes of the given progress tracker, or from the bytes
+    of the completed transfers if there is none. Throttling and latency are measured from the requests
+    of the S3 clients being monitored (see `monitor`.)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        max_limit: int,
+        min_limit: int = 1,
+        progress_tracker: Optional[ProgressTracker] = None,
+        sample_interval: float = ADAPTIVE_CONCURRENCY_SAMPLE_INTERVAL,
+    ) -> None:
+        self.name = name
+        self.min_limit = max(min_limit, 1)
+        self.max_limit = max(max_limit, self.min_limit)
+        self.limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.in_flight = 0
+
+        self._condition = threading.Condition()
+        self._progress_tracker = progress_tracker
+        self._sample_interval = sample_interval
+        self._completed_bytes = 0
+        self._sample_start_time = time.monotonic()
+        self._sample_start_bytes = self._get_transferred_bytes()
+        self._last_throughput: Optional[float] = None
+        self._lowest_latency: Optional[float] = None
+        self._sample_latencies: List[float] = []
+        self._sample_throttled = False
+        self._sample_limit_reached = False
+
+    @contextmanager
+    def slot(self, num_bytes: int = 0) -> Generator[None, None, None]:
+        """Holds a slot for a transfer of the given size while in context, waiting for one to be free."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+            if self.in_flight >= self.limit:
+                self._sample_limit_reached = True
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= 1
+                self._completed_bytes += num_bytes
+                self._adjust()
+                self._condition.notify_all()
+
+    def record_throttle(self) -> None:
+        with self._condition:
+            self._sample_throttled = True
+
+    def record_latency(self, seconds: float) -> None:
+        with self._condition:
+            self._sample_latencies.append(seconds)
+
+    @contextmanager
+    def monitor(self, s3_client: BaseClient) -> Generator[None, None, None]:
+        """Receives the throttling and latency of the requests made with the given S3 client while in context."""
+        emitter_id = _register_signal_handlers(s3_client)
+        with _controllers_lock:
+            _controllers_by_emitter.setdefault(emitter_id, set()).add(self)
+        try:
+            yield
+        finally:
+            with _controllers_lock:
+                _controllers_by_emitter[emitter_id].discard(self)
+
+    def _get_transferred_bytes(self) -> int:
+        if self._progress_tracker is not None:
+            return self._progress_tracker.processed_bytes
+        return self._completed_bytes
+
+    def _adjust(self) -> None:
+        """Ends the current sample and adjusts the limit, if the sample interval has passed. Requires the lock."""
+        now = time.monotonic()
+        elapsed = now - self._sample_start_time
+        if elapsed <= 0 or elapsed < self._sample_interval:
+            return
+
+        transferred_bytes = self._get_transferred_bytes()
+        throughput = (transferred_bytes - self._sample_start_bytes) / elapsed
+        latency = statistics.median(self._sample_latencies) if self._sample_latencies else None
+
+        previous_limit = self.limit
+        if self._sample_throttled:
+            self.limit = max(
+                self.min_limit, int(self.limit * ADAPTIVE_CONCURRENCY_THROTTLE_DECREASE)
+            )
+            reason = "requests were throttled"
+        elif (
+            latency is not None
+            and self._lowest_latency is not None
+            and latency > self._lowest_latency * ADAPTIVE_CONCURRENCY_LATENCY_SPIKE_FACTOR
+        ):
+            self.limit = max(
+                self.min_limit, int(self.limit * ADAPTIVE_CONCURRENCY_LATENCY_DECREASE)
+            )
+            reason = f"latency spiked above {self._lowest_latency:.3f}s"
+        elif self._sample_limit_reached and (
+            self._last_throughput is None
+            or throughput > self._last_throughput * (1 + ADAPTIVE_CONCURRENCY_THROUGHPUT_GAIN)
+        ):
+            self.limit = min(self.max_limit, self.limit + 1)
+            reason = "throughput rose"
+        else:
+            reason = "throughput held"
+
+        latency_message = f"{latency:.3f}s" if latency is not None else "n/a"
+        logger.log(
+            logging.INFO if self.limit != previous_limit else logging.DEBUG,
+            f"Adaptive {self.name} concurrency: {previous_limit} -> {self.limit} ({reason}; "
+            f"throughput {throughput / 1e6:.2f} MB/s, median latency {latency_message}, "
+            f"{len(self._sample_latencies)} requests)",
+        )
+
+        if latency is not None:
+            self._lowest_latency = (
+                latency if self._lowest_latency is None else min(self._lowest_latency, latency)
+            )
+        self._last_throughput = throughput
+        self._sample_start_time = now
+        self._sample_start_bytes = transferred_bytes
+        self._sample_latencies = []
+        self._sample_throttled = False
+        self._sample_limit_reached = False
+
+
+def is_adaptive_concurrency_enabled() -> bool:
+    """Returns whether the 'settings.adaptive_transfer_concurrency' configuration setting is on."""
+    setting_value = config_file.get_setting("settings.adaptive_transfer_concurrency")
+    try:
+        return config_file.str2bool(setting_value)
+    except ValueError as ve:
+        raise AssetSyncError(
+            "Nonvalid value for configuration setting: 'adaptive_transfer_concurrency' "
+            f"({setting_value}) must be a boolean value."
+        ) from ve
+
+
+@contextmanager
+def adaptive_concurrency(
+    name: str,
+    s3_client: Optional[BaseClient],
+    initial_limit: int,
+    max_limit: int,
+    progress_tracker: Optional[ProgressTracker] = None,
+) -> Generator[Optional[AdaptiveConcurrencyController], None, None]:
+    """
+    Yields a controller monitoring the given S3 client if adaptive concurrency is enabled in the
+    configuration, and None otherwise, in which case the caller uses `initial_limit` workers.
+    """
+    if s3_client is None or not is_adaptive_concurrency_enabled():
+        yield None
+        return
+
+    controller = AdaptiveConcurrencyController(
+        name=name,
+        initial_limit=initial_limit,
+        max_limit=max_limit,
+        progress_tracker=progress_tracker,
+    )
+    with controller.monitor(s3_client):
+        yield controller
+    logger.info(f"Adaptive {name} concurrency finished at {controller.limit}.")
+
+
+def call_in_slot(
+    controller: Optional[AdaptiveConcurrencyController],
+    num_bytes: int,
+    function: Callable[..., T],
+    *args: Any,
+) -> T:
+    """Calls the function with the given arguments, holding a slot of the controller (if any) meanwhile."""
+    if controller is None:
+        return function(*args)
+    with controller.slot(num_bytes):
+        return function(*args)
+
+
+# Controllers receive the signals of the S3 clients they monitor through handlers registered once on
+# each client's event emitter, since clients are cached and shared (see `get_s3_client`.)
+_controllers_lock = threading.Lock()
+_controllers_by_emitter: Dict[int, Set[AdaptiveConcurrencyController]] = {}
+# Requests are sent synchronously, so the send time of the current request is kept per thread.
+_request_timing = threading.local()
+
+
+def _get_controllers(emitter_id: int) -> List[AdaptiveConcurrencyController]:
+    with _controllers_lock:
+        return list(_controllers_by_emitter.get(emitter_id, ()))
+
+
+def _register_signal_handlers(s3_client: BaseClient) -> int:
+    events = s3_client.meta.events
+    emitter_id = id(events)
+
+    def on_before_send(**kwargs) -> None:
+        _request_timing.send_time = time.monotonic()
+
+    def on_response_received(**kwargs) -> None:
+        send_time = getattr(_request_timing, "send_time", None)
+        if send_time is None:
+            return
+        _request_timing.send_time = None
+        latency = time.monotonic() - send_time
+        for controller in _get_controllers(emitter_id):
+            controller.record_latency(latency)
+
+    def on_needs_retry(response: Any = None, **kwargs) -> None:
+        # This only observes retries. It returns None so that botocore's own handler decides on them.
+        if response is not None and _is_throttling_response(response):
+            for controller in _get_controllers(emitter_id):
+                controller.record_throttle()
+
+    events.register(
+        "before-send.s3", on_before_send, unique_id="deadline-adaptive-concurrency-before-send"
+    )
+    events.register(
+        "response-received.s3",
+        on_response_received,
+        unique_id="deadline-adaptive-concurrency-response-received",
+    )
+    events.register(
+        "needs-retry.s3", on_needs_retry, unique_id="deadline-adaptive-concurrency-needs-retry"
+    )
+    return emitter_id
+
+
+def _is_throttling_response(response: Any) -> bool:
+    """Returns whether the (HTTP response, parsed response) tuple of a needs-retry event is a throttling error."""
+    (http_response, parsed_response) = response
+    if getattr(http_response, "status_code", None) in S3_THROTTLING_STATUS_CODES:
+        return True
+    error_code = (parsed_response or {}).get("Error", {}).get("Code")
+    return error_code in S3_THROTTLING_ERROR_CODES
@@ -4,7 +4,7 @@ import concurrent.futures
 import logging
 import os
 from pathlib import Path, PurePosixPath
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from deadline.client.cli._groups.click_logger import ClickLogger
 from deadline.client.config import config_file
 from deadline.client.exceptions import NonValidInputError
@@ -12,7 +12,12 @@ from deadline.job_attachments.asset_manifests.base_manifest import (
     BaseAssetManifest,
     BaseManifestPath,
 )
-from deadline.job_attachments.caches.hash_cache import HashCache
+from deadline.job_attachments.asset_manifests.manifest_model import ManifestModelRegistry
+from deadline.job_attachments.asset_manifests.v2023_03_03 import (
+    AssetManifest,
+    ColumnarAssetManifest,
+)
+from deadline.job_attachments.caches.hash_cache import HashCache, HashCacheEntry
 from deadline.job_attachments.models import AssetRootManifest, FileStatus, ManifestDiff
 from deadline.job_attachments.upload import S3AssetManager
 
@@ -64,33 +69,67 @@ def find_file_with_status(
     cache_config: str = config_file.get_cache_directory()
 
     with HashCache(cache_config) as hash_cache:
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            futures = {
-                executor.submit(
-                    asset_manager._process_input_path,
-                    path=path,
-                    root_path=root_path,
-                    hash_cache=hash_cache,
-                    update=update,
-                ): path
-                for path in input_paths
-            }
-            status_paths: List[tuple] = []
-            for future in concurrent.futures.as_completed(futures):
-                (file_status, _, manifestPath) = future.result()
-                if file_status in statuses:
-                    status_paths.append((file_status, manifestPath))
-
-            return status_paths
+        # Load the hash cache entries for the whole root with a single query, and write the entries
+        # of new or modified files in batches.
+        cached_entries: Dict[str, HashCacheEntry] = hash_cache.get_entries(
+            os.path.join(str(Path(root_path).resolve()), ""),
+            ManifestModelRegistry.get_manifest_model(
+                version=asset_manager.manifest_version
+            ).AssetManifest.get_default_hash_alg(),
+        )
+        entries_to_update: List[HashCacheEntry] = []
+
+        try:
+            with concurrent.futures.ThreadPoolExecutor() as executor:
+                futures = {
+                    executor.submit(
+                        asset_manager._process_input_path,
+                        path=path,
+                        root_path=root_path,
+                        hash_cache=hash_cache,
+                        update=update,
+                        cached_entries=cached_entries,
+                        entries_to_update=entries_to_update,
+                    ): path
+                    for path in input_paths
+                }
+                status_paths: List[tuple] = []
+                for future in concurrent.futures.as_completed(futures):
+                    (file_status, _, manifestPath) = future.result()
+                    if file_status in statuses:
+                        status_paths.append((file_status, manifestPath))
+                    if len(entries_to_update) >= hash_cache.WRITE_BATCH_SIZE:
+                        hash_cache.flush_entries(entries_to_update)
+        finally:
+            hash_cache.flush_entries(entries_to_update)
+
+        return status_paths
 
 
 def compare_manifest(
-    reference_manifest: BaseAssetManifest, compare_manifest: BaseAssetManifest
+    reference_manifest: BaseAssetManifest,
+    compare_manifest: BaseAssetManifest,
+    include_unchanged: bool = True,
 ) -> List[(Tuple[FileStatus, BaseManifestPath])]:
     """
     Compares two manifests, reference_manifest acting as the base, and compare_manifest acting as manifest with changes.
-    Returns a list of FileStatus and BaseManifestPath
+    Returns a list of FileStatus and BaseManifestPath, without the unchanged paths if include_unchanged is False.
+    If either manifest is a ColumnarAssetManifest, the other v2023-03-03 manifest is compared in columnar form too.
     """
+    if isinstance(reference_manifest, ColumnarAssetManifest) or isinstance(
+        compare_manifest, ColumnarAssetManifest
+    ):
+        reference_columns = _as_columnar_manifest(reference_manifest)
+        compare_columns = _as_columnar_manifest(compare_manifest)
+        if (
+            reference_columns is not None
+            and compare_columns is not None
+            and reference_columns.has_fixed_width_hashes == compare_columns.has_fixed_width_hashes
+        ):
+            return _compare_columnar_manifests(
+                reference_columns, compare_columns, include_unchanged
+            )
+
     reference_dict: Dict[str, BaseManifestPath] = {
         manifest_path.path: manifest_path for manifest_path in reference_manifest.paths
     }
@@ -106,7 +145,7 @@ def compare_manifest(
             differences.append((FileStatus.NEW, manifest_path))
         elif reference_dict[file_path].hash != manifest_path.hash:
             differences.append((FileStatus.MODIFIED, manifest_path))
-        else:
+        elif include_unchanged:
             differences.append((FileStatus.UNCHANGED, manifest_path))
 
     # Find deleted files
@@ -117,6 +156,58 @@ def compare_manifest(
     return differences
 
 
+def _as_columnar_manifest(manifest: BaseAssetManifest) -> Optional[ColumnarAssetManifest]:
+    """Returns the manifest in columnar form, or None if it isn't a v2023-03-03 manifest."""
+    if isinstance(manifest, ColumnarAssetManifest):
+        return manifest
+    if isinstance(manifest, AssetManifest):
+        return ColumnarAssetManifest.from_manifest(manifest)
+    return None
+
+
+def _compare_columnar_manifests(
+    reference_manifest: ColumnarAssetManifest,
+    compare_manifest: ColumnarAssetManifest,
+    include_unchanged: bool = True,
+) -> List[(Tuple[FileStatus, BaseManifestPath])]:
+    """
+    Compares two columnar manifests as with `compare_manifest`, matching paths by index and comparing
+    their hashes as packed keys, so that a path object is only created for each entry returned.
+    """
+    reference_indices: Dict[str, int] = {
+        reference_manifest.get_path(index): index for index in range(len(reference_manifest.paths))
+    }
+    compare_indices: Dict[str, int] = {
+        compare_manifest.get_path(index): index for index in range(len(compare_manifest.paths))
+    }
+    reference_paths = reference_manifest.paths
+    compare_paths = compare_manifest.paths
+
+    differences: List[(Tuple[FileStatus, BaseManifestPath])] = []
+
+    # Find new files
+    for file_path, compare_index in compare_indices.items():
+        reference_index = reference_indices.get(file_path)
+        if reference_index is None:
+            status = FileStatus.NEW
+        elif reference_manifest.get_hash_key(reference_index) != compare_manifest.get_hash_key(
+            compare_index
+        ):
+            status = FileStatus.MODIFIED
+        elif include_unchanged:
+            status = FileStatus.UNCHANGED
+        else:
+            continue
+        differences.append((status, compare_paths[compare_index]))
+
+    # Find deleted files
+    for file_path, reference_index in reference_indices.items():
+        if file_path not in compare_indices:
+            differences.append((FileStatus.DELETED, reference_paths[reference_index]))
+
+    return differences
+
+
 def _fast_file_list_to_manifest_diff(
     root: str,
     current_files: List[str],
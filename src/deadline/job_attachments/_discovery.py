@@ -0,0 +1,114 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Functions for discovering the files under directories, querying each file system object only once.
+"""
+from __future__ import annotations
+
+import concurrent.futures
+import logging
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .models import FileRecord
+
+logger = logging.getLogger("deadline.job_attachments")
+
+
+@dataclass
+class DirectoryScanResult:
+    """Represents the files found under a directory"""
+
+    file_records: List[FileRecord] = field(default_factory=list)
+    # Files that were found but whose metadata couldn't be read, e.g. broken symbolic links.
+    unreadable_file_paths: List[str] = field(default_factory=list)
+
+
+def scan_directories(
+    directories: Iterable[str], max_workers: Optional[int] = None
+) -> Dict[str, DirectoryScanResult]:
+    """
+    Finds the files under each of the given directories, and returns them by directory.
+
+    Files are found as with `os.walk`: symbolic links to directories are not followed, while symbolic
+    links to files are included, with the size and modification time of the file they link to.
+    Each directory is listed once with `os.scandir`, which gets the type of each entry without another
+    query on most platforms, and each file is queried once for its metadata. Subdirectories are listed
+    in parallel, which hides the latency of each query on network file systems.
+    """
+    results: Dict[str, DirectoryScanResult] = {
+        directory: DirectoryScanResult() for directory in directories
+    }
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Maps the future for each directory being listed to the given directory it's under.
+        pending: Dict[concurrent.futures.Future, str] = {
+            executor.submit(_scan_directory, directory, str(Path(directory).resolve())): directory
+            for directory in results
+        }
+        while pending:
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                top_directory = pending.pop(future)
+                (file_records, unreadable_file_paths, subdirectories) = future.result()
+                results[top_directory].file_records.extend(file_records)
+                results[top_directory].unreadable_file_paths.extend(unreadable_file_paths)
+                for subdirectory, resolved_subdirectory in subdirectories:
+                    pending[
+                        executor.submit(_scan_directory, subdirectory, resolved_subdirectory)
+                    ] = top_directory
+
+    return results
+
+
+def _scan_directory(
+    directory: str, resolved_directory: str
+) -> Tuple[List[FileRecord], List[str], List[Tuple[str, str]]]:
+    """
+    Lists a single directory. Returns a tuple of (the records of the files in it, the paths of the
+    files whose metadata couldn't be read, and the (path, resolved path) of each of its subdirectories.)
+    """
+    file_records: List[FileRecord] = []
+    unreadable_file_paths: List[str] = []
+    subdirectories: List[Tuple[str, str]] = []
+
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                path = os.path.normpath(entry.path)
+                try:
+                    is_symlink = entry.is_symlink()
+                    if entry.is_dir():
+                        if not is_symlink:
+                            subdirectories.append(
+                                (entry.path, os.path.join(resolved_directory, entry.name))
+                            )
+                        continue
+                    stat_result = entry.stat()
+                except OSError:
+                    unreadable_file_paths.append(path)
+                    continue
+
+                file_records.append(
+                    FileRecord(
+                        path=path,
+                        # Only symbolic links need resolving, as the directory is already resolved.
+                        resolved_path=(
+                            str(Path(path).resolve())
+                            if is_symlink
+                            else os.path.join(resolved_directory, entry.name)
+                        ),
+                        size=stat_result.st_size,
+                        mtime_ns=stat_result.st_mtime_ns,
+                        is_symlink=is_symlink,
+                    )
+                )
+    except OSError as e:
+        # As with os.walk, directories that can't be listed are skipped.
+        logger.debug(f"Skipping directory '{directory}' as it can't be listed: {e}")
+
+    return (file_records, unreadable_file_paths, subdirectories)
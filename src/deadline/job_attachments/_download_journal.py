@@ -0,0 +1,176 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+An on-disk journal of the files downloaded to a local root, for resuming interrupted downloads.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from .asset_manifests.base_manifest import BaseManifestPath
+from ._utils import _try_lock_file
+
+logger = logging.getLogger("deadline.job_attachments.download")
+
+JOURNAL_DIR_NAME = "download_journals"
+JOURNAL_FILE_SUFFIX = ".deadline_download_journal"
+
+
+def get_download_journal_path(cache_dir: str, local_root: str, journal_key: str) -> Path:
+    """
+    Returns the path of the journal of the download identified by the given key (e.g. the job whose
+    output is downloaded) to the given local root, in the given cache directory.
+    """
+    journal_id = hashlib.sha256(
+        f"{Path(local_root).resolve()}\n{journal_key}".encode("utf-8", errors="surrogatepass")
+    ).hexdigest()
+    return Path(cache_dir, JOURNAL_DIR_NAME, f"{journal_id}{JOURNAL_FILE_SUFFIX}")
+
+
+class DownloadJournalInUseError(OSError):
+    """The journal of a download is locked by another download of the same files to the same root."""
+
+
+class DownloadJournal:
+    """
+    Records the files, and the parts of large files, that are completely downloaded to a local root, by
+    appending a JSON line for each to a journal file in the cache directory as they finish. The journal
+    is keyed by the resolved root and a key of what's downloaded (e.g. the job), and is locked for the
+    download, so that a concurrent download of the same files to the same root doesn't journal.
+
+    A download that resumes from the journal skips the files that it records as complete, as long as
+    the local file still has the size and modification time that it had when it was recorded. Parts
+    are recorded by the path and hash of their file, and the [start, end) range of their bytes.
+
+    The journal is always appended to, and the entries of a previous download are only read when it's
+    resumed. The journal is removed when the download completes.
+
+    This class can be called by multiple threads.
+    """
+
+    def __init__(
+        self, cache_dir: str, local_root: str, journal_key: str, resume: bool = False
+    ) -> None:
+        self.local_root = local_root
+        self.journal_path = get_download_journal_path(cache_dir, local_root, journal_key)
+        # The local path relative to the root, hash, size and modification time (in nanoseconds) of
+        # each complete file, by its path in the manifest.
+        self._completed_files: Dict[str, Tuple[str, str, int, int]] = {}
+        # The [start, end) ranges of the complete parts, by the path and hash of their file.
+        self._completed_parts: Dict[Tuple[str, str], Set[Tuple[int, int]]] = {}
+
+        self.journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with ExitStack() as exit_stack:
+            locked = exit_stack.enter_context(
+                _try_lock_file(self.journal_path.with_name(self.journal_path.name + ".lock"))
+            )
+            if not locked:
+                raise DownloadJournalInUseError(
+                    f"The download journal {self.journal_path} is in use by another download."
+                )
+            if resume:
+                self._load()
+            # Each line is written through to the file as it's recorded, so that it survives the process.
+            self._journal_file = open(self.journal_path, "a", encoding="utf-8", buffering=1)
+            # The lock is held until the journal is closed.
+            self._file_lock = exit_stack.pop_all()
+        self._lock = threading.Lock()
+
+    def get_completed_file(self, file: BaseManifestPath) -> Optional[Path]:
+        """
+        Returns the local path of the given file if the journal records it as complete and the local
+        file hasn't changed since, or None.
+        """
+        entry = self._completed_files.get(file.path)
+        if entry is None:
+            return None
+        (local_path, file_hash, size, mtime_ns) = entry
+        if (file_hash, size) != (file.hash, file.size):
+            return None
+
+        local_file_name = Path(self.local_root).joinpath(local_path)
+        try:
+            stat = local_file_name.stat()
+        except OSError:
+            return None
+        if (stat.st_size, stat.st_mtime_ns) != (size, mtime_ns):
+            return None
+        return local_file_name
+
+    def record_file(self, file: BaseManifestPath, local_file_name: Path) -> None:
+        """Records that the given file is completely downloaded to the given local path."""
+        try:
+            stat = local_file_name.stat()
+            local_path = local_file_name.relative_to(self.local_root)
+        except (OSError, ValueError) as e:
+            # The file is downloaded again by a resumed download.
+            logger.debug(f"Not recording {local_file_name} in {self.journal_path}: {e}")
+            return
+        self._append(
+            {
+                "file": file.path,
+                "local": str(local_path),
+                "hash": file.hash,
+                "size": file.size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+        )
+
+    def get_completed_parts(self, file: BaseManifestPath) -> Set[Tuple[int, int]]:
+        """Returns the [start, end) ranges of the parts of the given file recorded as complete."""
+        return self._completed_parts.get((file.path, file.hash), set())
+
+    def record_part(self, file: BaseManifestPath, start: int, end: int) -> None:
+        """Records that the [start, end) range of bytes of the given file is downloaded."""
+        self._append({"part": file.path, "hash": file.hash, "start": start, "end": end})
+
+    def close(self, remove: bool = False) -> None:
+        """Closes the journal, and removes it if `remove` is True (i.e. the download completed.)"""
+        with self._lock, self._file_lock:
+            self._journal_file.close()
+            if remove:
+                try:
+                    os.unlink(self.journal_path)
+                except FileNotFoundError:
+                    pass
+
+    def _append(self, entry: dict) -> None:
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._journal_file.write(line)
+
+    def _load(self) -> None:
+        try:
+            journal_file = open(self.journal_path, encoding="utf-8")
+        except FileNotFoundError:
+            return
+
+        with journal_file:
+            for line in journal_file:
+                try:
+                    entry = json.loads(line)
+                    if "file" in entry:
+                        self._completed_files[entry["file"]] = (
+                            entry["local"],
+                            entry["hash"],
+                            entry["size"],
+                            entry["mtime_ns"],
+                        )
+                    else:
+                        self._completed_parts.setdefault((entry["part"], entry["hash"]), set()).add(
+                            (entry["start"], entry["end"])
+                        )
+                except (ValueError, KeyError, TypeError):
+                    # e.g. the last line, if the process stopped while writing it.
+                    logger.debug(f"Ignoring an unreadable line of {self.journal_path}: {line!r}")
+        logger.info(
+            f"Resuming the download to {self.local_root} with {len(self._completed_files)} files "
+            "already complete."
+        )
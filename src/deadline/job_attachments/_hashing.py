@@ -0,0 +1,84 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Functions for selecting where files are hashed when hashing many files for job attachments.
+"""
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from enum import Enum
+from typing import Callable, Generator, Optional
+
+from deadline.client.config import config_file
+
+from .asset_manifests import HashAlgorithm
+from .exceptions import AssetSyncError
+
+# With the PROCESS hashing backend, files smaller than this are still hashed on the calling thread,
+# as sending them to another process would take longer than hashing them.
+PROCESS_HASHING_MIN_FILE_SIZE: int = 16 * 1024 * 1024  # 16 MiB
+
+
+class HashingBackend(str, Enum):
+    """
+    Enumerant of the backends for hashing files.
+
+    Backends:
+      THREAD - Files are hashed on the threads that process them.
+      PROCESS - Large files are hashed in a pool of processes, one per core, and small files on the threads that
+                process them. The threads hand large files to whichever process is free, so the work is spread
+                across the cores by file size.
+    """
+
+    THREAD = "THREAD"
+    PROCESS = "PROCESS"
+
+
+def get_hashing_backend() -> HashingBackend:
+    """Gets the hashing backend selected by the 'settings.file_hashing_backend' configuration setting."""
+    setting_value = config_file.get_setting("settings.file_hashing_backend")
+    try:
+        return HashingBackend(setting_value.upper())
+    except ValueError as ve:
+        raise AssetSyncError(
+            "Nonvalid value for configuration setting: 'file_hashing_backend' "
+            f"({setting_value}) must be one of {[backend.value for backend in HashingBackend]}."
+        ) from ve
+
+
+@contextmanager
+def hashing_process_pool(
+    backend: Optional[HashingBackend] = None,
+) -> Generator[Optional[ProcessPoolExecutor], None, None]:
+    """
+    Yields a process pool for hashing large files if the given (or configured) backend is PROCESS,
+    and None otherwise.
+    """
+    if backend is None:
+        backend = get_hashing_backend()
+    if backend != HashingBackend.PROCESS:
+        yield None
+        return
+
+    # Spawn the processes rather than forking them, as forking a process that has other threads
+    # running (e.g. boto3's) is not safe.
+    with ProcessPoolExecutor(mp_context=multiprocessing.get_context("spawn")) as process_pool:
+        yield process_pool
+
+
+def hash_file_in_pool(
+    hash_function: Callable[[str, HashAlgorithm], str],
+    file_path: str,
+    hash_alg: HashAlgorithm,
+    file_size: int,
+    process_pool: Optional[ProcessPoolExecutor],
+) -> str:
+    """
+    Hashes the given file with the given function. If a process pool is given and the file is at least
+    PROCESS_HASHING_MIN_FILE_SIZE bytes, it's hashed in the process pool, otherwise on the calling thread.
+    """
+    if process_pool is not None and file_size >= PROCESS_HASHING_MIN_FILE_SIZE:
+        return process_pool.submit(hash_function, file_path, hash_alg).result()
+    return hash_function(file_path, hash_alg)
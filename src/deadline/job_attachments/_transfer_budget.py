@@ -0,0 +1,70 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+A budget of bytes and connections that concurrent S3 transfers share.
+"""
+from __future__ import annotations
+
+import collections
+import threading
+from contextlib import contextmanager
+from typing import Deque, Generator, Tuple
+
+
+class TransferBudget:
+    """
+    Limits the total bytes and connections of the transfers in flight at once. Each transfer
+    reserves its size and the connections it uses for as long as it runs, waiting until both are
+    available. Reservations are granted in the order they're requested, so large transfers aren't
+    starved by a stream of small ones.
+    """
+
+    def __init__(self, max_bytes: int, max_connections: int) -> None:
+        if max_bytes <= 0 or max_connections <= 0:
+            raise ValueError(
+                f"The transfer budget must be positive, got {max_bytes} bytes and {max_connections} connections."
+            )
+        self.max_bytes = max_bytes
+        self.max_connections = max_connections
+        self.bytes_in_flight = 0
+        self.connections_in_flight = 0
+        self._condition = threading.Condition()
+        self._waiting: Deque[object] = collections.deque()
+
+    @contextmanager
+    def reserve(self, num_bytes: int, num_connections: int) -> Generator[None, None, None]:
+        """
+        Reserves the given bytes and connections for the duration of the context, waiting until they're
+        available. A reservation larger than the whole budget is reduced to the whole budget, so that
+        it runs on its own rather than never.
+        """
+        (num_bytes, num_connections) = self._clamp(num_bytes, num_connections)
+        ticket = object()
+        with self._condition:
+            self._waiting.append(ticket)
+            try:
+                self._condition.wait_for(
+                    lambda: self._waiting[0] is ticket
+                    and self.bytes_in_flight + num_bytes <= self.max_bytes
+                    and self.connections_in_flight + num_connections <= self.max_connections
+                )
+            finally:
+                self._waiting.remove(ticket)
+                # The next reservation in line may fit too.
+                self._condition.notify_all()
+            self.bytes_in_flight += num_bytes
+            self.connections_in_flight += num_connections
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.bytes_in_flight -= num_bytes
+                self.connections_in_flight -= num_connections
+                self._condition.notify_all()
+
+    def _clamp(self, num_bytes: int, num_connections: int) -> Tuple[int, int]:
+        return (
+            min(max(num_bytes, 0), self.max_bytes),
+            min(max(num_connections, 1), self.max_connections),
+        )
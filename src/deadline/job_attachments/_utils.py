@@ -1,12 +1,15 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 import datetime
+from contextlib import contextmanager
 from functools import wraps
 from hashlib import shake_256
 from pathlib import Path
+import os
 import random
+import shutil
 import time
-from typing import Any, Callable, Optional, Tuple, Type, Union
+from typing import IO, Any, Callable, Iterator, Optional, Tuple, Type, Union
 import uuid
 import sys
 
@@ -92,6 +95,41 @@ def _is_relative_to(path1: Union[Path, str], path2: Union[Path, str]) -> bool:
         return False
 
 
+# The ioctl request that clones the extents of one file into another on Linux (FICLONE), which
+# copy-on-write file systems such as Btrfs and XFS support.
+_FICLONE = 0x40049409
+
+
+def _copy_file(source: Union[Path, str], destination: Union[Path, str]) -> None:
+    """
+    Copies the contents of the source file to the destination, replacing any file there. On Linux,
+    the copy is a reflink that shares the file's blocks on file systems that support it, or else
+    is done in the kernel with copy_file_range.
+    """
+    if sys.platform != "linux":
+        shutil.copyfile(source, destination)
+        return
+
+    import fcntl
+
+    with open(source, "rb") as source_file, open(destination, "wb") as destination_file:
+        try:
+            fcntl.ioctl(destination_file.fileno(), _FICLONE, source_file.fileno())
+            return
+        except OSError:
+            pass
+        try:
+            while os.copy_file_range(source_file.fileno(), destination_file.fileno(), 1 << 30):
+                pass
+            return
+        except OSError:
+            # e.g. copying between file systems on older kernels.
+            source_file.seek(0)
+            destination_file.seek(0)
+            destination_file.truncate()
+        shutil.copyfileobj(source_file, destination_file, 1024 * 1024)
+
+
 def _is_windows_file_path_limit() -> bool:
     if sys.platform != "win32":
         return True
@@ -156,3 +194,40 @@ def _retry(
         return f_retry  # true decorator
 
     return deco_retry
+
+
+@contextmanager
+def _try_lock_file(lock_path: Path) -> Iterator[bool]:
+    """
+    Tries to take an exclusive lock of the given lock file without blocking, and yields whether it
+    was taken. The lock is released when the context exits, or if the process exits.
+    """
+    lock_file: IO[bytes] = open(lock_path, "a+b")
+    try:
+        if sys.platform == "win32":
+            import msvcrt
+
+            try:
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            except OSError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            try:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    finally:
+        lock_file.close()
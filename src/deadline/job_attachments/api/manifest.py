@@ -120,7 +120,7 @@ def _manifest_snapshot(
         # Parse local manifest
         with open(diff) as source_diff:
             source_manifest_str = source_diff.read()
-            source_manifest = decode_manifest(source_manifest_str)
+            source_manifest = decode_manifest(source_manifest_str, columnar=True)
 
         # Get the differences
         changed_paths: List[str] = []
@@ -146,7 +146,7 @@ def _manifest_snapshot(
             if not output_manifest:
                 return None
             differences: List[Tuple[FileStatus, BaseManifestPath]] = compare_manifest(
-                source_manifest, output_manifest
+                source_manifest, output_manifest, include_unchanged=False
             )
             for diff_item in differences:
                 if diff_item[0] == FileStatus.MODIFIED or diff_item[0] == FileStatus.NEW:
@@ -176,8 +176,8 @@ def _manifest_snapshot(
 
         local_manifest_file = os.path.join(destination, manifest_name)
         os.makedirs(os.path.dirname(local_manifest_file), exist_ok=True)
-        with open(local_manifest_file, "w") as file:
-            file.write(output_manifest.encode())
+        with open(local_manifest_file, "wb") as file:
+            output_manifest.encode_to_file(file)
 
         # Output results.
         logger.echo(f"Manifest Generated at {local_manifest_file}\n")
@@ -222,7 +222,7 @@ def _manifest_diff(
     local_manifest_object: BaseAssetManifest
     with open(manifest) as input_file:
         manifest_data_str = input_file.read()
-        local_manifest_object = decode_manifest(manifest_data_str)
+        local_manifest_object = decode_manifest(manifest_data_str, columnar=True)
 
     output: ManifestDiff = ManifestDiff()
 
@@ -245,7 +245,9 @@ def _manifest_diff(
 
         # Hash based compare manifests.
         differences: List[Tuple[FileStatus, BaseManifestPath]] = compare_manifest(
-            reference_manifest=local_manifest_object, compare_manifest=directory_manifest_object
+            reference_manifest=local_manifest_object,
+            compare_manifest=directory_manifest_object,
+            include_unchanged=False,
         )
         # Map to output datastructure.
         for item in differences:
@@ -438,8 +440,8 @@ def _manifest_download(
         manifest_name = f"{manifest_name}-{root_hash}-{timestamp}.manifest"
 
         local_manifest_file_path = os.path.join(download_dir, manifest_name)
-        with open(local_manifest_file_path, "w") as file:
-            file.write(merged_manifests[root].encode())
+        with open(local_manifest_file_path, "wb") as file:
+            merged_manifests[root].encode_to_file(file)
         successful_downloads.append(
             ManifestDownload(manifest_root=root, local_manifest_path=str(local_manifest_file_path))
         )
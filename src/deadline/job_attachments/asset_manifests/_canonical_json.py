@@ -5,9 +5,16 @@ from __future__ import annotations
 
 import dataclasses
 import json
+import operator
+from functools import lru_cache
+from json.encoder import encode_basestring_ascii  # type: ignore[attr-defined]
+from typing import IO, Any, Callable, Iterator, List, Tuple, Type
 
 from .base_manifest import BaseAssetManifest, BaseManifestPath
 
+# The number of paths encoded into each chunk of a streamed manifest.
+_PATHS_PER_CHUNK = 10000
+
 
 def canonical_path_comparator(path: BaseManifestPath):
     """
@@ -32,6 +39,71 @@ def manifest_to_canonical_json_string(manifest: BaseAssetManifest) -> str:
             and this version of the Asset Manifest only serializes strings and integers.
     * The paths array *MUST* be in lexicographical order by path.
     """
-    return json.dumps(
-        dataclasses.asdict(manifest), sort_keys=True, separators=(",", ":"), ensure_ascii=True
-    )
+    return "".join(iter_canonical_json_chunks(manifest))
+
+
+def write_canonical_json(manifest: BaseAssetManifest, file: IO[bytes]) -> None:
+    """
+    Writes the canonicalized JSON of the given manifest (see `manifest_to_canonical_json_string`) to
+    the given binary file, a chunk of paths at a time. The JSON is all ASCII.
+    """
+    for chunk in iter_canonical_json_chunks(manifest):
+        file.write(chunk.encode("ascii"))
+
+
+def iter_canonical_json_chunks(manifest: BaseAssetManifest) -> Iterator[str]:
+    """
+    Yields the canonicalized JSON of the given manifest (see `manifest_to_canonical_json_string`) in
+    chunks. This produces the same output as `json.dumps(dataclasses.asdict(manifest), sort_keys=True,
+    separators=(",", ":"), ensure_ascii=True)`, without copying the manifest into dictionaries first.
+    The paths are written in their current order, so they must already be sorted.
+    """
+    separator = "{"
+    for name in sorted(field.name for field in dataclasses.fields(manifest)):
+        value = getattr(manifest, name)
+        if name == "paths":
+            yield f'{separator}"paths":['
+            yield from _iter_paths_json_chunks(value)
+            yield "]"
+        else:
+            yield f"{separator}{encode_basestring_ascii(name)}:{_encode_value(value)}"
+        separator = ","
+    yield "{}" if separator == "{" else "}"
+
+
+def _iter_paths_json_chunks(paths: List[BaseManifestPath]) -> Iterator[str]:
+    for start in range(0, len(paths), _PATHS_PER_CHUNK):
+        chunk_paths = paths[start : start + _PATHS_PER_CHUNK]
+        (template, get_values) = _get_path_encoding(type(chunk_paths[0]))
+        encoded_paths = []
+        for path in chunk_paths:
+            if type(path) is not type(chunk_paths[0]):
+                (template, get_values) = _get_path_encoding(type(path))
+            encoded_paths.append(template % tuple(map(_encode_value, get_values(path))))
+        yield ("," if start else "") + ",".join(encoded_paths)
+
+
+@lru_cache(maxsize=None)
+def _get_path_encoding(
+    path_class: Type[BaseManifestPath],
+) -> Tuple[str, Callable[[BaseManifestPath], Tuple[Any, ...]]]:
+    """
+    Returns the %-format template of the JSON object of a path of the given class, with its keys in
+    sorted order, and a function getting the values of a path in the same order.
+    """
+    names = sorted(field.name for field in dataclasses.fields(path_class))
+    template = "{" + ",".join(f"{encode_basestring_ascii(name)}:%s" for name in names) + "}"
+    get_values = operator.attrgetter(*names)
+    if len(names) == 1:
+        return (template, lambda path: (get_values(path),))
+    return (template, get_values)
+
+
+def _encode_value(value: Any) -> str:
+    # Strings (including string enums) and integers are encoded the same way json.dumps does, and
+    # anything else falls back to it.
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    if type(value) is int:
+        return int.__repr__(value)
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
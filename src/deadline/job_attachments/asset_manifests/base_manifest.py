@@ -5,7 +5,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, fields
-from typing import Any, ClassVar
+from typing import IO, Any, ClassVar
 
 from .hash_algorithms import HashAlgorithm
 from .versions import ManifestVersion
@@ -14,9 +14,12 @@ from .versions import ManifestVersion
 @dataclass
 class BaseManifestPath(ABC):
     """
-    Data class for paths in the Asset Manifest
+    Data class for paths in the Asset Manifest. Manifests can list millions of paths, so paths
+    use slots instead of an instance dictionary to keep their memory small.
     """
 
+    __slots__ = ("path", "hash", "size", "mtime")
+
     path: str
     hash: str
     size: int
@@ -79,3 +82,10 @@ class BaseAssetManifest(ABC):
         whatever format the Asset Manifest was written for.
         """
         raise NotImplementedError("Asset Manifest base class does not implement encode")
+
+    def encode_to_file(self, file: IO[bytes]) -> None:
+        """
+        Encode the Asset Manifest as with `encode`, writing the UTF-8 encoded result to the given
+        binary file. Versions of the Asset Manifest may override this to stream the encoding.
+        """
+        file.write(self.encode().encode("utf-8"))
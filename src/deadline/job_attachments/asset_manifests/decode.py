@@ -5,19 +5,22 @@ from __future__ import annotations
 
 import json
 import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import jsonschema
 
 from ..exceptions import ManifestDecodeValidationError
 from .base_manifest import BaseAssetManifest
 from .manifest_model import ManifestModelRegistry
+from .v2023_03_03 import ColumnarAssetManifest
 from .versions import ManifestVersion
 
 alphanum_regex = re.compile("[a-zA-Z0-9]+")
 
 
+@lru_cache(maxsize=None)
 def _get_schema(version) -> dict[str, Any]:
     schema_filename = Path(__file__).parent.joinpath("schemas", version + ".json").resolve()
 
@@ -25,6 +28,25 @@ def _get_schema(version) -> dict[str, Any]:
         return json.load(schema_file)
 
 
+# The validator of each manifest version, with the schema it was created from.
+_validators: Dict[str, Tuple[dict[str, Any], Any]] = {}
+
+
+def _get_validator(version) -> Any:
+    """
+    Returns a validator for the schema of the given manifest version, checking the schema and creating
+    the validator only once. Raises a jsonschema.SchemaError if the schema isn't valid.
+    """
+    schema = _get_schema(version)
+    cached = _validators.get(version)
+    if cached is None or cached[0] is not schema:
+        validator_class = jsonschema.validators.validator_for(schema)
+        validator_class.check_schema(schema)
+        cached = (schema, validator_class(schema))
+        _validators[version] = cached
+    return cached[1]
+
+
 def validate_manifest(
     manifest: dict[str, Any], version: ManifestVersion
 ) -> Tuple[bool, Optional[str]]:
@@ -33,19 +55,83 @@ def validate_manifest(
     is valid for the given version. Returns False and a string explaining the error if the manifest is not valid.
     """
     try:
-        jsonschema.validate(manifest, _get_schema(version))
-
-    except (jsonschema.ValidationError, jsonschema.SchemaError) as e:
+        error = jsonschema.exceptions.best_match(_get_validator(version).iter_errors(manifest))
+    except jsonschema.SchemaError as e:
         return False, str(e)
 
+    if error is not None:
+        return False, str(error)
+
     return True, None
 
 
-def decode_manifest(manifest: str) -> BaseAssetManifest:
+def _is_integer(value: Any) -> bool:
+    # As in JSON schema, booleans aren't integers, while floats with no fractional part are.
+    if isinstance(value, bool):
+        return False
+    return isinstance(value, int) or (isinstance(value, float) and value.is_integer())
+
+
+def _is_alphanumeric(value: str) -> bool:
+    return value.isascii() and value.isalnum()
+
+
+def _is_valid_v2023_03_03(manifest: dict[str, Any]) -> bool:
+    """
+    Checks, in a single pass, that the given manifest has the structure required by the v2023-03-03
+    schema, and that its hashes are alphanumeric. This is much faster than validating against the
+    schema, as there's no per-path validator traversal, but it doesn't explain what's not valid.
+    """
+    if not (
+        isinstance(manifest, dict)
+        and manifest.get("manifestVersion") == ManifestVersion.v2023_03_03.value
+        and manifest.get("hashAlg") == "xxh128"
+        and _is_integer(manifest.get("totalSize"))
+    ):
+        return False
+
+    paths = manifest.get("paths")
+    if not isinstance(paths, list) or not paths:
+        return False
+
+    for path in paths:
+        try:
+            if not (
+                isinstance(path["path"], str)
+                and isinstance(path["hash"], str)
+                and _is_alphanumeric(path["hash"])
+                and _is_integer(path["size"])
+                and _is_integer(path["mtime"])
+            ):
+                return False
+        except (KeyError, TypeError):
+            return False
+
+    return True
+
+
+# Fast structural validators, by manifest version. Manifest versions without one are always
+# validated against their schema.
+_FAST_VALIDATORS: Dict[ManifestVersion, Callable[[dict[str, Any]], bool]] = {
+    ManifestVersion.v2023_03_03: _is_valid_v2023_03_03,
+}
+
+
+def decode_manifest(
+    manifest: str, strict: bool = False, columnar: bool = False
+) -> BaseAssetManifest:
     """
     Takes in a manifest string and returns an Asset Manifest object.
     A ManifestDecodeValidationError will be raised if the manifest version is unknown or
     the manifest is not valid.
+
+    By default, the manifest is checked with a fast structural validator for its version, and only
+    validated against the full JSON schema (to explain what's wrong) if that check fails. If `strict`
+    is True, the manifest is always validated against the full JSON schema.
+
+    If `columnar` is True, a v2023-03-03 manifest is decoded into a ColumnarAssetManifest, which
+    stores its paths in compact columns rather than as ManifestPath objects. Manifests of other
+    versions are decoded as usual.
     """
     document: dict[str, Any] = json.loads(manifest)
 
@@ -65,19 +151,27 @@ def decode_manifest(manifest: str) -> BaseAssetManifest:
             'Manifest is missing the required "manifestVersion" field'
         )
 
-    manifest_valid, error_string = validate_manifest(document, version)
-
-    if not manifest_valid:
-        raise ManifestDecodeValidationError(error_string)
-
-    manifest_model = ManifestModelRegistry.get_manifest_model(version=version)
-    decoded_manifest = manifest_model.AssetManifest.decode(manifest_data=document)
-
-    # Validate hashes are alphanumeric
-    for path in decoded_manifest.paths:
-        if alphanum_regex.fullmatch(path.hash) is None:
-            raise ManifestDecodeValidationError(
-                f"The hash {path.hash} for path {path.path} is not alphanumeric"
-            )
+    fast_validator = _FAST_VALIDATORS.get(version)
+    validated_fast = not strict and fast_validator is not None and fast_validator(document)
+    if not validated_fast:
+        manifest_valid, error_string = validate_manifest(document, version)
+
+        if not manifest_valid:
+            raise ManifestDecodeValidationError(error_string)
+
+    decoded_manifest: BaseAssetManifest
+    if columnar and version == ManifestVersion.v2023_03_03:
+        decoded_manifest = ColumnarAssetManifest.decode(manifest_data=document)
+    else:
+        manifest_model = ManifestModelRegistry.get_manifest_model(version=version)
+        decoded_manifest = manifest_model.AssetManifest.decode(manifest_data=document)
+
+    # Validate hashes are alphanumeric, unless the fast validator already did.
+    if not validated_fast:
+        for path in decoded_manifest.paths:
+            if alphanum_regex.fullmatch(path.hash) is None:
+                raise ManifestDecodeValidationError(
+                    f"The hash {path.hash} for path {path.path} is not alphanumeric"
+                )
 
     return decoded_manifest
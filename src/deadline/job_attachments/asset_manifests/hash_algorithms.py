@@ -2,12 +2,25 @@
 
 """ Module that defines the hashing algorithms supported by this library. """
 
-import io
+import mmap
+import os
+import threading
 
 from enum import Enum
+from io import FileIO
+from typing import Any
 
 from ..exceptions import UnsupportedHashingAlgorithmError
 
+# Files are read in chunks sized to the file, but at least the minimum and at most the maximum chunk size.
+HASH_FILE_MIN_CHUNK_SIZE: int = 64 * 1024  # 64 KiB
+HASH_FILE_MAX_CHUNK_SIZE: int = 8 * 1024 * 1024  # 8 MiB
+# In AUTO read mode, files of at least this size are hashed directly from a memory map of the file.
+HASH_FILE_MMAP_THRESHOLD: int = 64 * 1024 * 1024  # 64 MiB
+
+# Each thread reuses a single read buffer across files, so hashing many small files doesn't allocate a buffer each time.
+_thread_local = threading.local()
+
 
 class HashAlgorithm(str, Enum):
     """
@@ -21,36 +34,88 @@ class HashAlgorithm(str, Enum):
     XXH128 = "xxh128"
 
 
-def hash_file(file_path: str, hash_alg: HashAlgorithm) -> str:
-    """Hashes the given file using the given hashing algorithm."""
-    if hash_alg == HashAlgorithm.XXH128:
-        from xxhash import xxh3_128
+class HashFileReadMode(str, Enum):
+    """
+    Enumerant of the ways `hash_file` can read a file.
 
-        hasher = xxh3_128()
-    else:
-        raise UnsupportedHashingAlgorithmError(
-            f"Unsupported hashing algorithm provided: {hash_alg}"
-        )
+    Modes:
+      AUTO - Memory map files of at least HASH_FILE_MMAP_THRESHOLD bytes, and use BUFFERED for smaller ones.
+      BUFFERED - Read the file into a reused buffer, in chunks sized to the file.
+      MMAP - Hash the file directly from a memory map of it, without copying it into Python buffers.
+    """
 
-    with open(file_path, "rb") as file:
-        while True:
-            chunk = file.read(io.DEFAULT_BUFFER_SIZE)
-            if not chunk:
-                break
-            hasher.update(chunk)
-        return hasher.hexdigest()
+    AUTO = "auto"
+    BUFFERED = "buffered"
+    MMAP = "mmap"
 
 
-def hash_data(data: bytes, hash_alg: HashAlgorithm) -> str:
-    """Hashes the given data bytes using the given hashing algorithm."""
+def _get_hasher(hash_alg: HashAlgorithm) -> Any:
     if hash_alg == HashAlgorithm.XXH128:
         from xxhash import xxh3_128
 
-        hasher = xxh3_128()
+        return xxh3_128()
     else:
         raise UnsupportedHashingAlgorithmError(
             f"Unsupported hashing algorithm provided: {hash_alg}"
         )
 
+
+def hash_file(
+    file_path: str,
+    hash_alg: HashAlgorithm,
+    read_mode: HashFileReadMode = HashFileReadMode.AUTO,
+) -> str:
+    """Hashes the given file using the given hashing algorithm."""
+    hasher = _get_hasher(hash_alg)
+
+    # Read without Python's internal buffering, since the chunks are already large.
+    with open(file_path, "rb", buffering=0) as file:
+        file_size = os.fstat(file.fileno()).st_size
+        use_mmap = read_mode == HashFileReadMode.MMAP or (
+            read_mode == HashFileReadMode.AUTO and file_size >= HASH_FILE_MMAP_THRESHOLD
+        )
+        if not (use_mmap and _update_from_mmap(hasher, file, file_size)):
+            _update_from_buffer(hasher, file, file_size)
+    return hasher.hexdigest()
+
+
+def _update_from_mmap(hasher: Any, file: FileIO, file_size: int) -> bool:
+    """
+    Updates the hasher with the contents of the file through a memory map. Returns False if the file
+    can't be memory mapped (e.g. on some network file systems), so it should be read instead.
+    """
+    # Note that a file being truncated by another process while it is mapped causes a SIGBUS on POSIX,
+    # which is why AUTO only maps large files, which are typically finished renders and caches.
+    if file_size == 0:
+        # Empty files can't be memory mapped, and there's nothing to hash.
+        return True
+    try:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            with memoryview(mapped_file) as view:
+                hasher.update(view)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def _update_from_buffer(hasher: Any, file: FileIO, file_size: int) -> None:
+    """Updates the hasher with the contents of the file, read in chunks into this thread's reused buffer."""
+    chunk_size = min(max(file_size, HASH_FILE_MIN_CHUNK_SIZE), HASH_FILE_MAX_CHUNK_SIZE)
+    buffer = getattr(_thread_local, "buffer", None)
+    if buffer is None or len(buffer) < chunk_size:
+        buffer = bytearray(chunk_size)
+        _thread_local.buffer = buffer
+
+    chunk_view = memoryview(buffer)[:chunk_size]
+    while True:
+        bytes_read = file.readinto(chunk_view)
+        if not bytes_read:
+            break
+        hasher.update(chunk_view[:bytes_read])
+
+
+def hash_data(data: bytes, hash_alg: HashAlgorithm) -> str:
+    """Hashes the given data bytes using the given hashing algorithm."""
+    hasher = _get_hasher(hash_alg)
     hasher.update(data)
     return hasher.hexdigest()
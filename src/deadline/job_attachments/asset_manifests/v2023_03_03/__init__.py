@@ -1,5 +1,6 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 from .asset_manifest import AssetManifest, ManifestModel, ManifestPath
+from .columnar_manifest import ColumnarAssetManifest
 
-__all__ = ["ManifestModel", "ManifestPath", "AssetManifest"]
+__all__ = ["ManifestModel", "ManifestPath", "AssetManifest", "ColumnarAssetManifest"]
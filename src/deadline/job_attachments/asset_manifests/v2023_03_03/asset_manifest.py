@@ -4,9 +4,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Type
+from typing import IO, Any, Type
 
-from .._canonical_json import canonical_path_comparator, manifest_to_canonical_json_string
+from .._canonical_json import (
+    canonical_path_comparator,
+    manifest_to_canonical_json_string,
+    write_canonical_json,
+)
 from ..base_manifest import BaseAssetManifest, BaseManifestPath
 from ..hash_algorithms import HashAlgorithm
 from ..manifest_model import BaseManifestModel
@@ -24,6 +28,8 @@ class ManifestPath(BaseManifestPath):
     Extension for version v2023-03-03 of the asset manifest.
     """
 
+    __slots__ = ()
+
     manifest_version = ManifestVersion.v2023_03_03
 
     def __init__(self, *, path: str, hash: str, size: int, mtime: int) -> None:
@@ -84,6 +90,14 @@ class AssetManifest(BaseAssetManifest):
         self.paths.sort(key=canonical_path_comparator)
         return manifest_to_canonical_json_string(manifest=self)
 
+    def encode_to_file(self, file: IO[bytes]) -> None:
+        """
+        Write the canonicalized JSON of the manifest to the given binary file, without building the
+        whole string in memory first.
+        """
+        self.paths.sort(key=canonical_path_comparator)
+        write_canonical_json(manifest=self, file=file)
+
 
 class ManifestModel(BaseManifestModel):
     """
@@ -0,0 +1,270 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+""" Module that defines a compact, columnar form of the v2023-03-03 version of the asset manifest """
+from __future__ import annotations
+
+from array import array
+from itertools import compress
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union, overload
+
+from .._canonical_json import manifest_to_canonical_json_string, write_canonical_json
+from ..base_manifest import BaseManifestPath
+from ..hash_algorithms import HashAlgorithm
+from ...exceptions import ManifestDecodeValidationError
+from .asset_manifest import SUPPORTED_HASH_ALGS, AssetManifest, ManifestPath
+
+# The width, in bytes, of an xxh128 hash.
+_HASH_WIDTH = 16
+
+
+class ManifestPathColumns(Sequence[BaseManifestPath]):
+    """
+    A read-only view of the paths of a columnar manifest, which creates a ManifestPath for each path
+    as it's accessed.
+    """
+
+    def __init__(self, manifest: ColumnarAssetManifest) -> None:
+        self._manifest = manifest
+
+    def __len__(self) -> int:
+        return len(self._manifest._sizes)
+
+    @overload
+    def __getitem__(self, index: int) -> BaseManifestPath: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[BaseManifestPath]: ...
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[BaseManifestPath, List[BaseManifestPath]]:
+        if isinstance(index, slice):
+            return [self._manifest._get_manifest_path(i) for i in range(len(self))[index]]
+        return self._manifest._get_manifest_path(range(len(self))[index])
+
+    def __iter__(self) -> Iterator[BaseManifestPath]:
+        for i in range(len(self)):
+            yield self._manifest._get_manifest_path(i)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"ManifestPathColumns({list(self)!r})"
+
+
+class ColumnarAssetManifest(AssetManifest):
+    """
+    Version v2023-03-03 of the asset manifest, with its paths stored in columns rather than as a list
+    of ManifestPath objects, which takes several times less memory for large manifests:
+    - sizes and modification times are arrays of 64-bit integers,
+    - hashes are packed into a single bytes object of fixed-width binary digests (or kept as strings
+      if any hash isn't a lowercase hex xxh128 digest),
+    - each path is split into its directory, which is interned in a table shared by the paths, and
+      its file name, which is packed with the others into a single buffer of UTF-8.
+
+    The `paths` attribute is a read-only sequence view of ManifestPath objects, for compatibility.
+    Assigning a list of paths to it replaces the columns. Totals and filtering by directory work on
+    the columns directly.
+    """
+
+    def __init__(
+        self, *, hash_alg: HashAlgorithm, paths: Iterable[BaseManifestPath], total_size: int
+    ) -> None:
+        super().__init__(hash_alg=hash_alg, paths=paths, total_size=total_size)  # type: ignore[arg-type]
+
+    @property  # type: ignore[override]
+    def paths(self) -> ManifestPathColumns:
+        return ManifestPathColumns(self)
+
+    @paths.setter
+    def paths(self, paths: Iterable[BaseManifestPath]) -> None:
+        self._clear_columns()
+        for path in paths:
+            self._append(path.path, path.hash, path.size, path.mtime)
+
+    @classmethod
+    def from_manifest(cls, manifest: AssetManifest) -> ColumnarAssetManifest:
+        """Return the columnar form of the given manifest."""
+        return cls(hash_alg=manifest.hashAlg, paths=manifest.paths, total_size=manifest.totalSize)
+
+    def to_manifest(self) -> AssetManifest:
+        """Return the manifest as a list of ManifestPath objects."""
+        return AssetManifest(
+            hash_alg=self.hashAlg, paths=list(self.paths), total_size=self.totalSize
+        )
+
+    @classmethod
+    def decode(cls, *, manifest_data: dict[str, Any]) -> ColumnarAssetManifest:
+        """
+        Return an instance of this class given a manifest dictionary, without creating a ManifestPath
+        for each path. Assumes the manifest has been validated prior to calling.
+        """
+        try:
+            hash_alg = HashAlgorithm(manifest_data["hashAlg"])
+        except ValueError:
+            raise ManifestDecodeValidationError(
+                f"Unsupported hashing algorithm: {manifest_data['hashAlg']}. Must be one of: {[e.value for e in SUPPORTED_HASH_ALGS]}"
+            )
+
+        manifest = cls(hash_alg=hash_alg, paths=[], total_size=manifest_data["totalSize"])
+        for path in manifest_data["paths"]:
+            manifest._append(path["path"], path["hash"], path["size"], path["mtime"])
+        return manifest
+
+    def encode(self) -> str:
+        """
+        Return a canonicalized JSON string of the manifest
+        """
+        self._sort_canonically()
+        return manifest_to_canonical_json_string(manifest=self)
+
+    def encode_to_file(self, file: IO[bytes]) -> None:
+        """
+        Write the canonicalized JSON of the manifest to the given binary file, without building the
+        whole string in memory first.
+        """
+        self._sort_canonically()
+        write_canonical_json(manifest=self, file=file)
+
+    def get_paths_size(self) -> int:
+        """Return the sum of the sizes of all paths."""
+        return sum(self._sizes)
+
+    def select_directory(self, directory_path: str) -> ColumnarAssetManifest:
+        """
+        Return a manifest of the paths under the given directory path (i.e. that start with
+        `directory_path + "/"`.) Only the directory table is searched by prefix; the paths are then
+        selected by their directory index.
+        """
+        prefix = directory_path + "/"
+        matching_directory_indices = {
+            index
+            for index, directory in enumerate(self._directories)
+            if directory.startswith(prefix)
+        }
+        selected = compress(
+            range(len(self._sizes)),
+            map(matching_directory_indices.__contains__, self._path_directory_indices),
+        )
+        return self._take(list(selected))
+
+    def get_path(self, index: int) -> str:
+        """Return the path at the given index."""
+        return self._directories[self._path_directory_indices[index]] + self._get_name(index)
+
+    def get_hash_key(self, index: int) -> Union[bytes, str]:
+        """
+        Return a key of the hash at the given index, for comparing hashes between manifests without
+        decoding them. The keys of two manifests are comparable if both or neither have fixed-width hashes.
+        """
+        if self._hash_strings is not None:
+            return self._hash_strings[index]
+        return bytes(self._hashes[index * _HASH_WIDTH : (index + 1) * _HASH_WIDTH])
+
+    @property
+    def has_fixed_width_hashes(self) -> bool:
+        return self._hash_strings is None
+
+    def _clear_columns(self) -> None:
+        # Directories (up to and including the last '/') are interned in a table, so that paths in the
+        # same directory share them. A path is its directory followed by its name. The names are packed
+        # into a single buffer of UTF-8, with the offset where each name ends.
+        self._directories: List[str] = []
+        self._directory_indices: Dict[str, int] = {}
+        self._path_directory_indices = array("I")
+        self._names = bytearray()
+        self._name_ends = array("q")
+        self._sizes = array("q")
+        self._mtimes = array("q")
+        self._hashes = bytearray()
+        self._hash_strings: Optional[List[str]] = None
+
+    def _append(self, path: str, hash: str, size: int, mtime: int) -> None:
+        separator_index = path.rfind("/") + 1
+        directory = path[:separator_index]
+        directory_index = self._directory_indices.get(directory)
+        if directory_index is None:
+            directory_index = len(self._directories)
+            self._directories.append(directory)
+            self._directory_indices[directory] = directory_index
+        self._path_directory_indices.append(directory_index)
+        self._names += path[separator_index:].encode("utf-8", errors="surrogatepass")
+        self._name_ends.append(len(self._names))
+        self._sizes.append(size)
+        self._mtimes.append(mtime)
+
+        if self._hash_strings is None:
+            digest = _hash_to_digest(hash)
+            if digest is not None:
+                self._hashes += digest
+                return
+            # Hashes that aren't lowercase hex xxh128 digests can't be packed, so keep all as strings.
+            self._hash_strings = [
+                self._hashes[i * _HASH_WIDTH : (i + 1) * _HASH_WIDTH].hex()
+                for i in range(len(self._sizes) - 1)
+            ]
+            self._hashes = bytearray()
+        self._hash_strings.append(hash)
+
+    def _get_name_slice(self, index: int) -> slice:
+        return slice(self._name_ends[index - 1] if index else 0, self._name_ends[index])
+
+    def _get_name(self, index: int) -> str:
+        return self._names[self._get_name_slice(index)].decode("utf-8", errors="surrogatepass")
+
+    def _get_manifest_path(self, index: int) -> ManifestPath:
+        hash_key = self.get_hash_key(index)
+        return ManifestPath(
+            path=self.get_path(index),
+            hash=hash_key if isinstance(hash_key, str) else hash_key.hex(),
+            size=self._sizes[index],
+            mtime=self._mtimes[index],
+        )
+
+    def _take(self, indices: List[int]) -> ColumnarAssetManifest:
+        """Return a manifest of the paths at the given indices, sharing the directory table."""
+        taken = ColumnarAssetManifest(hash_alg=self.hashAlg, paths=[], total_size=0)
+        taken._directories = self._directories
+        taken._directory_indices = self._directory_indices
+        taken._path_directory_indices = array(
+            "I", (self._path_directory_indices[i] for i in indices)
+        )
+        for i in indices:
+            taken._names += self._names[self._get_name_slice(i)]
+            taken._name_ends.append(len(taken._names))
+        taken._sizes = array("q", (self._sizes[i] for i in indices))
+        taken._mtimes = array("q", (self._mtimes[i] for i in indices))
+        if self._hash_strings is not None:
+            taken._hash_strings = [self._hash_strings[i] for i in indices]
+        else:
+            taken._hashes = bytearray().join(
+                self._hashes[i * _HASH_WIDTH : (i + 1) * _HASH_WIDTH] for i in indices
+            )
+        taken.totalSize = taken.get_paths_size()
+        return taken
+
+    def _sort_canonically(self) -> None:
+        # Sort by UTF-16 values as per the spec, as in `canonical_path_comparator`.
+        order = sorted(
+            range(len(self._sizes)),
+            key=lambda i: self.get_path(i).encode("utf-16_be", errors="surrogatepass"),
+        )
+        if order == list(range(len(order))):
+            return
+        sorted_manifest = self._take(order)
+        sorted_manifest.totalSize = self.totalSize
+        self.__dict__.update(sorted_manifest.__dict__)
+
+
+def _hash_to_digest(hash: str) -> Optional[bytes]:
+    """Return the binary digest of the given hash if it's a lowercase hex xxh128 digest, or None."""
+    if len(hash) != 2 * _HASH_WIDTH:
+        return None
+    try:
+        digest = bytes.fromhex(hash)
+    except ValueError:
+        return None
+    return digest if digest.hex() == hash else None
@@ -2,6 +2,8 @@
 
 """ Module for File Attachment synching """
 from __future__ import annotations
+import concurrent.futures
+from contextlib import closing
 from dataclasses import asdict
 import os
 import shutil
@@ -12,7 +14,21 @@ from io import BytesIO
 from logging import Logger, LoggerAdapter, getLogger
 from math import trunc
 from pathlib import Path, PurePosixPath
-from typing import Any, Callable, DefaultDict, Dict, List, Optional, Tuple, Type, Union
+from typing import (
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
 import boto3
 
@@ -52,6 +68,7 @@ from .exceptions import (
 from .vfs import VFSProcessManager
 from .models import (
     Attachments,
+    FileRecord,
     JobAttachmentsFileSystem,
     JobAttachmentS3Settings,
     ManifestProperties,
@@ -60,6 +77,8 @@ from .models import (
     PathMappingRule,
 )
 from .upload import S3AssetUploader
+from ._discovery import scan_directories
+from ._hashing import hash_file_in_pool, hashing_process_pool
 from .os_file_permission import FileSystemPermissionSettings, PosixFileSystemPermissionSettings
 from ._utils import (
     _float_to_iso_datetime_string,
@@ -483,37 +502,33 @@ class AssetSync:
     def _upload_output_files_to_s3(
         self,
         s3_settings: JobAttachmentS3Settings,
-        output_files: List[OutputFile],
+        output_file_batches: Iterable[Sequence[OutputFile]],
+        total_files: int,
+        total_bytes: int,
         on_uploading_files: Optional[Callable[[ProgressReportMetadata], bool]],
     ) -> SummaryStatistics:
         """
-        Uploads the given output files to the given S3 bucket.
+        Uploads the given batches of output files to the given S3 bucket, in parallel as they are taken
+        from `output_file_batches` (see `S3AssetUploader.upload_output_files`.)
         Sets up `progress_tracker` to report upload progress back to the caller (i.e. worker.)
         """
         # Sets up progress tracker to report upload progress back to the caller.
-        total_file_size = sum([file.file_size for file in output_files])
         progress_tracker = ProgressTracker(
             status=ProgressStatus.UPLOAD_IN_PROGRESS,
-            total_files=len(output_files),
-            total_bytes=total_file_size,
+            total_files=total_files,
+            total_bytes=total_bytes,
             on_progress_callback=on_uploading_files,
             logger=self.logger,
         )
 
         start_time = time.perf_counter()
 
-        for file in output_files:
-            if file.in_s3:
-                progress_tracker.increase_skipped(1, file.file_size)
-                continue
-
-            self.s3_uploader.upload_file_to_s3(
-                local_path=Path(file.full_path),
-                s3_bucket=s3_settings.s3BucketName,
-                s3_upload_key=file.s3_key,
-                progress_tracker=progress_tracker,
-                base_dir_path=Path(file.base_dir) if file.base_dir else None,
-            )
+        self.s3_uploader.upload_output_files(
+            output_file_batches,
+            s3_bucket=s3_settings.s3BucketName,
+            s3_cas_prefix=s3_settings.full_cas_prefix(),
+            progress_tracker=progress_tracker,
+        )
 
         progress_tracker.total_time = time.perf_counter() - start_time
         return progress_tracker.get_summary_statistics()
@@ -528,7 +543,9 @@ class AssetSync:
     ) -> None:
         """Uploads the given output manifest to the given S3 bucket."""
         hash_alg = output_manifest.get_default_hash_alg()
-        manifest_bytes = output_manifest.encode().encode("utf-8")
+        manifest_buffer = BytesIO()
+        output_manifest.encode_to_file(manifest_buffer)
+        manifest_bytes = manifest_buffer.getvalue()
         manifest_name_prefix = hash_data(
             f"{file_system_location_name or ''}{root_path}".encode(), hash_alg
         )
@@ -579,22 +596,27 @@ class AssetSync:
 
         return self.manifest_model.AssetManifest(**asset_manifest_args)  # type: ignore[call-arg]
 
-    def _get_output_files(
+    def _find_output_files(
         self,
         manifest_properties: ManifestProperties,
-        s3_settings: JobAttachmentS3Settings,
         local_root: Path,
         session_dir: Path,
-    ) -> List[OutputFile]:
+    ) -> List[FileRecord]:
         """
         Walks the output directories for this asset root for any output files that have been created or modified
-        since the start time provided. Hashes and checks if the output files already exist in the CAS.
+        since the start time provided, and that resolve inside of the session directory.
+
+        The output directories are listed in parallel, querying each file once (see
+        `_discovery.scan_directories`). Only the output directory and the symbolic links in it are checked
+        against the session directory, as the walk doesn't follow symbolic links to directories, so every
+        other file is under the output directory.
         """
-        output_files: List[OutputFile] = []
+        file_records: List[FileRecord] = []
 
         source_path_format = manifest_properties.rootPathFormat
         current_path_format = PathFormat.get_host_path_format()
 
+        output_roots: List[Path] = []
         for output_dir in manifest_properties.outputRelativeDirectories or []:
             if source_path_format != current_path_format:
                 if source_path_format == PathFormat.WINDOWS:
@@ -603,19 +625,31 @@ class AssetSync:
                     output_dir = output_dir.replace("/", "\\")
             output_root: Path = local_root / output_dir
 
-            total_file_count = 0
-            total_file_size = 0
-
             # Don't fail if output dir hasn't been created yet; another task might be working on it
             if not output_root.is_dir():
                 self.logger.info(f"Found 0 files (Output directory {output_root} does not exist.)")
                 continue
+            output_roots.append(output_root)
+
+        # Get all files in the output directories (includes sub-directories)
+        scan_results = scan_directories(str(output_root) for output_root in output_roots)
+
+        for output_root in output_roots:
+            is_output_root_under_session_dir = self._is_file_within_directory(
+                output_root, session_dir
+            )
+            scan_result = scan_results[str(output_root)]
+            for unreadable_file_path in scan_result.unreadable_file_paths:
+                self.logger.info(
+                    f"Skipping file '{unreadable_file_path}' as its metadata can't be read"
+                )
 
-            # Get all files in this directory (includes sub-directories)
-            for file_path in output_root.glob("**/*"):
+            total_file_count = 0
+            total_file_size = 0
+            for file_record in scan_result.file_records:
                 # Files that are new or have been modified since the last sync will be added to the output list.
-                mtime_when_synced = self.synced_assets_mtime.get(str(file_path), None)
-                file_mtime = file_path.stat().st_mtime_ns
+                mtime_when_synced = self.synced_assets_mtime.get(file_record.path, None)
+                file_mtime = file_record.mtime_ns
                 is_modified = False
                 if mtime_when_synced:
                     if file_mtime > int(mtime_when_synced):
@@ -623,51 +657,28 @@ class AssetSync:
                         is_modified = True
                 else:
                     # This is a new file created during this session action.
-                    self.synced_assets_mtime[str(file_path)] = int(file_mtime)
+                    self.synced_assets_mtime[file_record.path] = int(file_mtime)
                     is_modified = True
 
-                # Resolve the real path to prevent time-of-check/time-of-use vulnerability
-                file_real_path = file_path.resolve()
-
                 # validate that the file resolves inside of the session working directory.
-                is_file_path_under_session_dir = self._is_file_within_directory(
-                    file_real_path, session_dir
+                # The resolved path was found when the file was, which prevents a time-of-check/time-of-use
+                # vulnerability.
+                is_file_path_under_session_dir = (
+                    self._is_file_within_directory(Path(file_record.resolved_path), session_dir)
+                    if file_record.is_symlink
+                    else is_output_root_under_session_dir
                 )
                 if is_file_path_under_session_dir is False:
                     self.logger.info(
-                        f"Skipping file '{file_path}' as its resolved path '{file_real_path}' is"
+                        f"Skipping file '{file_record.path}' as its resolved path '{file_record.resolved_path}' is"
                         f" outside the session directory '{session_dir}'"
                     )
                     continue
 
-                if (
-                    not file_real_path.is_dir()
-                    and file_real_path.exists()
-                    and is_modified
-                    and is_file_path_under_session_dir
-                ):
-                    file_size = file_real_path.resolve().lstat().st_size
-                    file_hash = hash_file(str(file_real_path), self.hash_alg)
-                    s3_key = f"{file_hash}.{self.hash_alg.value}"
-
-                    if s3_settings.full_cas_prefix():
-                        s3_key = _join_s3_paths(s3_settings.full_cas_prefix(), s3_key)
-                    in_s3 = self.s3_uploader.file_already_uploaded(s3_settings.s3BucketName, s3_key)
-
+                if is_modified:
                     total_file_count += 1
-                    total_file_size += file_size
-
-                    output_files.append(
-                        OutputFile(
-                            file_size=file_size,
-                            file_hash=file_hash,
-                            rel_path=str(PurePosixPath(*file_path.relative_to(local_root).parts)),
-                            full_path=str(file_real_path),
-                            s3_key=s3_key,
-                            in_s3=in_s3,
-                            base_dir=str(session_dir),
-                        )
-                    )
+                    total_file_size += file_record.size
+                    file_records.append(file_record)
 
             self.logger.info(
                 f"Found {total_file_count} file{'' if total_file_count == 1 else 's'}"
@@ -675,7 +686,87 @@ class AssetSync:
                 f" in output directory: {str(output_root)}"
             )
 
-        return output_files
+        return file_records
+
+    def _hash_output_files(
+        self,
+        file_records: List[FileRecord],
+        s3_settings: JobAttachmentS3Settings,
+        local_root: Path,
+        session_dir: Path,
+    ) -> Iterator[List[OutputFile]]:
+        """
+        Hashes the given output files in parallel on a thread pool, with large files hashed in the process
+        pool of the configured hashing backend, and yields them in order, in batches, as their hashes are
+        ready. Each batch is the next file, once its hash is ready, and the files after it whose hashes
+        are ready too, so that batches grow when hashing is ahead of the caller. Whether each file
+        already exists in the CAS is left to the caller, so its `in_s3` is False.
+
+        If the caller stops early, the files that haven't started hashing yet are skipped.
+        """
+        with hashing_process_pool() as process_pool, concurrent.futures.ThreadPoolExecutor() as executor:
+            hash_futures = [
+                executor.submit(
+                    hash_file_in_pool,
+                    hash_file,
+                    file_record.resolved_path,
+                    self.hash_alg,
+                    file_record.size,
+                    process_pool,
+                )
+                for file_record in file_records
+            ]
+            try:
+                index = 0
+                while index < len(file_records):
+                    batch = [
+                        self._get_output_file(
+                            file_records[index],
+                            hash_futures[index].result(),
+                            s3_settings,
+                            local_root,
+                            session_dir,
+                        )
+                    ]
+                    index += 1
+                    while index < len(file_records) and hash_futures[index].done():
+                        batch.append(
+                            self._get_output_file(
+                                file_records[index],
+                                hash_futures[index].result(),
+                                s3_settings,
+                                local_root,
+                                session_dir,
+                            )
+                        )
+                        index += 1
+                    yield batch
+            finally:
+                for hash_future in hash_futures:
+                    hash_future.cancel()
+
+    def _get_output_file(
+        self,
+        file_record: FileRecord,
+        file_hash: str,
+        s3_settings: JobAttachmentS3Settings,
+        local_root: Path,
+        session_dir: Path,
+    ) -> OutputFile:
+        s3_key = f"{file_hash}.{self.hash_alg.value}"
+
+        if s3_settings.full_cas_prefix():
+            s3_key = _join_s3_paths(s3_settings.full_cas_prefix(), s3_key)
+
+        return OutputFile(
+            file_size=file_record.size,
+            file_hash=file_hash,
+            rel_path=str(PurePosixPath(*Path(file_record.path).relative_to(local_root).parts)),
+            full_path=file_record.resolved_path,
+            s3_key=s3_key,
+            in_s3=False,
+            base_dir=str(session_dir),
+        )
 
     def _is_file_within_directory(self, file_path: Path, directory_path: Path) -> bool:
         """
@@ -942,7 +1033,10 @@ class AssetSync:
             self.logger.info(f"No attachments configured for Job {job_id}, no outputs to sync.")
             return SummaryStatistics()
 
-        all_output_files: List[OutputFile] = []
+        # The output files to upload of each asset root, with where the root is on this host.
+        output_file_records_by_root: List[
+            Tuple[ManifestProperties, Path, Path, List[FileRecord]]
+        ] = []
 
         storage_profiles_source_paths = list(storage_profiles_path_mapping_rules.keys())
 
@@ -970,45 +1064,73 @@ class AssetSync:
                 dir_name: str = _get_unique_dest_dir_name(manifest_properties.rootPath)
                 local_root = session_dir.joinpath(dir_name)
 
-            output_files: List[OutputFile] = self._get_output_files(
-                manifest_properties,
+            file_records = self._find_output_files(manifest_properties, local_root, session_root)
+            if file_records:
+                output_file_records_by_root.append(
+                    (manifest_properties, local_root, session_root, file_records)
+                )
+
+        num_output_files = sum(
+            len(file_records) for (_, _, _, file_records) in output_file_records_by_root
+        )
+        if num_output_files == 0:
+            return SummaryStatistics()
+
+        # The output files of each asset root, as they are hashed.
+        output_files_by_root: List[List[OutputFile]] = [[] for _ in output_file_records_by_root]
+
+        def hash_output_files() -> Generator[List[OutputFile], None, None]:
+            for (_, local_root, session_root, file_records), output_files in zip(
+                output_file_records_by_root, output_files_by_root
+            ):
+                for output_file_batch in self._hash_output_files(
+                    file_records, s3_settings, local_root, session_root
+                ):
+                    output_files.extend(output_file_batch)
+                    yield output_file_batch
+
+        self.logger.info(
+            f"Uploading {num_output_files} output file{'' if num_output_files == 1 else 's'}"
+            f" to S3: {s3_settings.s3BucketName}/{s3_settings.full_cas_prefix()}"
+        )
+        # Files are uploaded as they are hashed, rather than after all of them have been hashed.
+        with closing(hash_output_files()) as output_file_batches:
+            summary_stats: SummaryStatistics = self._upload_output_files_to_s3(
                 s3_settings,
-                local_root,
-                session_root,
+                output_file_batches,
+                total_files=num_output_files,
+                total_bytes=sum(
+                    file_record.size
+                    for (_, _, _, file_records) in output_file_records_by_root
+                    for file_record in file_records
+                ),
+                on_uploading_files=on_uploading_files,
             )
-            if output_files:
-                output_manifest = self._generate_output_manifest(output_files)
-                session_action_id_with_time_stamp = (
-                    f"{_float_to_iso_datetime_string(start_time)}_{session_action_id}"
-                )
-                full_output_prefix = s3_settings.full_output_prefix(
-                    farm_id=self.farm_id,
-                    queue_id=queue_id,
-                    job_id=job_id,
-                    step_id=step_id,
-                    task_id=task_id,
-                    session_action_id=session_action_id_with_time_stamp,
-                )
-                self._upload_output_manifest_to_s3(
-                    s3_settings=s3_settings,
-                    output_manifest=output_manifest,
-                    full_output_prefix=full_output_prefix,
-                    root_path=manifest_properties.rootPath,
-                    file_system_location_name=manifest_properties.fileSystemLocationName,
-                )
-                all_output_files.extend(output_files)
 
-        if all_output_files:
-            num_output_files = len(all_output_files)
-            self.logger.info(
-                f"Uploading {num_output_files} output file{'' if num_output_files == 1 else 's'}"
-                f" to S3: {s3_settings.s3BucketName}/{s3_settings.full_cas_prefix()}"
+        # The output manifests are uploaded after the files that they list.
+        for (manifest_properties, _, _, _), output_files in zip(
+            output_file_records_by_root, output_files_by_root
+        ):
+            output_manifest = self._generate_output_manifest(output_files)
+            session_action_id_with_time_stamp = (
+                f"{_float_to_iso_datetime_string(start_time)}_{session_action_id}"
             )
-            summary_stats: SummaryStatistics = self._upload_output_files_to_s3(
-                s3_settings, all_output_files, on_uploading_files
+            full_output_prefix = s3_settings.full_output_prefix(
+                farm_id=self.farm_id,
+                queue_id=queue_id,
+                job_id=job_id,
+                step_id=step_id,
+                task_id=task_id,
+                session_action_id=session_action_id_with_time_stamp,
             )
-        else:
-            summary_stats = SummaryStatistics()
+            self._upload_output_manifest_to_s3(
+                s3_settings=s3_settings,
+                output_manifest=output_manifest,
+                full_output_prefix=full_output_prefix,
+                root_path=manifest_properties.rootPath,
+                file_system_location_name=manifest_properties.fileSystemLocationName,
+            )
+
         return summary_stats
 
     def cleanup_session(
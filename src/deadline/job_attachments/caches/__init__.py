@@ -1,15 +1,20 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 from .cache_db import CacheDB, CONFIG_ROOT, COMPONENT_NAME
+from .content_cache import ContentCache
 from .hash_cache import HashCache, HashCacheEntry
+from .manifest_cache import ManifestCache, ManifestCacheEntry
 from .s3_check_cache import S3CheckCache, S3CheckCacheEntry
 
 __all__ = [
     "CacheDB",
     "CONFIG_ROOT",
     "COMPONENT_NAME",
+    "ContentCache",
     "HashCache",
     "HashCacheEntry",
+    "ManifestCache",
+    "ManifestCacheEntry",
     "S3CheckCache",
     "S3CheckCacheEntry",
 ]
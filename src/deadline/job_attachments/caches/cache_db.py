@@ -8,7 +8,7 @@ import logging
 import os
 from abc import ABC
 from threading import Lock
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from ..exceptions import JobAttachmentsError
 
@@ -69,6 +69,15 @@ class CacheDB(ABC):
                     f"Could not access cache file in {self.cache_dir}"
                 ) from oe
 
+            try:
+                # Write-ahead logging lets readers proceed while another process (e.g. a concurrent
+                # submission) is writing, and only syncs the log at checkpoints instead of every commit.
+                self.db_connection.execute("PRAGMA journal_mode=WAL")
+                self.db_connection.execute("PRAGMA synchronous=NORMAL")
+            except sqlite3.DatabaseError as de:
+                # WAL mode is not available on all file systems (e.g. some network file systems).
+                logger.debug(f"Could not enable write-ahead logging for {self.cache_name}: {de}")
+
             try:
                 self.db_connection.execute(f"SELECT * FROM {self.table_name}")
             except Exception:
@@ -84,6 +93,12 @@ class CacheDB(ABC):
         if self.enabled:
             self.db_connection.close()
 
+    def _write_entries(self, insert_query: str, entries: List[Dict[str, Any]]) -> None:
+        """Writes the given entries to the cache database in a single transaction."""
+        if self.enabled and entries:
+            with self.db_lock, self.db_connection:
+                self.db_connection.executemany(insert_query, entries)
+
     @classmethod
     def get_default_cache_db_file_dir(cls) -> Optional[str]:
         """
@@ -0,0 +1,201 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Module for accessing the host-level cache of files downloaded from the content-addressed storage.
+"""
+
+import logging
+import os
+import tempfile
+from pathlib import Path
+from threading import Lock
+from typing import List, Optional, Tuple
+
+from .cache_db import CONFIG_ROOT, COMPONENT_NAME
+from ..asset_manifests.hash_algorithms import HashAlgorithm
+from ..exceptions import JobAttachmentsError
+from .._utils import _copy_file, _try_lock_file
+
+
+logger = logging.getLogger("Deadline")
+
+
+class ContentCache:
+    """
+    Maintains a cache of the files of the content-addressed storage (CAS) on the local host, shared
+    by every session on the host, so that a file only has to be downloaded once for consecutive
+    sessions that use it. Files are stored as `<hash>.<alg>`, in subdirectories by the first two
+    characters of their hash.
+
+    Files are materialized into a session directory as a copy, which is a reflink on file systems
+    that support it, or as a hardlink if `use_hardlinks` is True. A hardlinked file shares its
+    contents, permissions and modification time with the cached file, so it must not be modified
+    by the session, and hardlinks must not be used for sessions whose files' permissions are changed. Files are written to the cache by renaming a complete temporary file into place,
+    so concurrent sessions never see a partial file.
+
+    When the total size of the cached files exceeds `max_size_bytes`, the least recently used files
+    are removed, by one process at a time under a lock file, until the cache is down to
+    `EVICTION_TARGET_RATIO` of its maximum size.
+
+    This class can be called by multiple threads. It counts the bytes of the files that were found
+    in the cache (`hit_bytes`) and that were not (`miss_bytes`).
+    """
+
+    CACHE_NAME = "content_cache"
+    EVICTION_TARGET_RATIO = 0.9
+
+    def __init__(
+        self,
+        max_size_bytes: int,
+        cache_dir: Optional[str] = None,
+        use_hardlinks: bool = False,
+    ) -> None:
+        if cache_dir is None:
+            cache_dir = self.get_default_cache_dir()
+        if cache_dir is None:
+            raise JobAttachmentsError(
+                f"No default cache path found. Please provide a directory for {self.CACHE_NAME}."
+            )
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_size_bytes = max_size_bytes
+        self.use_hardlinks = use_hardlinks
+
+        self.hit_bytes = 0
+        self.miss_bytes = 0
+        self._lock = Lock()
+        self._total_size_bytes = sum(size for (_, size, _) in self._list_files())
+
+    @classmethod
+    def get_default_cache_dir(cls) -> Optional[str]:
+        """
+        Gets the default directory of the cache, next to the cache database files.
+        """
+        default_path = os.environ.get("HOME")
+        if default_path:
+            default_path = os.path.join(default_path, CONFIG_ROOT, COMPONENT_NAME, cls.CACHE_NAME)
+        return default_path
+
+    def get_path(self, file_hash: str, hash_algorithm: HashAlgorithm) -> Path:
+        """Returns the path of the cached file of the given hash."""
+        return self.cache_dir / file_hash[:2] / f"{file_hash}.{hash_algorithm.value}"
+
+    def materialize(
+        self, file_hash: str, hash_algorithm: HashAlgorithm, size: int, destination: Path
+    ) -> bool:
+        """
+        Materializes the cached file of the given hash at the destination, replacing any file there.
+        Returns False, without changing the destination, if the file isn't in the cache.
+        """
+        cached_path = self.get_path(file_hash, hash_algorithm)
+        try:
+            # Marks the file as recently used.
+            os.utime(cached_path)
+            if self.use_hardlinks:
+                _replace_with_hardlink(cached_path, destination)
+            else:
+                _copy_file(cached_path, destination)
+        except FileNotFoundError:
+            # Not cached, or evicted by another session in the meantime.
+            return False
+
+        with self._lock:
+            self.hit_bytes += size
+        return True
+
+    def put(self, file_hash: str, hash_algorithm: HashAlgorithm, size: int, source: Path) -> None:
+        """
+        Adds a copy of the given downloaded file to the cache as the file of the given hash, then
+        evicts the least recently used files if the cache is over its maximum size.
+        """
+        with self._lock:
+            self.miss_bytes += size
+        if size > self.max_size_bytes:
+            return
+
+        cached_path = self.get_path(file_hash, hash_algorithm)
+        try:
+            cached_path.parent.mkdir(exist_ok=True)
+            (fd, temp_path) = tempfile.mkstemp(dir=cached_path.parent, prefix=".", suffix=".tmp")
+            os.close(fd)
+            try:
+                if self.use_hardlinks:
+                    _replace_with_hardlink(source, Path(temp_path))
+                else:
+                    _copy_file(source, Path(temp_path))
+                os.replace(temp_path, cached_path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            # The cache is an optimization, so failing to fill it doesn't fail the download.
+            logger.warning(f"Failed to add {source} to {self.CACHE_NAME}: {e}")
+            return
+
+        with self._lock:
+            self._total_size_bytes += size
+            over_size = self._total_size_bytes > self.max_size_bytes
+        if over_size:
+            self._evict_least_recently_used()
+
+    def _evict_least_recently_used(self) -> None:
+        """
+        Removes the least recently used files until the cache is down to its eviction target. Only
+        one process evicts at a time; the others continue without waiting.
+        """
+        with _try_lock_file(self.cache_dir / ".lock") as locked:
+            if not locked:
+                return
+            files = self._list_files()
+            total_size = sum(size for (_, size, _) in files)
+            if total_size > self.max_size_bytes:
+                target_size = self.max_size_bytes * self.EVICTION_TARGET_RATIO
+                evicted_files = 0
+                for path, size, _ in sorted(files, key=lambda entry: entry[2]):
+                    if total_size <= target_size:
+                        break
+                    try:
+                        os.unlink(path)
+                    except OSError:
+                        # e.g. the file is open on Windows.
+                        continue
+                    total_size -= size
+                    evicted_files += 1
+                logger.debug(f"Evicted {evicted_files} files from {self.CACHE_NAME}")
+
+        with self._lock:
+            self._total_size_bytes = total_size
+
+    def _list_files(self) -> List[Tuple[str, int, float]]:
+        """Returns the path, size and last used time of every file in the cache."""
+        files: List[Tuple[str, int, float]] = []
+        for subdir in os.scandir(self.cache_dir):
+            if not subdir.is_dir(follow_symlinks=False):
+                continue
+            for entry in os.scandir(subdir.path):
+                if entry.name.startswith("."):
+                    continue
+                try:
+                    stat = entry.stat(follow_symlinks=False)
+                except FileNotFoundError:
+                    continue
+                files.append((entry.path, stat.st_size, _get_last_used_time(stat)))
+        return files
+
+
+def _get_last_used_time(stat: os.stat_result) -> float:
+    """
+    Returns the time that a cached file was last used, which is the later of its modification and
+    status change times, since the modification time of a hardlinked file is set to that of the
+    session's file.
+    """
+    return max(stat.st_mtime, stat.st_ctime)
+
+
+def _replace_with_hardlink(source: Path, destination: Path) -> None:
+    """Makes the destination a hardlink of the source file, replacing any file there."""
+    try:
+        os.link(source, destination)
+    except FileExistsError:
+        os.unlink(destination)
+        os.link(source, destination)
@@ -6,7 +6,7 @@ Module for accessing the local file hash cache.
 
 import logging
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from .cache_db import CacheDB
 from ..asset_manifests.hash_algorithms import HashAlgorithm
@@ -44,10 +44,14 @@ class HashCache(CacheDB):
 
     This class also automatically locks when doing writes, so it can be called
     by multiple threads.
+
+    When processing many files, use `get_entries` to load all entries under a directory at once,
+    and `put_entries` to write updated entries in batches of about `WRITE_BATCH_SIZE`.
     """
 
     CACHE_NAME = "hash_cache"
     CACHE_DB_VERSION = 3
+    WRITE_BATCH_SIZE = 10000
 
     def __init__(self, cache_dir: Optional[str] = None) -> None:
         table_name: str = f"hashesV{self.CACHE_DB_VERSION}"
@@ -88,6 +92,59 @@ class HashCache(CacheDB):
             else:
                 return None
 
+    def get_entries(
+        self, file_path_prefix: str, hash_algorithm: HashAlgorithm
+    ) -> Dict[str, HashCacheEntry]:
+        """
+        Returns all entries from the hash cache whose file paths start with the given prefix
+        (e.g. an asset root directory), keyed by their file paths.
+        """
+        if not self.enabled:
+            return {}
+
+        prefix_key = file_path_prefix.encode(encoding="utf-8", errors="surrogatepass")
+        with self.db_lock, self.db_connection:
+            # The byte 0xFF never occurs in UTF-8, so every key that starts with the prefix sorts before
+            # the prefix followed by 0xFF. This makes the query a range scan of the primary key index.
+            rows = self.db_connection.execute(
+                f"SELECT * FROM {self.table_name} WHERE file_path >= ? AND file_path < ? AND hash_algorithm=?",
+                [prefix_key, prefix_key + b"\xff", hash_algorithm.value],
+            ).fetchall()
+
+        entries: Dict[str, HashCacheEntry] = {}
+        for entry_vals in rows:
+            file_path = str(entry_vals[0], encoding="utf-8", errors="surrogatepass")
+            entries[file_path] = HashCacheEntry(
+                file_path=file_path,
+                hash_algorithm=hash_algorithm,
+                file_hash=entry_vals[2],
+                last_modified_time=str(entry_vals[3]),
+            )
+        return entries
+
+    def put_entries(self, entries: Iterable[HashCacheEntry]) -> None:
+        """Inserts or replaces the given entries into the hash cache database in a single transaction."""
+        entry_dicts = []
+        for entry in entries:
+            entry_dict = entry.to_dict()
+            entry_dict["file_path"] = entry_dict["file_path"].encode(
+                encoding="utf-8", errors="surrogatepass"
+            )
+            entry_dicts.append(entry_dict)
+        self._write_entries(self._insert_query(), entry_dicts)
+
+    def flush_entries(self, entries: List[HashCacheEntry]) -> None:
+        """
+        Writes the entries currently in the given list in a single transaction, and removes them
+        from the list. Other threads may keep appending entries to the list while this runs.
+        """
+        # Appending to, copying a slice of, and deleting a slice of a list are each atomic, and
+        # other threads only append to the end, so this removes exactly the entries being written.
+        count = len(entries)
+        batch = entries[:count]
+        del entries[:count]
+        self.put_entries(batch)
+
     def put_entry(self, entry: HashCacheEntry) -> None:
         """Inserts or replaces an entry into the hash cache database after acquiring the lock."""
         if self.enabled:
@@ -96,7 +153,7 @@ class HashCache(CacheDB):
                 entry_dict["file_path"] = entry_dict["file_path"].encode(
                     encoding="utf-8", errors="surrogatepass"
                 )
-                self.db_connection.execute(
-                    f"INSERT OR REPLACE INTO {self.table_name} VALUES(:file_path, :hash_algorithm, :file_hash, :last_modified_time)",
-                    entry_dict,
-                )
+                self.db_connection.execute(self._insert_query(), entry_dict)
+
+    def _insert_query(self) -> str:
+        return f"INSERT OR REPLACE INTO {self.table_name} VALUES(:file_path, :hash_algorithm, :file_hash, :last_modified_time)"
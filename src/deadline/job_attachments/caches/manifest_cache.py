@@ -0,0 +1,188 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""
+Module for accessing the local cache of manifests downloaded from S3.
+"""
+
+import dataclasses
+import json
+import logging
+import marshal
+import time
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from .cache_db import CacheDB
+from ..asset_manifests.base_manifest import BaseAssetManifest
+from ..asset_manifests.manifest_model import ManifestModelRegistry
+from ..asset_manifests.v2023_03_03 import ColumnarAssetManifest
+from ..asset_manifests.versions import ManifestVersion
+
+
+logger = logging.getLogger("Deadline")
+
+
+@dataclass
+class ManifestCacheEntry:
+    """Represents an entry in the local manifest cache database"""
+
+    # The S3 key of the manifest, prefixed with its bucket name.
+    s3_key: str
+    etag: str
+    metadata: Dict[str, str]
+    manifest: BaseAssetManifest
+
+
+class ManifestCache(CacheDB):
+    """
+    Maintains a cache of manifests downloaded from S3 in a local database, keyed by their bucket and
+    key. Each entry holds the ETag of the manifest object, to check whether it has changed with a
+    conditional request, and the user metadata of the object. Manifests are stored in a binary form
+    that loads without parsing JSON or validating the manifest again.
+
+    Least recently used entries are removed when the total size of the stored manifests exceeds
+    `max_size_bytes`.
+
+    This class is intended to always be used with a context manager to properly
+    close the connection to the manifest cache database.
+
+    This class also automatically locks when doing writes, so it can be called
+    by multiple threads.
+    """
+
+    CACHE_NAME = "manifest_cache"
+    CACHE_DB_VERSION = 1
+    DEFAULT_MAX_SIZE_BYTES = 1024 * 1024 * 1024
+
+    def __init__(
+        self, cache_dir: Optional[str] = None, max_size_bytes: int = DEFAULT_MAX_SIZE_BYTES
+    ) -> None:
+        table_name: str = f"manifestsV{self.CACHE_DB_VERSION}"
+        create_query: str = (
+            f"CREATE TABLE manifestsV{self.CACHE_DB_VERSION}(s3_key text primary key, etag text, metadata text, manifest blob, size integer, last_access_time timestamp)"
+        )
+        super().__init__(
+            cache_name=self.CACHE_NAME,
+            table_name=table_name,
+            create_query=create_query,
+            cache_dir=cache_dir,
+        )
+        self.max_size_bytes = max_size_bytes
+
+    def get_entry(self, s3_key: str, columnar: bool = False) -> Optional[ManifestCacheEntry]:
+        """
+        Returns an entry from the manifest cache, if it exists, and marks it as recently used.
+        If `columnar` is True, a v2023-03-03 manifest is returned as a ColumnarAssetManifest.
+        """
+        if not self.enabled:
+            return None
+
+        with self.db_lock, self.db_connection:
+            entry_vals = self.db_connection.execute(
+                f"SELECT etag, metadata, manifest FROM {self.table_name} WHERE s3_key=?",
+                [s3_key],
+            ).fetchone()
+            if not entry_vals:
+                return None
+            self.db_connection.execute(
+                f"UPDATE {self.table_name} SET last_access_time=? WHERE s3_key=?",
+                [time.time(), s3_key],
+            )
+
+        try:
+            manifest = _manifest_from_bytes(entry_vals[2], columnar=columnar)
+            metadata = json.loads(entry_vals[1])
+        except Exception as e:
+            # e.g. an entry written by a version of Python with a different marshal format.
+            logger.debug(f"Ignoring unreadable {self.cache_name} entry for {s3_key}: {e}")
+            return None
+
+        return ManifestCacheEntry(
+            s3_key=s3_key, etag=entry_vals[0], metadata=metadata, manifest=manifest
+        )
+
+    def put_entry(self, entry: ManifestCacheEntry) -> None:
+        """
+        Inserts or replaces an entry into the cache database, then removes the least recently used
+        entries until the cache fits in its maximum size.
+        """
+        if not self.enabled:
+            return
+
+        manifest_bytes = _manifest_to_bytes(entry.manifest)
+        if len(manifest_bytes) > self.max_size_bytes:
+            logger.debug(
+                f"Not caching the manifest {entry.s3_key}, which is larger than the cache."
+            )
+            return
+
+        with self.db_lock, self.db_connection:
+            self.db_connection.execute(
+                f"INSERT OR REPLACE INTO {self.table_name} VALUES(:s3_key, :etag, :metadata, :manifest, :size, :last_access_time)",
+                {
+                    "s3_key": entry.s3_key,
+                    "etag": entry.etag,
+                    "metadata": json.dumps(entry.metadata),
+                    "manifest": manifest_bytes,
+                    "size": len(manifest_bytes),
+                    "last_access_time": time.time(),
+                },
+            )
+            self._evict_least_recently_used()
+
+    def _evict_least_recently_used(self) -> None:
+        """Removes the least recently used entries until the cache fits in its maximum size."""
+        (total_size,) = self.db_connection.execute(
+            f"SELECT COALESCE(SUM(size), 0) FROM {self.table_name}"
+        ).fetchone()
+        if total_size <= self.max_size_bytes:
+            return
+
+        evicted_keys = []
+        for s3_key, size in self.db_connection.execute(
+            f"SELECT s3_key, size FROM {self.table_name} ORDER BY last_access_time"
+        ).fetchall():
+            if total_size <= self.max_size_bytes:
+                break
+            evicted_keys.append((s3_key,))
+            total_size -= size
+        self.db_connection.executemany(
+            f"DELETE FROM {self.table_name} WHERE s3_key=?", evicted_keys
+        )
+        logger.debug(f"Evicted {len(evicted_keys)} entries from {self.cache_name}")
+
+
+def _manifest_to_bytes(manifest: BaseAssetManifest) -> bytes:
+    """
+    Returns the given manifest serialized with marshal, as the fields of the manifest with its paths
+    as tuples of their field values, in the order of `pathFields`.
+    """
+    document: Dict[str, Any] = {}
+    for field in dataclasses.fields(manifest):
+        if field.name != "paths":
+            value = getattr(manifest, field.name)
+            document[field.name] = value.value if isinstance(value, Enum) else value
+
+    paths = list(manifest.paths)
+    path_fields = [field.name for field in dataclasses.fields(paths[0])] if paths else []
+    document["pathFields"] = path_fields
+    document["paths"] = [
+        tuple(getattr(path, field_name) for field_name in path_fields) for path in paths
+    ]
+    return marshal.dumps(document)
+
+
+def _manifest_from_bytes(manifest_bytes: bytes, columnar: bool = False) -> BaseAssetManifest:
+    """
+    Returns the manifest serialized by `_manifest_to_bytes`, as a ColumnarAssetManifest if `columnar`
+    is True and it is a v2023-03-03 manifest.
+    """
+    document: Dict[str, Any] = marshal.loads(manifest_bytes)
+    path_fields = document.pop("pathFields")
+    document["paths"] = [dict(zip(path_fields, values)) for values in document["paths"]]
+    version = ManifestVersion(document["manifestVersion"])
+    if columnar and version == ManifestVersion.v2023_03_03:
+        return ColumnarAssetManifest.decode(manifest_data=document)
+    manifest_model = ManifestModelRegistry.get_manifest_model(version=version)
+    return manifest_model.AssetManifest.decode(manifest_data=document)
@@ -7,7 +7,8 @@ Module for accessing the local 'last seen on S3' cache.
 import logging
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Optional
+from threading import Lock
+from typing import Any, Dict, List, Optional
 
 from .cache_db import CacheDB
 
@@ -40,13 +41,21 @@ class S3CheckCache(CacheDB):
 
     This class also automatically locks when doing writes, so it can be called
     by multiple threads.
+
+    If a `preload_key_prefix` (e.g. "<bucket>/<root prefix>/Data") is given, all unexpired entries
+    under that prefix are loaded into memory when entering the context manager. Lookups of keys
+    under the prefix are then answered from memory without locking, and new entries are buffered
+    and written in batches of `WRITE_BATCH_SIZE`, with the remainder written when exiting.
     """
 
     CACHE_NAME = "s3_check_cache"
     CACHE_DB_VERSION = 1
     ENTRY_EXPIRY_DAYS = 30
+    WRITE_BATCH_SIZE = 10000
 
-    def __init__(self, cache_dir: Optional[str] = None) -> None:
+    def __init__(
+        self, cache_dir: Optional[str] = None, preload_key_prefix: Optional[str] = None
+    ) -> None:
         table_name: str = f"s3checkV{self.CACHE_DB_VERSION}"
         create_query: str = (
             f"CREATE TABLE s3checkV{self.CACHE_DB_VERSION}(s3_key text primary key, last_seen_time timestamp)"
@@ -57,6 +66,58 @@ class S3CheckCache(CacheDB):
             create_query=create_query,
             cache_dir=cache_dir,
         )
+        self.preload_key_prefix = preload_key_prefix
+        self._preloaded_entries: Optional[Dict[str, str]] = None
+        self._pending_entries: List[Dict[str, Any]] = []
+        self._pending_entries_lock = Lock()
+
+    def __enter__(self):
+        """Called when entering the context manager."""
+        super().__enter__()
+        if self.enabled and self.preload_key_prefix:
+            self._preloaded_entries = self._load_entries(self.preload_key_prefix)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        """Called when exiting the context manager."""
+        if self.enabled:
+            self._flush_pending_entries()
+            self._preloaded_entries = None
+        super().__exit__(exc_type, exc_value, exc_traceback)
+
+    def _load_entries(self, key_prefix: str) -> Dict[str, str]:
+        """
+        Returns the last seen times of all unexpired entries whose keys start with the given prefix,
+        keyed by their S3 keys.
+        """
+        # All keys that start with the prefix sort between the prefix itself and the prefix with its
+        # last character incremented, so this is a range scan of the primary key index.
+        key_prefix_end = key_prefix[:-1] + chr(ord(key_prefix[-1]) + 1)
+        with self.db_lock, self.db_connection:
+            rows = self.db_connection.execute(
+                f"SELECT s3_key, last_seen_time FROM {self.table_name} WHERE s3_key >= ? AND s3_key < ?",
+                [key_prefix, key_prefix_end],
+            ).fetchall()
+
+        entries: Dict[str, str] = {}
+        for s3_key, last_seen_time in rows:
+            if self._is_unexpired(s3_key, str(last_seen_time)):
+                entries[s3_key] = str(last_seen_time)
+        logger.debug(f"Loaded {len(entries)} entries under {key_prefix} from {self.cache_name}")
+        return entries
+
+    def _is_unexpired(self, s3_key: str, last_seen_time: str) -> bool:
+        try:
+            last_seen = datetime.fromtimestamp(float(last_seen_time))
+            return (datetime.now() - last_seen).days < self.ENTRY_EXPIRY_DAYS
+        except ValueError:
+            logger.warning(f"Timestamp for S3 key {s3_key} is not valid. Ignoring.")
+            return False
+
+    def _is_preloaded(self, s3_key: str) -> bool:
+        return self._preloaded_entries is not None and s3_key.startswith(
+            self.preload_key_prefix  # type: ignore[arg-type]
+        )
 
     def get_entry(self, s3_key: str) -> Optional[S3CheckCacheEntry]:
         """
@@ -65,6 +126,12 @@ class S3CheckCache(CacheDB):
         if not self.enabled:
             return None
 
+        if self._is_preloaded(s3_key):
+            last_seen_time = self._preloaded_entries.get(s3_key)  # type: ignore[union-attr]
+            if last_seen_time is not None:
+                return S3CheckCacheEntry(s3_key=s3_key, last_seen_time=last_seen_time)
+            return None
+
         with self.db_lock, self.db_connection:
             entry_vals = self.db_connection.execute(
                 f"SELECT * FROM {self.table_name} WHERE s3_key=?",
@@ -75,20 +142,36 @@ class S3CheckCache(CacheDB):
                     s3_key=entry_vals[0],
                     last_seen_time=str(entry_vals[1]),
                 )
-                try:
-                    last_seen = datetime.fromtimestamp(float(entry.last_seen_time))
-                    if (datetime.now() - last_seen).days < self.ENTRY_EXPIRY_DAYS:
-                        return entry
-                except ValueError:
-                    logger.warning(f"Timestamp for S3 key {s3_key} is not valid. Ignoring.")
+                if self._is_unexpired(entry.s3_key, entry.last_seen_time):
+                    return entry
 
             return None
 
     def put_entry(self, entry: S3CheckCacheEntry) -> None:
         """Inserts or replaces an entry into the cache database."""
-        if self.enabled:
-            with self.db_lock, self.db_connection:
-                self.db_connection.execute(
-                    f"INSERT OR REPLACE INTO {self.table_name} VALUES(:s3_key, :last_seen_time)",
-                    entry.to_dict(),
-                )
+        if not self.enabled:
+            return
+
+        if self._is_preloaded(entry.s3_key):
+            self._preloaded_entries[entry.s3_key] = entry.last_seen_time  # type: ignore[index]
+            with self._pending_entries_lock:
+                self._pending_entries.append(entry.to_dict())
+                if len(self._pending_entries) < self.WRITE_BATCH_SIZE:
+                    return
+            self._flush_pending_entries()
+            return
+
+        with self.db_lock, self.db_connection:
+            self.db_connection.execute(
+                self._insert_query(),
+                entry.to_dict(),
+            )
+
+    def _flush_pending_entries(self) -> None:
+        """Writes all of the buffered entries to the cache database in a single transaction."""
+        with self._pending_entries_lock:
+            entries, self._pending_entries = self._pending_entries, []
+        self._write_entries(self._insert_query(), entries)
+
+    def _insert_query(self) -> str:
+        return f"INSERT OR REPLACE INTO {self.table_name} VALUES(:s3_key, :last_seen_time)"
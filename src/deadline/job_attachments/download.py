@@ -4,28 +4,57 @@
 from __future__ import annotations
 
 import concurrent.futures
+import hashlib
+import heapq
 import io
 import json
 import os
 import re
+import secrets
 import sys
+import threading
 import time
 from collections import defaultdict
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 from itertools import chain
 from logging import Logger, LoggerAdapter, getLogger
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Any, Callable, DefaultDict, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    DefaultDict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import boto3
 from boto3.s3.transfer import ProgressCallbackInvoker
 from botocore.client import BaseClient
-from botocore.exceptions import BotoCoreError, ClientError
+from botocore.exceptions import (
+    BotoCoreError,
+    ClientError,
+    IncompleteReadError,
+    ReadTimeoutError,
+    ResponseStreamingError,
+)
 
+from deadline.client.config import config_file
+
+from .asset_manifests._canonical_json import canonical_path_comparator
 from .asset_manifests.base_manifest import BaseAssetManifest, BaseManifestPath as RelativeFilePath
-from .asset_manifests.hash_algorithms import HashAlgorithm
+from .asset_manifests.hash_algorithms import HashAlgorithm, _get_hasher, hash_file
 from .asset_manifests.decode import decode_manifest
+from .asset_manifests.v2023_03_03 import ColumnarAssetManifest
+from .caches import ContentCache, HashCache, HashCacheEntry, ManifestCache, ManifestCacheEntry
 from .exceptions import (
     COMMON_ERROR_GUIDANCE_FOR_S3,
     AssetSyncError,
@@ -34,6 +63,7 @@ from .exceptions import (
     JobAttachmentsS3ClientError,
     PathOutsideDirectoryError,
     JobAttachmentsError,
+    ManifestNotSortedError,
     MissingAssetRootError,
 )
 from .vfs import (
@@ -56,6 +86,14 @@ from .progress_tracker import (
     ProgressStatus,
     ProgressTracker,
 )
+from ._bounded_submission import as_completed_bounded
+from ._download_journal import DownloadJournal
+from ._concurrency import (
+    AdaptiveConcurrencyController,
+    adaptive_concurrency,
+    call_in_slot,
+    is_adaptive_concurrency_enabled,
+)
 from ._aws.aws_clients import (
     get_account_id,
     get_s3_client,
@@ -69,18 +107,51 @@ from .os_file_permission import (
     _set_fs_group_for_posix,
     _set_fs_permission_for_windows,
 )
-from ._utils import _is_relative_to, _join_s3_paths, _is_windows_file_path_limit
+from ._utils import _copy_file, _is_relative_to, _join_s3_paths, _is_windows_file_path_limit
 
 download_logger = getLogger("deadline.job_attachments.download")
 
 S3_DOWNLOAD_MAX_CONCURRENCY = 10
+# Files larger than this are downloaded in multiple parts by the S3 transfer manager. It's the
+# default multipart threshold of boto3's TransferConfig, which the transfer manager is created with.
+S3_DOWNLOAD_MULTIPART_THRESHOLD = 8 * 1024 * 1024
+# The number of times a small file download is attempted when reading the object fails, as for the
+# downloads of the S3 transfer manager.
+S3_SMALL_FILE_DOWNLOAD_MAX_ATTEMPTS = 5
+S3_SMALL_FILE_DOWNLOAD_CHUNK_SIZE = 256 * 1024
+# The errors reading an object that the S3 transfer manager retries its downloads on.
+S3_RETRYABLE_DOWNLOAD_ERRORS = (
+    TimeoutError,
+    ConnectionError,
+    ReadTimeoutError,
+    IncompleteReadError,
+    ResponseStreamingError,
+)
 WINDOWS_MAX_PATH_LENGTH = 260
 TEMP_DOWNLOAD_ADDED_CHARS_LENGTH = 9
 
 
 def get_manifest_from_s3(
-    manifest_key: str, s3_bucket: str, session: Optional[boto3.Session] = None
+    manifest_key: str,
+    s3_bucket: str,
+    session: Optional[boto3.Session] = None,
+    columnar: bool = False,
 ) -> BaseAssetManifest:
+    """
+    Gets and decodes a manifest from S3. If `columnar` is True, a v2023-03-03 manifest is returned
+    as a ColumnarAssetManifest.
+    """
+    with _open_manifest_cache() as manifest_cache:
+        if manifest_cache is not None:
+            (asset_manifest, _) = _get_manifest_and_metadata_from_s3(
+                manifest_key,
+                s3_bucket,
+                session=session,
+                manifest_cache=manifest_cache,
+                columnar=columnar,
+            )
+            return asset_manifest
+
     s3_client = get_s3_client(session=session)
     try:
         file_buffer = io.BytesIO()
@@ -92,10 +163,217 @@ def get_manifest_from_s3(
         )
         byte_value = file_buffer.getvalue()
         string_value = byte_value.decode("utf-8")
-        asset_manifest = decode_manifest(string_value)
+        asset_manifest = decode_manifest(string_value, columnar=columnar)
         file_buffer.close()
         return asset_manifest
-    except ClientError as exc:
+    except Exception as exc:
+        raise _get_manifest_download_error(exc, manifest_key, s3_bucket) from exc
+
+
+def _get_manifest_and_metadata_from_s3(
+    manifest_key: str,
+    s3_bucket: str,
+    session: Optional[boto3.Session] = None,
+    manifest_cache: Optional[ManifestCache] = None,
+    columnar: bool = False,
+) -> Tuple[BaseAssetManifest, dict[str, str]]:
+    """
+    Gets a manifest from S3 along with the user metadata of its object, in a single GET request.
+    Manifests are small enough to be read in one request, unlike files in the CAS. If `columnar` is
+    True, a v2023-03-03 manifest is returned as a ColumnarAssetManifest.
+
+    If a manifest cache is given and has an entry for the manifest, the request is conditional on
+    the ETag of the entry, and the cached manifest is returned if it hasn't changed. Otherwise, the
+    downloaded manifest is added to the cache.
+    """
+    cache_key = _join_s3_paths(s3_bucket, manifest_key)
+    cached_entry = (
+        manifest_cache.get_entry(cache_key, columnar=columnar)
+        if manifest_cache is not None
+        else None
+    )
+
+    s3_client = get_s3_client(session=session)
+    get_object_args: dict[str, Any] = {
+        "Bucket": s3_bucket,
+        "Key": manifest_key,
+        "ExpectedBucketOwner": get_account_id(session=session),
+    }
+    if cached_entry is not None:
+        get_object_args["IfNoneMatch"] = cached_entry.etag
+    try:
+        try:
+            response = s3_client.get_object(**get_object_args)
+        except ClientError as exc:
+            status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
+            if cached_entry is not None and status_code == 304:
+                download_logger.debug(f"Using cached manifest for {manifest_key}")
+                return (cached_entry.manifest, cached_entry.metadata)
+            raise
+        with response["Body"] as body:
+            string_value = body.read().decode("utf-8")
+        asset_manifest = decode_manifest(string_value, columnar=columnar)
+    except Exception as exc:
+        raise _get_manifest_download_error(exc, manifest_key, s3_bucket) from exc
+
+    metadata: dict[str, str] = response.get("Metadata", {})
+    if manifest_cache is not None and "ETag" in response:
+        manifest_cache.put_entry(
+            ManifestCacheEntry(
+                s3_key=cache_key,
+                etag=response["ETag"],
+                metadata=metadata,
+                manifest=asset_manifest,
+            )
+        )
+    return (asset_manifest, metadata)
+
+
+@contextmanager
+def _open_manifest_cache() -> Iterator[Optional[ManifestCache]]:
+    """
+    Opens the local manifest cache if it's enabled with the 'settings.manifest_cache_megabytes'
+    configuration setting, or yields None.
+    """
+    max_size_megabytes = get_manifest_cache_max_megabytes()
+    if max_size_megabytes == 0:
+        yield None
+        return
+    with ManifestCache(max_size_bytes=max_size_megabytes * 1024 * 1024) as manifest_cache:
+        yield manifest_cache
+
+
+def get_manifest_cache_max_megabytes() -> int:
+    """Returns the 'settings.manifest_cache_megabytes' configuration setting."""
+    return _get_megabytes_setting("manifest_cache_megabytes")
+
+
+def get_download_cache_max_megabytes() -> int:
+    """Returns the 'settings.download_cache_megabytes' configuration setting."""
+    return _get_megabytes_setting("download_cache_megabytes")
+
+
+def get_small_file_download_threshold() -> int:
+    """
+    Returns the 'settings.small_file_download_threshold_megabytes' configuration setting, in bytes.
+    """
+    return _get_megabytes_setting("small_file_download_threshold_megabytes") * 1024 * 1024
+
+
+def get_large_file_download_part_size() -> int:
+    """
+    Returns the 'settings.large_file_download_part_megabytes' configuration setting, in bytes.
+    """
+    return _get_megabytes_setting("large_file_download_part_megabytes") * 1024 * 1024
+
+
+def get_large_file_download_max_concurrency() -> int:
+    """Returns the 'settings.large_file_download_max_concurrency' configuration setting."""
+    setting_value = config_file.get_setting("settings.large_file_download_max_concurrency")
+    try:
+        max_concurrency = int(setting_value)
+    except ValueError as ve:
+        raise AssetSyncError(
+            "Failed to parse configuration settings. Please ensure that the following settings in the config file are integers: "
+            "'large_file_download_max_concurrency'"
+        ) from ve
+    if max_concurrency <= 0:
+        raise AssetSyncError(
+            f"Nonvalid value for configuration setting: 'large_file_download_max_concurrency' ({max_concurrency}) must be positive integer."
+        )
+    return max_concurrency
+
+
+def _get_megabytes_setting(setting_name: str) -> int:
+    setting_value = config_file.get_setting(f"settings.{setting_name}")
+    try:
+        max_size_megabytes = int(setting_value)
+    except ValueError as ve:
+        raise AssetSyncError(
+            "Failed to parse configuration settings. Please ensure that the following settings in the config file are integers: "
+            f"'{setting_name}'"
+        ) from ve
+    if max_size_megabytes < 0:
+        raise AssetSyncError(
+            f"Nonvalid value for configuration setting: '{setting_name}' ({max_size_megabytes}) must be a non-negative integer."
+        )
+    return max_size_megabytes
+
+
+def _open_content_cache(allow_hardlinks: bool = True) -> Optional[ContentCache]:
+    """
+    Returns the host-level cache of downloaded files if it's enabled with the
+    'settings.download_cache_megabytes' configuration setting, or None. Files are hardlinked from
+    the cache if the 'settings.download_cache_hardlinks' setting is true and `allow_hardlinks` is True.
+    """
+    max_size_megabytes = get_download_cache_max_megabytes()
+    if max_size_megabytes == 0:
+        return None
+
+    setting_value = config_file.get_setting("settings.download_cache_hardlinks")
+    try:
+        use_hardlinks = config_file.str2bool(setting_value)
+    except ValueError as ve:
+        raise AssetSyncError(
+            "Nonvalid value for configuration setting: 'download_cache_hardlinks' "
+            f"({setting_value}) must be a boolean value."
+        ) from ve
+    if use_hardlinks and not allow_hardlinks:
+        download_logger.debug(
+            "Copying files from the download cache instead of hardlinking them, because their "
+            "permissions are changed for the session."
+        )
+        use_hardlinks = False
+
+    return ContentCache(
+        max_size_bytes=max_size_megabytes * 1024 * 1024, use_hardlinks=use_hardlinks
+    )
+
+
+@contextmanager
+def _open_download_journals(
+    cache_dir: str, journal_keys_by_root: dict[str, str], resume: bool = False
+) -> Iterator[dict[str, DownloadJournal]]:
+    """
+    Opens the download journal of each of the given local roots in the given cache directory, keyed
+    by the root and its journal key, resuming them if `resume` is True, and yields them by root. The
+    journals are removed if the context exits without an exception, and kept for a resumed download
+    otherwise. A root whose journal can't be opened (e.g. it's in use by another download) isn't
+    journaled.
+    """
+    download_journals: dict[str, DownloadJournal] = {}
+    for local_root, journal_key in journal_keys_by_root.items():
+        try:
+            download_journals[local_root] = DownloadJournal(
+                cache_dir, local_root, journal_key, resume=resume
+            )
+        except OSError as e:
+            download_logger.warning(
+                f"Unable to open the download journal of {local_root}, so its download can't be resumed: {e}"
+            )
+
+    completed = False
+    try:
+        yield download_journals
+        completed = True
+    finally:
+        for download_journal in download_journals.values():
+            download_journal.close(remove=completed)
+
+
+def _get_manifest_journal_key(manifest: BaseAssetManifest) -> str:
+    """Returns a key of the download journal of the given manifest, from its files and their hashes."""
+    hasher = hashlib.sha256(manifest.hashAlg.value.encode("utf-8"))
+    for path in manifest.paths:
+        hasher.update(f"\n{path.path}\0{path.hash}".encode("utf-8", errors="surrogatepass"))
+    return hasher.hexdigest()
+
+
+def _get_manifest_download_error(exc: Exception, manifest_key: str, s3_bucket: str) -> Exception:
+    """
+    Returns the error to raise for the given exception raised while getting a manifest from S3.
+    """
+    if isinstance(exc, ClientError):
         status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
         status_code_guidance = {
             **COMMON_ERROR_GUIDANCE_FOR_S3,
@@ -113,20 +391,19 @@ def get_manifest_from_s3(
             ),
             404: "Not found. Please check your bucket name and object key, and ensure that they exist in the AWS account.",
         }
-        raise JobAttachmentsS3ClientError(
+        return JobAttachmentsS3ClientError(
             action="downloading binary file",
             status_code=status_code,
             bucket_name=s3_bucket,
             key_or_prefix=manifest_key,
             message=f"{status_code_guidance.get(status_code, '')} {str(exc)}",
-        ) from exc
-    except BotoCoreError as bce:
-        raise JobAttachmentS3BotoCoreError(
+        )
+    if isinstance(exc, BotoCoreError):
+        return JobAttachmentS3BotoCoreError(
             action="downloading binary file",
-            error_details=str(bce),
-        ) from bce
-    except Exception as e:
-        raise AssetSyncError(e) from e
+            error_details=str(exc),
+        )
+    return AssetSyncError(exc)
 
 
 def _get_output_manifest_prefix(
@@ -325,26 +602,39 @@ def download_files_in_directory(
     (example of `directory_path`: "inputs/subdirectory1")
     (example of `local_download_dir`: "/home/username")
     """
-    all_grouped_paths = get_job_input_output_paths_by_asset_root(
-        s3_settings=s3_settings,
-        attachments=attachments,
-        farm_id=farm_id,
-        queue_id=queue_id,
-        job_id=job_id,
-        session=session,
+    # The manifests are decoded in columnar form, so that only the paths under the directory are
+    # created as objects.
+    manifests: list[BaseAssetManifest] = [
+        get_manifest_from_s3(
+            manifest_key=_join_s3_paths(manifest_properties.inputManifestPath),
+            s3_bucket=s3_settings.s3BucketName,
+            session=session,
+            columnar=True,
+        )
+        for manifest_properties in attachments.manifests
+        if manifest_properties.inputManifestPath
+    ]
+    output_manifests_by_root = get_output_manifests_by_asset_root(
+        s3_settings, farm_id, queue_id, job_id, session=session, columnar=True
     )
+    manifests.extend(chain.from_iterable(output_manifests_by_root.values()))
 
     # Group by hash algorithm all the files that fall under the directory
     files_to_download: DefaultDict[HashAlgorithm, list[RelativeFilePath]] = DefaultDict(list)
     total_bytes = 0
     total_files = 0
-    for path_group in all_grouped_paths.values():
-        for hash_alg, path_list in path_group.files_by_hash_alg.items():
-            files_list = [file for file in path_list if file.path.startswith(directory_path + "/")]
-            files_size = sum([file.size for file in files_list])
-            total_bytes += files_size
-            total_files += len(files_list)
-            files_to_download[hash_alg].extend(files_list)
+    for manifest in manifests:
+        if isinstance(manifest, ColumnarAssetManifest):
+            selected_manifest = manifest.select_directory(directory_path)
+            files_list = list(selected_manifest.paths)
+            total_bytes += selected_manifest.get_paths_size()
+        else:
+            files_list = [
+                file for file in manifest.paths if file.path.startswith(directory_path + "/")
+            ]
+            total_bytes += sum([file.size for file in files_list])
+        total_files += len(files_list)
+        files_to_download[manifest.hashAlg].extend(files_list)
 
     # Sets up progress tracker to report download progress back to the caller.
     progress_tracker = ProgressTracker(
@@ -358,22 +648,20 @@ def download_files_in_directory(
 
     start_time = time.perf_counter()
 
-    for hash_alg, file_paths in files_to_download.items():
-        downloaded_files_paths = _download_files_parallel(
-            file_paths,
-            hash_alg,
-            num_download_workers,
-            local_download_dir,
-            s3_settings.s3BucketName,
-            s3_settings.full_cas_prefix(),
-            progress_tracker=progress_tracker,
-        )
+    downloaded_files_paths_by_root = _download_files_from_roots_parallel(
+        [
+            (local_download_dir, hash_alg, file_paths)
+            for hash_alg, file_paths in files_to_download.items()
+        ],
+        num_download_workers,
+        s3_settings.s3BucketName,
+        s3_settings.full_cas_prefix(),
+        progress_tracker=progress_tracker,
+    )
 
     progress_tracker.total_time = time.perf_counter() - start_time
 
-    return progress_tracker.get_download_summary_statistics(
-        {local_download_dir: downloaded_files_paths}
-    )
+    return progress_tracker.get_download_summary_statistics(downloaded_files_paths_by_root)
 
 
 def download_file(
@@ -387,10 +675,26 @@ def download_file(
     modified_time_override: Optional[float] = None,
     progress_tracker: Optional[ProgressTracker] = None,
     file_conflict_resolution: Optional[FileConflictResolution] = FileConflictResolution.CREATE_COPY,
+    content_cache: Optional[ContentCache] = None,
+    small_file_threshold: Optional[int] = None,
+    concurrency_controller: Optional[AdaptiveConcurrencyController] = None,
+    download_journal: Optional[DownloadJournal] = None,
+    hash_cache: Optional[HashCache] = None,
 ) -> Tuple[int, Optional[Path]]:
     """
     Downloads a file from the S3 bucket to the local directory. `modified_time_override` is ignored if the manifest
     version used supports timestamps.
+    If a content cache is given, the file is materialized from the cache if it's there, or added to the
+    cache after it's downloaded.
+    Files up to `small_file_threshold` bytes (by default, the 'settings.small_file_download_threshold_megabytes'
+    configuration setting) are downloaded with a single GetObject request, rather than by the S3 transfer manager.
+    Larger files are downloaded in ranged parts if the 'settings.large_file_download_part_megabytes' configuration
+    setting is set (see `_download_large_object`), taking the limit of the concurrency controller into account.
+    With a download journal, the parts of large files downloaded in parts are recorded in the journal.
+    With a hash cache, a file downloaded with a single GetObject request is hashed as it's written,
+    verified against its hash in the manifest, and recorded in the hash cache, so that uploading it
+    again doesn't hash it. Other files aren't read again to hash them, so they aren't verified or
+    recorded in the hash cache.
     Returns a tuple of (size in bytes, filename) of the downloaded file.
     - The file size of 0 means that this file comes from a manifest version that does not provide file sizes.
     - The filename of None indicates that this file has been skipped or has not been downloaded.
@@ -398,41 +702,38 @@ def download_file(
     if not s3_client:
         s3_client = get_s3_client(session=session)
 
-    transfer_manager = get_s3_transfer_manager(s3_client=s3_client)
+    # The transfer manager makes as many requests at once as the S3 client has connections, which is
+    # the maximum limit of the concurrency controller.
+    transfer_manager = get_s3_transfer_manager(
+        s3_client=s3_client, max_concurrency=get_s3_max_pool_connections()
+    )
 
     # The modified time in the manifest is in microseconds, but utime requires the time be expressed in seconds.
     modified_time_override = file.mtime / 1000000  # type: ignore[attr-defined]
 
     file_bytes = file.size
 
-    # Python will handle the path separator '/' correctly on every platform.
-    local_file_name = Path(local_download_dir).joinpath(file.path)
-
     s3_key = (
         f"{cas_prefix}/{file.hash}.{hash_algorithm.value}"
         if cas_prefix
         else f"{file.hash}.{hash_algorithm.value}"
     )
 
-    # If the file name already exists, resolve the conflict based on the file_conflict_resolution
-    if local_file_name.is_file():
-        if file_conflict_resolution == FileConflictResolution.SKIP:
-            return (file_bytes, None)
-        elif file_conflict_resolution == FileConflictResolution.OVERWRITE:
-            pass
-        elif file_conflict_resolution == FileConflictResolution.CREATE_COPY:
-            # This loop resolves filename conflicts by appending " (1)"
-            # to the stem of the filename until a unique name is found.
-            while local_file_name.is_file():
-                local_file_name = local_file_name.parent.joinpath(
-                    local_file_name.stem + " (1)" + local_file_name.suffix
-                )
-        else:
-            raise ValueError(
-                f"Unknown choice for file conflict resolution: {file_conflict_resolution}"
-            )
-
-    local_file_name.parent.mkdir(parents=True, exist_ok=True)
+    resolved_file_name = _resolve_local_file_name(
+        file, local_download_dir, file_conflict_resolution
+    )
+    if resolved_file_name is None:
+        return (file_bytes, None)
+    local_file_name = resolved_file_name
+
+    if content_cache is not None and content_cache.materialize(
+        file.hash, hash_algorithm, file_bytes, local_file_name
+    ):
+        if progress_tracker and not progress_tracker.track_progress_callback(file_bytes):
+            raise AssetSyncCancelledError("File download cancelled.")
+        download_logger.debug(f"Copied {file.path} to {str(local_file_name)} from the cache")
+        os.utime(local_file_name, (modified_time_override, modified_time_override))  # type: ignore[arg-type]
+        return (file_bytes, local_file_name)
 
     future: concurrent.futures.Future
 
@@ -447,16 +748,55 @@ def download_file(
 
     subscribers = [ProgressCallbackInvoker(handler)]
 
-    future = transfer_manager.download(
-        bucket=s3_bucket,
-        key=s3_key,
-        fileobj=str(local_file_name),
-        extra_args={"ExpectedBucketOwner": get_account_id(session=session)},
-        subscribers=subscribers,
-    )
+    if small_file_threshold is None:
+        small_file_threshold = get_small_file_download_threshold()
 
-    try:
+    # The hash of the downloaded file, if it was hashed while downloading.
+    downloaded_hash: Optional[str] = None
+
+    def download_object(s3_key: str) -> None:
+        nonlocal future, downloaded_hash
+
+        if file_bytes <= small_file_threshold:
+            downloaded_hash = _download_small_object(
+                s3_client,  # type: ignore[arg-type]
+                s3_bucket,
+                s3_key,
+                local_file_name,
+                get_account_id(session=session),
+                progress_tracker,
+                hash_algorithm if hash_cache is not None else None,
+            )
+            return
+
+        part_size = get_large_file_download_part_size()
+        if part_size and hasattr(os, "pwrite"):
+            _download_large_object(
+                s3_client,  # type: ignore[arg-type]
+                s3_bucket,
+                s3_key,
+                file,
+                local_file_name,
+                get_account_id(session=session),
+                part_size,
+                get_large_file_download_max_concurrency(),
+                concurrency_controller,
+                progress_tracker,
+                download_journal,
+            )
+            return
+
+        future = transfer_manager.download(
+            bucket=s3_bucket,
+            key=s3_key,
+            fileobj=str(local_file_name),
+            extra_args={"ExpectedBucketOwner": get_account_id(session=session)},
+            subscribers=subscribers,
+        )
         future.result()
+
+    try:
+        download_object(s3_key)
     except concurrent.futures.CancelledError as ce:
         if progress_tracker and progress_tracker.continue_reporting is False:
             raise AssetSyncCancelledError("File download cancelled.")
@@ -495,15 +835,8 @@ def download_file(
         status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
         if status_code == 404:
             s3_key = s3_key.rsplit(".", 1)[0]
-            future = transfer_manager.download(
-                bucket=s3_bucket,
-                key=s3_key,
-                fileobj=str(local_file_name),
-                extra_args={"ExpectedBucketOwner": get_account_id(session=session)},
-                subscribers=subscribers,
-            )
             try:
-                future.result()
+                download_object(s3_key)
             except concurrent.futures.CancelledError as ce:
                 if progress_tracker and progress_tracker.continue_reporting is False:
                     raise AssetSyncCancelledError("File download cancelled.")
@@ -542,34 +875,422 @@ def download_file(
         raise AssetSyncError(e) from e
 
     download_logger.debug(f"Downloaded {file.path} to {str(local_file_name)}")
+    if downloaded_hash is not None:
+        # Verified before it's added to the content cache, so that the cache only has valid files.
+        _verify_downloaded_file(file, local_file_name, downloaded_hash)
+    if content_cache is not None:
+        content_cache.put(file.hash, hash_algorithm, file_bytes, local_file_name)
     os.utime(local_file_name, (modified_time_override, modified_time_override))  # type: ignore[arg-type]
+    if hash_cache is not None and downloaded_hash is not None:
+        # Recorded after setting the modified time, which the hash cache entry is for.
+        _put_hash_cache_entry(hash_cache, local_file_name, hash_algorithm, file.hash)
 
     return (file_bytes, local_file_name)
 
 
-def _download_files_parallel(
-    files: List[RelativeFilePath],
-    hash_algorithm: HashAlgorithm,
-    num_download_workers: int,
+def _verify_downloaded_file(
+    file: RelativeFilePath, local_file_name: Path, downloaded_hash: str
+) -> None:
+    """
+    Checks that the hash of the downloaded file, computed while it was downloaded, matches its hash
+    in the manifest. Otherwise, removes the file and raises an AssetSyncError.
+    """
+    if downloaded_hash != file.hash:
+        _remove_file(str(local_file_name))
+        raise AssetSyncError(
+            f"The downloaded contents of {file.path} have the hash {downloaded_hash}, which doesn't "
+            f"match its hash {file.hash} in the manifest."
+        )
+
+
+def _read_object(
+    s3_client: BaseClient,
+    s3_bucket: str,
+    s3_key: str,
+    expected_bucket_owner: str,
+    write: Callable[[int, bytes], None],
+    byte_range: Optional[Tuple[int, int]] = None,
+    progress_tracker: Optional[ProgressTracker] = None,
+) -> None:
+    """
+    Reads an object, or the given [start, end) range of bytes of it, with a GetObject request, passing
+    each chunk to `write` with its offset in the object. Reading is retried as in the S3 transfer
+    manager, reverting the progress reported for the failed attempt. Raises
+    concurrent.futures.CancelledError if the progress callback cancels the download.
+    """
+    start = byte_range[0] if byte_range else 0
+    range_args = {"Range": f"bytes={start}-{byte_range[1] - 1}"} if byte_range else {}
+    for attempt in range(S3_SMALL_FILE_DOWNLOAD_MAX_ATTEMPTS):
+        offset = start
+        try:
+            response = s3_client.get_object(
+                Bucket=s3_bucket,
+                Key=s3_key,
+                ExpectedBucketOwner=expected_bucket_owner,
+                **range_args,
+            )
+            for chunk in response["Body"].iter_chunks(S3_SMALL_FILE_DOWNLOAD_CHUNK_SIZE):
+                write(offset, chunk)
+                offset += len(chunk)
+                if progress_tracker and not progress_tracker.track_progress_callback(len(chunk)):
+                    raise concurrent.futures.CancelledError()
+            break
+        except S3_RETRYABLE_DOWNLOAD_ERRORS as e:
+            if attempt + 1 == S3_SMALL_FILE_DOWNLOAD_MAX_ATTEMPTS:
+                raise
+            download_logger.debug(f"Retrying download of {s3_key} after error: {e}")
+            if progress_tracker:
+                progress_tracker.track_progress_callback(start - offset)
+
+    if byte_range and offset != byte_range[1]:
+        raise AssetSyncError(
+            f"Received {offset - start} bytes of {s3_key} for the range {range_args['Range']}, "
+            "which doesn't match the size of the file in the manifest."
+        )
+
+
+def _download_small_object(
+    s3_client: BaseClient,
+    s3_bucket: str,
+    s3_key: str,
+    local_file_name: Path,
+    expected_bucket_owner: str,
+    progress_tracker: Optional[ProgressTracker] = None,
+    hash_algorithm: Optional[HashAlgorithm] = None,
+) -> Optional[str]:
+    """
+    Downloads an object with a single GetObject request, streaming it into a temporary file next to
+    the local file, which is then renamed to the local file as the S3 transfer manager does.
+    If a hash algorithm is given, the object is hashed as it streams, and its hash is returned.
+    """
+    # The temporary file name adds the same number of characters as that of the S3 transfer manager.
+    temp_file_name = f"{local_file_name}.{secrets.token_hex(4)}"
+    temp_file: Optional[BinaryIO] = None
+    hasher = _get_hasher(hash_algorithm) if hash_algorithm else None
+
+    def write(offset: int, chunk: bytes) -> None:
+        nonlocal temp_file
+        # The file is only created once the object is found.
+        if temp_file is None:
+            temp_file = open(temp_file_name, "wb")
+        temp_file.seek(offset)
+        temp_file.write(chunk)
+        if hasher is not None:
+            if offset == 0:
+                # Each attempt reads the object from the start.
+                hasher.reset()
+            hasher.update(chunk)
+
+    try:
+        _read_object(
+            s3_client,
+            s3_bucket,
+            s3_key,
+            expected_bucket_owner,
+            write,
+            progress_tracker=progress_tracker,
+        )
+        if temp_file is None:
+            # The object is empty.
+            temp_file = open(temp_file_name, "wb")
+        temp_file.close()
+        os.replace(temp_file_name, local_file_name)
+        return hasher.hexdigest() if hasher is not None else None
+    except BaseException:
+        if temp_file is not None:
+            temp_file.close()
+            _remove_file(temp_file_name)
+        raise
+
+
+def _download_large_object(
+    s3_client: BaseClient,
+    s3_bucket: str,
+    s3_key: str,
+    file: RelativeFilePath,
+    local_file_name: Path,
+    expected_bucket_owner: str,
+    part_size: int,
+    max_concurrency: int,
+    concurrency_controller: Optional[AdaptiveConcurrencyController] = None,
+    progress_tracker: Optional[ProgressTracker] = None,
+    download_journal: Optional[DownloadJournal] = None,
+) -> None:
+    """
+    Downloads the object of a file with concurrent ranged GetObject requests of `part_size` bytes.
+    Each part is written with `os.pwrite` at its offset of a temporary file next to the local file,
+    which is preallocated to the size of the file, and then renamed to the local file. Only the
+    chunks of the parts in flight are held in memory.
+
+    At most `max_concurrency` parts are downloaded at once, or the limit of the concurrency
+    controller if there is one and it's lower, as of when each part starts.
+
+    With a download journal, the parts are recorded in the journal as they complete, and the parts
+    that a previous download recorded are skipped if its temporary file is still there. The
+    temporary file is kept if the download fails, so that it can be resumed.
+    """
+    size = file.size
+    completed_parts: Set[Tuple[int, int]] = set()
+    if download_journal is not None:
+        # The temporary file is named for the file's hash, so that a resumed download finds it.
+        temp_file_name = f"{local_file_name}.{file.hash[:8]}"
+        if os.path.isfile(temp_file_name) and os.path.getsize(temp_file_name) == size:
+            completed_parts = download_journal.get_completed_parts(file)
+    else:
+        # The temporary file name adds the same number of characters as that of the S3 transfer manager.
+        temp_file_name = f"{local_file_name}.{secrets.token_hex(4)}"
+    fd = os.open(
+        temp_file_name,
+        os.O_WRONLY | os.O_CREAT | (0 if completed_parts else os.O_TRUNC),
+        0o666,
+    )
+    stop_event = threading.Event()
+
+    def write(offset: int, chunk: bytes) -> None:
+        # Stops the other parts once one of them fails.
+        if stop_event.is_set():
+            raise concurrent.futures.CancelledError()
+        os.pwrite(fd, chunk, offset)
+
+    def download_part(start: int, end: int) -> None:
+        _read_object(
+            s3_client,
+            s3_bucket,
+            s3_key,
+            expected_bucket_owner,
+            write,
+            (start, end),
+            progress_tracker,
+        )
+        if download_journal is not None:
+            download_journal.record_part(file, start, end)
+
+    try:
+        _preallocate_file(fd, size)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            pending: set[concurrent.futures.Future] = set()
+            try:
+                for start in range(0, size, part_size):
+                    end = min(start + part_size, size)
+                    if (start, end) in completed_parts:
+                        if progress_tracker:
+                            progress_tracker.track_progress_callback(end - start)
+                        continue
+
+                    part_limit = max_concurrency
+                    if concurrency_controller is not None:
+                        part_limit = max(1, min(part_limit, concurrency_controller.limit))
+                    while len(pending) >= part_limit:
+                        done, pending = concurrent.futures.wait(
+                            pending, return_when=concurrent.futures.FIRST_COMPLETED
+                        )
+                        for future in done:
+                            future.result()
+                    pending.add(executor.submit(download_part, start, end))
+                for future in concurrent.futures.as_completed(pending):
+                    future.result()
+            except BaseException:
+                stop_event.set()
+                for future in pending:
+                    future.cancel()
+                raise
+    except BaseException:
+        os.close(fd)
+        if download_journal is None:
+            _remove_file(temp_file_name)
+        raise
+
+    os.close(fd)
+    os.replace(temp_file_name, local_file_name)
+
+
+def _preallocate_file(fd: int, size: int) -> None:
+    """
+    Allocates the given size for the file, so that writing its parts out of order doesn't fragment
+    it, or only sets its size where that isn't supported.
+    """
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(fd, 0, size)
+            return
+        except OSError:
+            # e.g. the file system doesn't support it.
+            pass
+    os.ftruncate(fd, size)
+
+
+def _remove_file(file_name: str) -> None:
+    try:
+        os.unlink(file_name)
+    except FileNotFoundError:
+        pass
+
+
+def _resolve_local_file_name(
+    file: RelativeFilePath,
     local_download_dir: str,
+    file_conflict_resolution: Optional[FileConflictResolution],
+) -> Optional[Path]:
+    """
+    Returns the local path to write the given file to, after resolving any conflict with an existing
+    file, and creates its parent directory. Returns None if the file should be skipped.
+    """
+    # Python will handle the path separator '/' correctly on every platform.
+    local_file_name = Path(local_download_dir).joinpath(file.path)
+
+    # If the file name already exists, resolve the conflict based on the file_conflict_resolution
+    if local_file_name.is_file():
+        if file_conflict_resolution == FileConflictResolution.SKIP:
+            return None
+        elif file_conflict_resolution in (
+            FileConflictResolution.OVERWRITE,
+            # Files that are already up to date are kept before getting here.
+            FileConflictResolution.SYNC,
+        ):
+            pass
+        elif file_conflict_resolution == FileConflictResolution.CREATE_COPY:
+            # This loop resolves filename conflicts by appending " (1)"
+            # to the stem of the filename until a unique name is found.
+            while local_file_name.is_file():
+                local_file_name = local_file_name.parent.joinpath(
+                    local_file_name.stem + " (1)" + local_file_name.suffix
+                )
+        else:
+            raise ValueError(
+                f"Unknown choice for file conflict resolution: {file_conflict_resolution}"
+            )
+
+    local_file_name.parent.mkdir(parents=True, exist_ok=True)
+    return local_file_name
+
+
+def _is_local_file_up_to_date(
+    file: RelativeFilePath,
+    local_download_dir: str,
+    hash_algorithm: HashAlgorithm,
+    hash_cache: Optional[HashCache] = None,
+) -> Optional[Path]:
+    """
+    Returns the local path of the given file if a file already there has the same contents, or None.
+    A file with the size and modification time of the manifest entry is taken as the same, as
+    downloads set it. Otherwise a file of the same size is hashed, unless the hash cache has its hash
+    at its current modification time, and the hash cache is updated with the hash.
+    """
+    local_file_name = Path(local_download_dir).joinpath(file.path)
+    try:
+        stat = local_file_name.stat()
+    except OSError:
+        return None
+    if stat.st_size != file.size:
+        return None
+    # The modified time in the manifest is in microseconds.
+    if abs(stat.st_mtime_ns - file.mtime * 1000) < 1000:  # type: ignore[attr-defined]
+        return local_file_name
+
+    full_path = str(local_file_name.resolve())
+    entry = hash_cache.get_entry(full_path, hash_algorithm) if hash_cache else None
+    if entry is not None and entry.last_modified_time == _get_hash_cache_modified_time(stat):
+        file_hash = entry.file_hash
+    else:
+        try:
+            file_hash = hash_file(full_path, hash_algorithm)
+        except OSError:
+            return None
+        if hash_cache:
+            _put_hash_cache_entry(hash_cache, local_file_name, hash_algorithm, file_hash)
+
+    return local_file_name if file_hash == file.hash else None
+
+
+def _get_hash_cache_modified_time(stat: os.stat_result) -> str:
+    """Formats the modified time of a file as the uploads do, so that hash cache entries are shared."""
+    return str(datetime.fromtimestamp(stat.st_mtime))
+
+
+def _get_hash_cache_hash(
+    hash_cache: HashCache, local_file_name: Path, hash_algorithm: HashAlgorithm
+) -> Optional[str]:
+    """Returns the hash of the given local file in the hash cache at its current modification time, or None."""
+    try:
+        stat = local_file_name.stat()
+    except OSError:
+        return None
+    entry = hash_cache.get_entry(str(local_file_name.resolve()), hash_algorithm)
+    if entry is None or entry.last_modified_time != _get_hash_cache_modified_time(stat):
+        return None
+    return entry.file_hash
+
+
+def _put_hash_cache_entry(
+    hash_cache: HashCache, local_file_name: Path, hash_algorithm: HashAlgorithm, file_hash: str
+) -> None:
+    """Records the hash of the given local file at its current modification time in the hash cache."""
+    try:
+        stat = local_file_name.stat()
+    except OSError:
+        return
+    hash_cache.put_entry(
+        HashCacheEntry(
+            file_path=str(local_file_name.resolve()),
+            hash_algorithm=hash_algorithm,
+            file_hash=file_hash,
+            last_modified_time=_get_hash_cache_modified_time(stat),
+        )
+    )
+
+
+def _download_files_with_same_hash(
+    files: List[Tuple[str, RelativeFilePath]],
+    hash_algorithm: HashAlgorithm,
     s3_bucket: str,
     cas_prefix: Optional[str],
     s3_client: Optional[BaseClient] = None,
     session: Optional[boto3.Session] = None,
-    file_mod_time: Optional[float] = None,
+    modified_time_override: Optional[float] = None,
     progress_tracker: Optional[ProgressTracker] = None,
     file_conflict_resolution: Optional[FileConflictResolution] = FileConflictResolution.CREATE_COPY,
-) -> list[str]:
+    content_cache: Optional[ContentCache] = None,
+    small_file_threshold: Optional[int] = None,
+    concurrency_controller: Optional[AdaptiveConcurrencyController] = None,
+    download_journals: Optional[dict[str, DownloadJournal]] = None,
+    hash_cache: Optional[HashCache] = None,
+) -> List[Tuple[str, int, Optional[Path], bool]]:
     """
-    Downloads files in parallel using thread pool.
-    Returns a list of local paths of downloaded files.
+    Downloads the given (local root, file) pairs, whose files all have the same hash, by downloading
+    the object from S3 once and copying it locally to the other files' paths, with their own
+    modification times. Files that the download journal of their root records as complete are kept,
+    as are files that are already up to date if the file conflict resolution is SYNC (see
+    `_is_local_file_up_to_date`.) Returns a tuple of (local root, size in bytes, filename, whether it was copied from another file
+    or kept) for each of the files. (See `download_file` for the size and filename.)
     """
-    downloaded_file_names: list[str] = []
-
-    with concurrent.futures.ThreadPoolExecutor(max_workers=num_download_workers) as executor:
-        futures = {
-            executor.submit(
-                download_file,
+    results: List[Tuple[str, int, Optional[Path], bool]] = []
+    downloaded_file_name: Optional[Path] = None
+    for local_download_dir, file in files:
+        download_journal = download_journals.get(local_download_dir) if download_journals else None
+        if download_journal is not None:
+            completed_file_name = download_journal.get_completed_file(file)
+            if completed_file_name is not None:
+                if downloaded_file_name is None:
+                    downloaded_file_name = completed_file_name
+                results.append((local_download_dir, file.size, completed_file_name, True))
+                continue
+
+        if file_conflict_resolution == FileConflictResolution.SYNC:
+            up_to_date_file_name = _is_local_file_up_to_date(
+                file, local_download_dir, hash_algorithm, hash_cache
+            )
+            if up_to_date_file_name is not None:
+                if downloaded_file_name is None:
+                    downloaded_file_name = up_to_date_file_name
+                if download_journal is not None:
+                    download_journal.record_file(file, up_to_date_file_name)
+                results.append((local_download_dir, file.size, up_to_date_file_name, True))
+                continue
+
+        if downloaded_file_name is None:
+            # Files that are skipped because they already exist aren't copied from, as their
+            # contents may differ.
+            (file_bytes, local_file_name) = download_file(
                 file,
                 hash_algorithm,
                 local_download_dir,
@@ -577,30 +1298,198 @@ def _download_files_parallel(
                 cas_prefix,
                 s3_client,
                 session,
-                file_mod_time,
+                modified_time_override,
                 progress_tracker,
                 file_conflict_resolution,
-            ): file
-            for file in files
-        }
+                content_cache,
+                small_file_threshold,
+                concurrency_controller,
+                download_journal,
+                hash_cache,
+            )
+            downloaded_file_name = local_file_name
+            copied = False
+        else:
+            file_bytes = file.size
+            local_file_name = _resolve_local_file_name(
+                file, local_download_dir, file_conflict_resolution
+            )
+            if local_file_name is not None:
+                try:
+                    _copy_file(downloaded_file_name, local_file_name)
+                except OSError as e:
+                    raise AssetSyncError(e) from e
+                # The modified time in the manifest is in microseconds, but utime requires the time be expressed in seconds.
+                file_mtime = file.mtime / 1000000  # type: ignore[attr-defined]
+                os.utime(local_file_name, (file_mtime, file_mtime))
+                download_logger.debug(
+                    f"Copied {file.path} to {str(local_file_name)} from {str(downloaded_file_name)}"
+                )
+                if (
+                    hash_cache is not None
+                    and _get_hash_cache_hash(hash_cache, downloaded_file_name, hash_algorithm)
+                    == file.hash
+                ):
+                    # A copy of a file whose hash is recorded has the same hash.
+                    _put_hash_cache_entry(hash_cache, local_file_name, hash_algorithm, file.hash)
+            copied = True
+
+        if download_journal is not None and local_file_name is not None:
+            download_journal.record_file(file, local_file_name)
+        results.append((local_download_dir, file_bytes, local_file_name, copied))
+    return results
+
+
+def _download_files_parallel(
+    files: Sequence[RelativeFilePath],
+    hash_algorithm: HashAlgorithm,
+    num_download_workers: int,
+    local_download_dir: str,
+    s3_bucket: str,
+    cas_prefix: Optional[str],
+    s3_client: Optional[BaseClient] = None,
+    session: Optional[boto3.Session] = None,
+    file_mod_time: Optional[float] = None,
+    progress_tracker: Optional[ProgressTracker] = None,
+    file_conflict_resolution: Optional[FileConflictResolution] = FileConflictResolution.CREATE_COPY,
+    content_cache: Optional[ContentCache] = None,
+) -> list[str]:
+    """
+    Downloads files in parallel using thread pool.
+    Returns a list of local paths of downloaded files.
+    """
+    return _download_files_from_roots_parallel(
+        [(local_download_dir, hash_algorithm, files)],
+        num_download_workers,
+        s3_bucket,
+        cas_prefix,
+        s3_client,
+        session,
+        file_mod_time,
+        progress_tracker,
+        file_conflict_resolution,
+        content_cache,
+    )[local_download_dir]
+
+
+def _download_files_from_roots_parallel(
+    files_by_root: List[Tuple[str, HashAlgorithm, Sequence[RelativeFilePath]]],
+    num_download_workers: int,
+    s3_bucket: str,
+    cas_prefix: Optional[str],
+    s3_client: Optional[BaseClient] = None,
+    session: Optional[boto3.Session] = None,
+    file_mod_time: Optional[float] = None,
+    progress_tracker: Optional[ProgressTracker] = None,
+    file_conflict_resolution: Optional[FileConflictResolution] = FileConflictResolution.CREATE_COPY,
+    content_cache: Optional[ContentCache] = None,
+    download_journals: Optional[dict[str, DownloadJournal]] = None,
+    hash_cache: Optional[HashCache] = None,
+) -> dict[str, list[str]]:
+    """
+    Downloads the files of every given (local root, hash algorithm, files) on a single thread pool,
+    so that the downloads of many small roots still keep all of the workers busy.
+
+    Files with the same hash are downloaded from S3 once, and copied locally to the others' paths,
+    even across roots. The copies are counted as skipped in the progress. As for uploads, small files
+    are scheduled before the files that are large enough to be downloaded in multiple parts.
+
+    With download journals by root, the files are recorded in the journal of their root, and the files
+    that it records as complete are kept, and counted as skipped in the progress.
+
+    If the file conflict resolution is SYNC, the existing files that are already up to date are kept
+    and counted as skipped, so that only the files that changed are downloaded.
+
+    With a hash cache, downloaded files are verified against their hashes and recorded in the hash
+    cache (see `download_file`), which SYNC also checks before hashing an existing file.
+
+    Returns a dict of local roots to lists of local paths of downloaded files.
+    """
+    downloaded_file_names_by_root: dict[str, list[str]] = {
+        local_download_dir: [] for (local_download_dir, _, _) in files_by_root
+    }
+
+    files_by_hash: dict[Tuple[HashAlgorithm, str], List[Tuple[str, RelativeFilePath]]] = {}
+    for local_download_dir, hash_algorithm, files in files_by_root:
+        for file in files:
+            files_by_hash.setdefault((hash_algorithm, file.hash), []).append(
+                (local_download_dir, file)
+            )
+    small_file_threshold = get_small_file_download_threshold()
+
+    # The sort is stable, so files of the same size class keep their order.
+    hash_groups = sorted(
+        files_by_hash.items(),
+        key=lambda item: item[1][0][1].size > S3_DOWNLOAD_MULTIPART_THRESHOLD,
+    )
+    del files_by_hash
+
+    if s3_client is None and is_adaptive_concurrency_enabled():
+        # The controller monitors the requests of the client that the downloads share.
+        s3_client = get_s3_client(session=session)
+
+    # With adaptive concurrency, there is a worker for each connection, and the controller decides
+    # how many of them are downloading at once.
+    with adaptive_concurrency(
+        "download",
+        s3_client,
+        initial_limit=num_download_workers,
+        max_limit=get_s3_max_pool_connections(),
+        progress_tracker=progress_tracker,
+    ) as controller, concurrent.futures.ThreadPoolExecutor(
+        max_workers=controller.max_limit if controller else num_download_workers
+    ) as executor:
+        # Files are submitted as workers free up, rather than all at once, so that the memory used
+        # doesn't grow with the number of files.
+        submissions = (
+            (
+                executor,
+                call_in_slot,
+                (
+                    controller,
+                    files_with_same_hash[0][1].size,
+                    _download_files_with_same_hash,
+                    files_with_same_hash,
+                    hash_algorithm,
+                    s3_bucket,
+                    cas_prefix,
+                    s3_client,
+                    session,
+                    file_mod_time,
+                    progress_tracker,
+                    file_conflict_resolution,
+                    content_cache,
+                    small_file_threshold,
+                    controller,
+                    download_journals,
+                    hash_cache,
+                ),
+            )
+            for (hash_algorithm, _), files_with_same_hash in hash_groups
+        )
         # surfaces any exceptions in the thread
-        for future in concurrent.futures.as_completed(futures):
-            (file_bytes, local_file_name) = future.result()
-            if local_file_name:
-                downloaded_file_names.append(str(local_file_name.resolve()))
-                if progress_tracker:
-                    progress_tracker.increase_processed(1, 0)
-                    progress_tracker.report_progress()
-            else:
-                if progress_tracker:
-                    progress_tracker.increase_skipped(1, file_bytes)
-                    progress_tracker.report_progress()
+        for future in as_completed_bounded(submissions):
+            for local_download_dir, file_bytes, local_file_name, reused in future.result():
+                if local_file_name:
+                    downloaded_file_names_by_root[local_download_dir].append(
+                        str(local_file_name.resolve())
+                    )
+                    if progress_tracker:
+                        if reused:
+                            progress_tracker.increase_skipped(1, file_bytes)
+                        else:
+                            progress_tracker.increase_processed(1, 0)
+                        progress_tracker.report_progress()
+                else:
+                    if progress_tracker:
+                        progress_tracker.increase_skipped(1, file_bytes)
+                        progress_tracker.report_progress()
 
     # to report progress 100% at the end
     if progress_tracker:
         progress_tracker.report_progress()
 
-    return downloaded_file_names
+    return downloaded_file_names_by_root
 
 
 def download_files(
@@ -671,10 +1560,18 @@ def _get_asset_root_from_s3(
     except Exception as e:
         raise AssetSyncError(e) from e
 
-    if "asset-root-json" in head["Metadata"]:
-        return json.loads(head["Metadata"]["asset-root-json"])
+    return _get_asset_root_from_metadata(head["Metadata"])
+
+
+def _get_asset_root_from_metadata(metadata: dict[str, str]) -> Optional[str]:
+    """
+    Gets asset root from the metadata of an output manifest.
+    If neither of the keys "asset-root-json" or "asset-root" exist in the metadata, returns None.
+    """
+    if "asset-root-json" in metadata:
+        return json.loads(metadata["asset-root-json"])
     else:
-        return head["Metadata"].get("asset-root", None)
+        return metadata.get("asset-root", None)
 
 
 def get_job_output_paths_by_asset_root(
@@ -715,10 +1612,12 @@ def get_output_manifests_by_asset_root(
     task_id: Optional[str] = None,
     session_action_id: Optional[str] = None,
     session: Optional[boto3.Session] = None,
+    columnar: bool = False,
 ) -> dict[str, list[BaseAssetManifest]]:
     """
     For a given job/step/task, gets a map from each root path to a corresponding list of
-    output manifests.
+    output manifests. If `columnar` is True, v2023-03-03 manifests are returned as
+    ColumnarAssetManifests.
     """
     outputs: DefaultDict[str, list[BaseAssetManifest]] = DefaultDict(list)
     manifest_prefix: str = _get_output_manifest_prefix(
@@ -731,22 +1630,70 @@ def get_output_manifests_by_asset_root(
     except JobAttachmentsError:
         return outputs
 
-    for key in manifests_keys:
-        asset_manifest = get_manifest_from_s3(
-            manifest_key=key,
-            s3_bucket=s3_settings.s3BucketName,
-            session=session,
-        )
-        asset_root = _get_asset_root_from_s3(key, s3_settings.s3BucketName, session)
-        if not asset_root:
-            raise MissingAssetRootError(
-                f"Failed to get asset root from metadata of output manifest: {key}"
-            )
+    # The manifests are fetched concurrently, so they're put back in the order of their keys, which
+    # is the order that later manifests are merged over earlier ones.
+    manifests_by_index: dict[int, Tuple[str, BaseAssetManifest]] = {}
+    for index, asset_root, asset_manifest in _iter_output_manifests_from_s3(
+        manifests_keys, s3_settings.s3BucketName, session=session, columnar=columnar
+    ):
+        manifests_by_index[index] = (asset_root, asset_manifest)
+
+    for index in range(len(manifests_keys)):
+        (asset_root, asset_manifest) = manifests_by_index[index]
         outputs[asset_root].append(asset_manifest)
 
     return outputs
 
 
+def _iter_output_manifests_from_s3(
+    manifests_keys: list[str],
+    s3_bucket: str,
+    session: Optional[boto3.Session] = None,
+    columnar: bool = False,
+) -> Iterator[Tuple[int, str, BaseAssetManifest]]:
+    """
+    Gets the output manifests of the given keys concurrently, and yields the index of the key, the
+    asset root and the decoded manifest of each as soon as it has been fetched. The asset root comes
+    from the metadata of the manifest's GET response. Each manifest is decoded by the worker that
+    fetched it. The workers share the local manifest cache, if it's enabled.
+    """
+    if not manifests_keys:
+        return
+
+    with _open_manifest_cache() as manifest_cache, concurrent.futures.ThreadPoolExecutor(
+        max_workers=min(get_s3_max_pool_connections(), len(manifests_keys))
+    ) as executor:
+        submissions = (
+            (
+                executor,
+                _get_output_manifest_from_s3,
+                (index, key, s3_bucket, session, manifest_cache, columnar),
+            )
+            for index, key in enumerate(manifests_keys)
+        )
+        for future in as_completed_bounded(submissions):
+            yield future.result()
+
+
+def _get_output_manifest_from_s3(
+    index: int,
+    manifest_key: str,
+    s3_bucket: str,
+    session: Optional[boto3.Session] = None,
+    manifest_cache: Optional[ManifestCache] = None,
+    columnar: bool = False,
+) -> Tuple[int, str, BaseAssetManifest]:
+    (asset_manifest, metadata) = _get_manifest_and_metadata_from_s3(
+        manifest_key, s3_bucket, session=session, manifest_cache=manifest_cache, columnar=columnar
+    )
+    asset_root = _get_asset_root_from_metadata(metadata)
+    if not asset_root:
+        raise MissingAssetRootError(
+            f"Failed to get asset root from metadata of output manifest: {manifest_key}"
+        )
+    return (index, asset_root, asset_manifest)
+
+
 def download_files_from_manifests(
     s3_bucket: str,
     manifests_by_root: dict[str, BaseAssetManifest],
@@ -755,9 +1702,13 @@ def download_files_from_manifests(
     session: Optional[boto3.Session] = None,
     on_downloading_files: Optional[Callable[[ProgressReportMetadata], bool]] = None,
     logger: Optional[Union[Logger, LoggerAdapter]] = None,
+    download_journal_dir: Optional[str] = None,
+    resume: bool = False,
 ) -> DownloadSummaryStatistics:
     """
     Given manifests, downloads all files from a CAS in each manifest.
+    With a download journal directory, the downloaded files are recorded in a journal of each root
+    and manifest in that directory until the download completes, so that it can be resumed.
 
     Args:
         s3_bucket: The name of the S3 bucket.
@@ -766,6 +1717,10 @@ def download_files_from_manifests(
         session: The boto3 session to use.
         on_downloading_files: a callback to be called to periodically report progress to the caller.
             The callback returns True if the operation should continue as normal, or False to cancel.
+        download_journal_dir: a path to the local cache directory to keep the download journals in.
+            If it's None, the download isn't journaled, and can't be resumed.
+        resume: whether to resume an interrupted download from the journals, skipping the files that
+            it completed. Requires a download journal directory.
 
     Returns:
         The download summary statistics.
@@ -789,33 +1744,54 @@ def download_files_from_manifests(
     )
     start_time = time.perf_counter()
 
-    downloaded_files_paths_by_root: DefaultDict[str, list[str]] = DefaultDict(list)
-
-    for local_download_dir, manifest in manifests_by_root.items():
-        downloaded_files_paths = _download_files_parallel(
-            manifest.paths,
-            manifest.hashAlg,
+    # The group and permissions of downloaded files are changed for the session, which would change
+    # those of the cached files that they're hardlinks of, so they're copied instead.
+    content_cache = _open_content_cache(allow_hardlinks=fs_permission_settings is None)
+
+    with (
+        _open_download_journals(
+            download_journal_dir,
+            {
+                local_root: _get_manifest_journal_key(manifest)
+                for local_root, manifest in manifests_by_root.items()
+            },
+            resume,
+        )
+        if download_journal_dir
+        else nullcontext()
+    ) as download_journals:
+        downloaded_files_paths_by_root = _download_files_from_roots_parallel(
+            [
+                (local_download_dir, manifest.hashAlg, manifest.paths)
+                for local_download_dir, manifest in manifests_by_root.items()
+            ],
             num_download_workers,
-            local_download_dir,
             s3_bucket,
             cas_prefix,
             s3_client,
             session,
             file_mod_time,
             progress_tracker=progress_tracker,
+            content_cache=content_cache,
+            download_journals=download_journals,
         )
 
-        if fs_permission_settings is not None:
+    if fs_permission_settings is not None:
+        for local_download_dir, downloaded_files_paths in downloaded_files_paths_by_root.items():
             _set_fs_group(
                 file_paths=downloaded_files_paths,
                 local_root=local_download_dir,
                 fs_permission_settings=fs_permission_settings,
             )
 
-        downloaded_files_paths_by_root[local_download_dir].extend(downloaded_files_paths)
-
     progress_tracker.total_time = time.perf_counter() - start_time
-    return progress_tracker.get_download_summary_statistics(downloaded_files_paths_by_root)
+    summary_statistics = progress_tracker.get_download_summary_statistics(
+        downloaded_files_paths_by_root
+    )
+    if content_cache is not None:
+        summary_statistics.cache_hit_bytes = content_cache.hit_bytes
+        summary_statistics.cache_miss_bytes = content_cache.miss_bytes
+    return summary_statistics
 
 
 def _get_num_download_workers() -> int:
@@ -824,7 +1800,13 @@ def _get_num_download_workers() -> int:
     based on the allowed S3 max pool connections size. If the max worker count is calculated
     to be 0 due to a small pool connections size limit, it returns 1.
     """
-    num_download_workers = int(get_s3_max_pool_connections() / S3_DOWNLOAD_MAX_CONCURRENCY)
+    # Each worker may download a large file over several connections at once.
+    max_concurrency = (
+        get_large_file_download_max_concurrency()
+        if get_large_file_download_part_size()
+        else S3_DOWNLOAD_MAX_CONCURRENCY
+    )
+    num_download_workers = int(get_s3_max_pool_connections() / max_concurrency)
     if num_download_workers <= 0:
         # This can result in triggering "Connection pool is full" warning messages during downloads.
         num_download_workers = 1
@@ -869,6 +1851,10 @@ def merge_asset_manifests(manifests: list[BaseAssetManifest]) -> BaseAssetManife
     is unique by keeping the one from the last encountered manifest. (Thus, the steps'
     outputs are downloaded over the input job attachments.)
 
+    The paths of the merged manifest are in canonical order. Manifests whose paths are already in
+    canonical order (as they are when decoded from S3) are merged without indexing every path; any
+    other manifest is sorted first.
+
     Args:
         manifests (list[AssetManifest]): A list of manifests to be merged.
 
@@ -885,26 +1871,21 @@ def merge_asset_manifests(manifests: list[BaseAssetManifest]) -> BaseAssetManife
 
     first_manifest = manifests[0]
 
-    hash_alg: HashAlgorithm = first_manifest.hashAlg
-    merged_paths: dict[str, RelativeFilePath] = dict()
-    total_size: int = 0
-
-    # Loop each manifest
-    for manifest in manifests:
-        if manifest.hashAlg != hash_alg:
-            raise NotImplementedError(
-                f"Merging manifests with different hash algorithms is not supported.  {manifest.hashAlg.value} does not match {hash_alg.value}"
+    try:
+        merged_paths = list(iter_merged_manifest_paths(manifests))
+    except ManifestNotSortedError:
+        merged_paths = list(
+            _merge_sorted_paths(
+                [sorted(manifest.paths, key=canonical_path_comparator) for manifest in manifests]
             )
-
-        for path in manifest.paths:
-            merged_paths[path.path] = path
+        )
 
     manifest_args: dict[str, Any] = {
-        "hash_alg": hash_alg,
-        "paths": list(merged_paths.values()),
+        "hash_alg": first_manifest.hashAlg,
+        "paths": merged_paths,
     }
 
-    total_size = sum([path.size for path in merged_paths.values()])  # type: ignore
+    total_size = sum([path.size for path in merged_paths])  # type: ignore
     manifest_args["total_size"] = total_size
 
     output_manifest: BaseAssetManifest = first_manifest.__class__(**manifest_args)
@@ -912,11 +1893,67 @@ def merge_asset_manifests(manifests: list[BaseAssetManifest]) -> BaseAssetManife
     return output_manifest
 
 
+def iter_merged_manifest_paths(manifests: list[BaseAssetManifest]) -> Iterator[RelativeFilePath]:
+    """
+    Yields the merged paths of the given manifests, whose paths must each be in canonical order, in
+    canonical order. When several manifests have the same path, the one from the last of them is
+    kept. This is a k-way merge of the manifests, so it takes O(n log k) time for n paths in k
+    manifests, and holds only one path of each manifest at a time.
+
+    Raises:
+        NotImplementedError: When two manifests have different hash algorithms.
+        ManifestNotSortedError: When the paths of a manifest aren't in canonical order. The paths
+            before it have already been yielded.
+    """
+    for manifest in manifests:
+        if manifest.hashAlg != manifests[0].hashAlg:
+            raise NotImplementedError(
+                f"Merging manifests with different hash algorithms is not supported.  {manifest.hashAlg.value} does not match {manifests[0].hashAlg.value}"
+            )
+
+    return _merge_sorted_paths([manifest.paths for manifest in manifests])
+
+
+def _merge_sorted_paths(
+    path_lists: List[Iterable[RelativeFilePath]],
+) -> Iterator[RelativeFilePath]:
+    # Entries are ordered by canonical key and then by list index, so that of the entries with the
+    # same path, the one from the last list comes last. Entries with the same path in one list stay
+    # in their order, so the last of them is kept too.
+    merged_entries = heapq.merge(
+        *(_iter_keyed_paths(paths, index) for index, paths in enumerate(path_lists))
+    )
+    last_key: Optional[bytes] = None
+    last_path: Optional[RelativeFilePath] = None
+    for key, _, path in merged_entries:
+        if last_path is not None and key != last_key:
+            yield last_path
+        last_key = key
+        last_path = path
+    if last_path is not None:
+        yield last_path
+
+
+def _iter_keyed_paths(
+    paths: Iterable[RelativeFilePath], index: int
+) -> Iterator[Tuple[bytes, int, RelativeFilePath]]:
+    previous_key: Optional[bytes] = None
+    for path in paths:
+        key = canonical_path_comparator(path)
+        if previous_key is not None and key < previous_key:
+            raise ManifestNotSortedError(
+                f"The paths of the manifest at index {index} are not in canonical order: "
+                f"{path.path!r} is before the path before it."
+            )
+        previous_key = key
+        yield (key, index, path)
+
+
 def _write_manifest_to_temp_file(manifest: BaseAssetManifest, dir: Path) -> str:
     with NamedTemporaryFile(
-        suffix=".json", prefix="deadline-merged-manifest-", delete=False, mode="w", dir=dir
+        suffix=".json", prefix="deadline-merged-manifest-", delete=False, mode="wb", dir=dir
     ) as file:
-        file.write(manifest.encode())
+        manifest.encode_to_file(file)
         return file.name
 
 
@@ -1093,6 +2130,10 @@ class OutputDownloader:
     ) -> None:
         self.s3_settings = s3_settings
         self.session = session
+        # The download journals of the output are keyed by what's downloaded, as well as the root.
+        self._journal_key = "/".join(
+            [farm_id, queue_id, job_id, step_id or "", task_id or "", session_action_id or ""]
+        )
         self.outputs_by_root = get_job_output_paths_by_asset_root(
             s3_settings=s3_settings,
             farm_id=farm_id,
@@ -1160,14 +2201,30 @@ class OutputDownloader:
             FileConflictResolution
         ] = FileConflictResolution.CREATE_COPY,
         on_downloading_files: Optional[Callable[[ProgressReportMetadata], bool]] = None,
+        download_journal_dir: Optional[str] = None,
+        resume: bool = False,
+        hash_cache_dir: Optional[str] = None,
     ) -> DownloadSummaryStatistics:
         """
         Downloads outputs files from S3 bucket to the asset root(s).
+        With a download journal directory, the downloaded files are recorded in a journal of each root
+        in that directory until the download completes, so that it can be resumed.
+        With the SYNC file conflict resolution, only the outputs that differ from the existing local
+        files are downloaded, so that polling a running job for new outputs only downloads those.
+        With a hash cache directory, the outputs that are hashed as they download (those downloaded with
+        a single request) are verified against their hashes and recorded in the hash cache, so that
+        submitting them again as job inputs doesn't hash them. (See `download_file`.)
 
         Args:
             file_conflict_resolution: resolution method for file conflicts.
             on_downloading_files: a callback to be called to periodically report progress to the caller.
                 The callback returns True if the operation should continue as normal, or False to cancel.
+            download_journal_dir: a path to the local cache directory to keep the download journals
+                in. If it's None, the download isn't journaled, and can't be resumed.
+            resume: whether to resume an interrupted download from the journals, skipping the files
+                that it completed. Requires a download journal directory.
+            hash_cache_dir: a path to the local hash cache directory. If it's None, the downloads aren't
+                hashed, verified or recorded in a hash cache.
 
         Returns:
             The download summary statistics
@@ -1186,25 +2243,41 @@ class OutputDownloader:
             on_progress_callback=on_downloading_files,
         )
 
+        files_by_root: List[Tuple[str, HashAlgorithm, Sequence[RelativeFilePath]]] = []
+        for root, output_path_group in self.outputs_by_root.items():
+            for hash_alg, path_list in output_path_group.files_by_hash_alg.items():
+                # Validate the file paths to see if they are under the given download directory.
+                _ensure_paths_within_directory(root, [file.path for file in path_list])
+                files_by_root.append((root, hash_alg, path_list))
+
         start_time = time.perf_counter()
-        downloaded_files_paths_by_root: DefaultDict[str, list[str]] = DefaultDict(list)
 
         try:
-            for root, output_path_group in self.outputs_by_root.items():
-                for hash_alg, path_list in output_path_group.files_by_hash_alg.items():
-                    # Validate the file paths to see if they are under the given download directory.
-                    _ensure_paths_within_directory(root, [file.path for file in path_list])
-
-                    downloaded_files_paths = download_files(
-                        files=path_list,
-                        hash_algorithm=hash_alg,
-                        local_download_dir=root,
-                        s3_settings=self.s3_settings,
-                        session=self.session,
-                        progress_tracker=progress_tracker,
-                        file_conflict_resolution=file_conflict_resolution,
-                    )
-                    downloaded_files_paths_by_root[root].extend(downloaded_files_paths)
+            with (
+                _open_download_journals(
+                    download_journal_dir,
+                    {root: self._journal_key for root in self.outputs_by_root},
+                    resume,
+                )
+                if download_journal_dir
+                else nullcontext()
+            ) as download_journals, (
+                HashCache(hash_cache_dir) if hash_cache_dir else nullcontext()
+            ) as hash_cache:
+                # The outputs of all of the roots are downloaded on one thread pool.
+                downloaded_files_paths_by_root = _download_files_from_roots_parallel(
+                    files_by_root,
+                    _get_num_download_workers(),
+                    self.s3_settings.s3BucketName,
+                    self.s3_settings.full_cas_prefix(),
+                    get_s3_client(session=self.session),
+                    self.session,
+                    datetime.now().timestamp(),
+                    progress_tracker,
+                    file_conflict_resolution,
+                    download_journals=download_journals,
+                    hash_cache=hash_cache,
+                )
         except AssetSyncCancelledError:
             downloaded_files = progress_tracker.processed_files
             raise AssetSyncCancelledError(
@@ -123,6 +123,12 @@ class ManifestDecodeValidationError(JobAttachmentsError):
     """
 
 
+class ManifestNotSortedError(JobAttachmentsError):
+    """
+    Exception for when the paths of an asset manifest are expected to be in canonical order, but aren't.
+    """
+
+
 class MissingManifestError(JobAttachmentsError):
     """
     Exception for when trying to retrieve asset manifests that don't exist.
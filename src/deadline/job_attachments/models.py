@@ -9,7 +9,7 @@ import sys
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set
 from urllib.parse import urlparse
 
 from deadline.job_attachments.asset_manifests import HashAlgorithm, hash_data
@@ -43,6 +43,25 @@ class AssetRootManifest:
     outputs: List[Path] = field(default_factory=list)
 
 
+@dataclass(frozen=True)
+class FileRecord:
+    """
+    Represents the metadata of a file, gathered once when the file is discovered so that later steps
+    don't need to query the file system for it again.
+    """
+
+    path: str
+    """
+    The normalized path of the file, without resolving symbolic links. It's absolute if the directory
+    it was found in was given as an absolute path.
+    """
+    resolved_path: str
+    """The path of the file with all symbolic links resolved"""
+    size: int
+    mtime_ns: int
+    is_symlink: bool
+
+
 @dataclass
 class AssetRootGroup:
     """Represents lists of input files, output files and path references grouped under the same root"""
@@ -52,6 +71,10 @@ class AssetRootGroup:
     inputs: Set[Path] = field(default_factory=set)
     outputs: Set[Path] = field(default_factory=set)
     references: Set[Path] = field(default_factory=set)
+    # The records of the input files that were discovered up front, keyed by the string of their input path.
+    input_file_records: Dict[str, FileRecord] = field(
+        default_factory=dict, compare=False, repr=False
+    )
 
 
 @dataclass
@@ -74,7 +97,8 @@ class ManifestPathGroup:
 
     def add_manifest_to_group(self, manifest: BaseAssetManifest) -> None:
         if manifest.hashAlg not in self.files_by_hash_alg:
-            self.files_by_hash_alg[manifest.hashAlg] = manifest.paths
+            # Copied, as the paths of this group are extended with those of other manifests.
+            self.files_by_hash_alg[manifest.hashAlg] = list(manifest.paths)
         else:
             self.files_by_hash_alg[manifest.hashAlg].extend(manifest.paths)
         self.total_bytes += manifest.totalSize  # type: ignore[attr-defined]
@@ -161,6 +185,14 @@ class JobAttachmentsFileSystem(str, Enum):
     VIRTUAL = "VIRTUAL"
 
 
+class LargeFileUploadMode(str, Enum):
+    # Upload large files one at a time after the small files, each with a multipart upload, which
+    # wastes less bandwidth if the upload is cancelled
+    SERIAL = "SERIAL"
+    # Upload several large files at once alongside the small files, within the transfer budget
+    CONCURRENT = "CONCURRENT"
+
+
 @dataclass
 class ManifestProperties:
     """The assets for a Step under an asset root"""
@@ -362,6 +394,8 @@ class FileConflictResolution(Enum):
     SKIP = 1
     OVERWRITE = 2
     CREATE_COPY = 3
+    # Overwrites only the existing files whose contents differ from the file being downloaded.
+    SYNC = 4
 
 
 def default_glob_all() -> List[str]:
@@ -72,10 +72,14 @@ class DownloadSummaryStatistics(SummaryStatistics):
     """
     A summary statistics metadata to be returned to the client when the downloading files has
     completed. In addition to the general statistics, includes a dict mapping download locations
-    to the number of downloaded files in each of those locations.
+    to the number of downloaded files in each of those locations, and the total size of the files
+    that were (`cache_hit_bytes`) and weren't (`cache_miss_bytes`) found in the host-level download
+    cache, if it's enabled.
     """
 
     file_counts_by_root_directory: Dict[str, int] = field(default_factory=dict)
+    cache_hit_bytes: int = 0
+    cache_miss_bytes: int = 0
 
     def aggregate(self, other: SummaryStatistics) -> SummaryStatistics:
         """
@@ -91,6 +95,8 @@ class DownloadSummaryStatistics(SummaryStatistics):
                 Counter(self.file_counts_by_root_directory)
                 + Counter(other.file_counts_by_root_directory)
             )
+            self.cache_hit_bytes += other.cache_hit_bytes  # type: ignore[attr-defined]
+            self.cache_miss_bytes += other.cache_miss_bytes  # type: ignore[attr-defined]
 
         return self
 
@@ -100,6 +106,8 @@ class DownloadSummaryStatistics(SummaryStatistics):
         """
         download_summary_statistics_dict = asdict(self)
         del download_summary_statistics_dict["file_counts_by_root_directory"]
+        del download_summary_statistics_dict["cache_hit_bytes"]
+        del download_summary_statistics_dict["cache_miss_bytes"]
         return SummaryStatistics(**download_summary_statistics_dict)
 
 
@@ -10,13 +10,29 @@ from contextlib import contextmanager
 import errno
 import logging
 import os
+import queue
 import sys
+import threading
 import time
 from datetime import datetime
 from io import BufferedReader, BytesIO
 from math import trunc
 from pathlib import Path, PurePath
-from typing import Any, Callable, Generator, Optional, Tuple, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import boto3
 from boto3.s3.transfer import ProgressCallbackInvoker
@@ -34,6 +50,10 @@ from .asset_manifests import (
     ManifestVersion,
     base_manifest,
 )
+from ._bounded_submission import as_completed_bounded
+from ._concurrency import adaptive_concurrency, call_in_slot
+from ._hashing import hash_file_in_pool, hashing_process_pool
+from ._transfer_budget import TransferBudget
 from ._aws.aws_clients import (
     get_account_id,
     get_boto3_session,
@@ -57,10 +77,13 @@ from .models import (
     AssetRootManifest,
     AssetUploadGroup,
     Attachments,
+    FileRecord,
     FileStatus,
     FileSystemLocationType,
     JobAttachmentS3Settings,
+    LargeFileUploadMode,
     ManifestProperties,
+    OutputFile,
     PathFormat,
     StorageProfile,
 )
@@ -82,6 +105,52 @@ S3_MULTIPART_UPLOAD_CHUNK_SIZE: int = 8388608  # 8 MB
 # The maximum number of concurrency for multipart uploads. This is used to determine the max number
 # of thread workers for uploading multiple small files in parallel.
 S3_UPLOAD_MAX_CONCURRENCY: int = 10
+# Below this many objects to check, a head-object call per object is always used to check for the
+# existence of objects in the CAS, rather than considering listing the CAS prefix.
+S3_CAS_LISTING_MIN_OBJECTS: int = 1000
+# The maximum number of keys returned by a single list-objects-v2 request.
+S3_LIST_OBJECTS_PAGE_SIZE: int = 1000
+# The size of the CAS is estimated by listing one of the 16^3 possible three hex digit key prefixes.
+S3_CAS_SIZE_SAMPLE_PREFIX: str = "000"
+# The maximum number of hashed files waiting to be uploaded when hashing and uploading files in a
+# pipeline. Hashing pauses when the queue is full, so that it doesn't run far ahead of the upload.
+UPLOAD_PIPELINE_QUEUE_SIZE: int = 1000
+# How often (in seconds) the hashing and upload sides of the pipeline check whether the other side stopped.
+UPLOAD_PIPELINE_POLL_INTERVAL: float = 0.1
+
+
+def _get_from_pipeline_queue(
+    file_queue: queue.Queue[Optional[Tuple[Path, base_manifest.BaseManifestPath]]],
+    stop_event: threading.Event,
+) -> Optional[Tuple[Path, base_manifest.BaseManifestPath]]:
+    """
+    Gets the next item from the given queue, waiting for one if the queue is empty.
+    Returns None at the end of the queue, or if the stop event is set while waiting.
+    """
+    while not stop_event.is_set():
+        try:
+            return file_queue.get(timeout=UPLOAD_PIPELINE_POLL_INTERVAL)
+        except queue.Empty:
+            continue
+    return None
+
+
+def _put_on_pipeline_queue(
+    file_queue: queue.Queue[Optional[Tuple[Path, base_manifest.BaseManifestPath]]],
+    item: Optional[Tuple[Path, base_manifest.BaseManifestPath]],
+    stop_event: threading.Event,
+) -> bool:
+    """
+    Puts the item on the given queue, waiting for space if the queue is full.
+    Returns False if the stop event is set before the item could be put on the queue.
+    """
+    while not stop_event.is_set():
+        try:
+            file_queue.put(item, timeout=UPLOAD_PIPELINE_POLL_INTERVAL)
+            return True
+        except queue.Full:
+            continue
+    return False
 
 
 class S3AssetUploader:
@@ -119,12 +188,31 @@ class S3AssetUploader:
             if self.num_upload_workers <= 0:
                 # This can result in triggering "Connection pool is full" warning messages during uploads.
                 self.num_upload_workers = 1
+
+            upload_max_megabytes_in_flight = int(
+                config_file.get_setting("settings.upload_max_megabytes_in_flight")
+            )
         except ValueError as ve:
             raise AssetSyncError(
                 "Failed to parse configuration settings. Please ensure that the following settings in the config file are integers: "
-                "'s3_max_pool_connections', 'small_file_threshold_multiplier'"
+                "'s3_max_pool_connections', 'small_file_threshold_multiplier', 'upload_max_megabytes_in_flight'"
             ) from ve
 
+        large_file_upload_mode = config_file.get_setting("settings.large_file_upload_mode")
+        try:
+            self.large_file_upload_mode = LargeFileUploadMode(large_file_upload_mode.upper())
+        except ValueError as ve:
+            raise AssetSyncError(
+                "Nonvalid value for configuration setting: 'large_file_upload_mode' "
+                f"({large_file_upload_mode}) must be one of {[mode.value for mode in LargeFileUploadMode]}."
+            ) from ve
+        # In CONCURRENT mode, enough large files are uploaded at once to use all of the connections.
+        self.num_large_file_upload_workers = (
+            max(1, s3_max_pool_connections // S3_UPLOAD_MAX_CONCURRENCY)
+            if self.large_file_upload_mode == LargeFileUploadMode.CONCURRENT
+            else 1
+        )
+
         self._s3 = get_s3_client(self._session)  # pylint: disable=invalid-name
 
         # Confirm that the settings values are all positive.
@@ -135,9 +223,17 @@ class S3AssetUploader:
             error_msg = (
                 f"'s3_max_pool_connections' ({s3_max_pool_connections}) must be positive integer."
             )
+        elif upload_max_megabytes_in_flight <= 0:
+            error_msg = f"'upload_max_megabytes_in_flight' ({upload_max_megabytes_in_flight}) must be positive integer."
         if error_msg:
             raise AssetSyncError("Nonvalid value for configuration setting: " + error_msg)
 
+        # All of the uploads in flight at once share this budget, whether of small or large files.
+        self._transfer_budget = TransferBudget(
+            max_bytes=upload_max_megabytes_in_flight * 1024 * 1024,
+            max_connections=s3_max_pool_connections,
+        )
+
     def upload_assets(
         self,
         job_attachment_settings: JobAttachmentS3Settings,
@@ -174,6 +270,48 @@ class S3AssetUploader:
         """
 
         # Upload asset manifest
+        manifest_key_and_hash = self.upload_manifest(
+            job_attachment_settings=job_attachment_settings,
+            manifest=manifest,
+            source_root=source_root,
+            partial_manifest_prefix=partial_manifest_prefix,
+            file_system_location_name=file_system_location_name,
+            manifest_write_dir=manifest_write_dir,
+            manifest_name_suffix=manifest_name_suffix,
+            manifest_metadata=manifest_metadata,
+            manifest_file_name=manifest_file_name,
+        )
+
+        # Upload assets
+        self.upload_input_files(
+            manifest=manifest,
+            s3_bucket=job_attachment_settings.s3BucketName,
+            source_root=asset_root if asset_root else source_root,
+            s3_cas_prefix=job_attachment_settings.full_cas_prefix(),
+            progress_tracker=progress_tracker,
+            s3_check_cache_dir=s3_check_cache_dir,
+        )
+
+        return manifest_key_and_hash
+
+    def upload_manifest(
+        self,
+        job_attachment_settings: JobAttachmentS3Settings,
+        manifest: BaseAssetManifest,
+        source_root: Path,
+        partial_manifest_prefix: Optional[str] = None,
+        file_system_location_name: Optional[str] = None,
+        manifest_write_dir: Optional[str] = None,
+        manifest_name_suffix: str = "input",
+        manifest_metadata: dict[str, dict[str, str]] = dict(),
+        manifest_file_name: Optional[str] = None,
+    ) -> tuple[str, str]:
+        """
+        Uploads the asset manifest, without the assets listed in it. See `upload_assets` for the arguments.
+
+        Returns:
+            A tuple of (the partial key for the manifest on S3, the hash of input manifest).
+        """
         (hash_alg, manifest_bytes, manifest_name) = S3AssetUploader._gather_upload_metadata(
             manifest=manifest,
             source_root=source_root,
@@ -207,16 +345,6 @@ class S3AssetUploader:
                 extra_args=manifest_metadata,
             )
 
-        # Upload assets
-        self.upload_input_files(
-            manifest=manifest,
-            s3_bucket=job_attachment_settings.s3BucketName,
-            source_root=asset_root if asset_root else source_root,
-            s3_cas_prefix=job_attachment_settings.full_cas_prefix(),
-            progress_tracker=progress_tracker,
-            s3_check_cache_dir=s3_check_cache_dir,
-        )
-
         return (partial_manifest_key, hash_data(manifest_bytes, hash_alg))
 
     @staticmethod
@@ -230,7 +358,9 @@ class S3AssetUploader:
         Gathers metadata information of manifest to be used for writing the local manifest
         """
         hash_alg = manifest.get_default_hash_alg()
-        manifest_bytes = manifest.encode().encode("utf-8")
+        manifest_buffer = BytesIO()
+        manifest.encode_to_file(manifest_buffer)
+        manifest_bytes = manifest_buffer.getvalue()
         manifest_name_prefix = hash_data(
             f"{file_system_location_name or ''}{str(source_root)}".encode(), hash_alg
         )
@@ -271,8 +401,8 @@ class S3AssetUploader:
         local_manifest_file = Path(manifest_write_dir, input_manifest_folder_name, manifest_name)
         logger.info(f"Creating local manifest file: {local_manifest_file}\n")
         local_manifest_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(local_manifest_file, "w") as file:
-            file.write(manifest.encode())
+        with open(local_manifest_file, "wb") as file:
+            manifest.encode_to_file(file)
 
         return local_manifest_file
 
@@ -308,37 +438,86 @@ class S3AssetUploader:
         given S3 prefix already.
 
         The local 'S3 check cache' is used to note if we've seen an object in S3 before so we
-        can save the S3 API calls.
+        can save the S3 API calls. For large manifests, the existence of the remaining objects
+        may be resolved in bulk by listing the CAS prefix (see `_resolve_existing_cas_keys_by_listing`.)
         """
 
         # Split into a separate 'large file' and 'small file' queues.
         # Separate 'large' files from 'small' files so that we can process 'large' files serially.
         # This wastes less bandwidth if uploads are cancelled, as it's better to use the multi-threaded
         # multi-part upload for a single large file than multiple large files at the same time.
+        # In the CONCURRENT large file upload mode, 'large' files are uploaded in parallel instead.
         (small_file_queue, large_file_queue) = self._separate_files_by_size(
             manifest.paths, self.small_file_threshold
         )
 
-        with S3CheckCache(s3_check_cache_dir) as s3_cache:
-            # First, process the whole 'small file' queue with parallel object uploads.
-            with concurrent.futures.ThreadPoolExecutor(
-                max_workers=self.num_upload_workers
-            ) as executor:
-                futures = {
-                    executor.submit(
-                        self.upload_object_to_cas,
-                        file,
-                        manifest.hashAlg,
-                        s3_bucket,
-                        source_root,
-                        s3_cas_prefix,
-                        s3_cache,
-                        progress_tracker,
-                    ): file
-                    for file in small_file_queue
-                }
+        # Load the cache entries for this CAS into memory up front, so that checking the cache
+        # doesn't serialize the upload threads on the cache database.
+        with S3CheckCache(
+            s3_check_cache_dir, preload_key_prefix=_join_s3_paths(s3_bucket, s3_cas_prefix)
+        ) as s3_cache:
+            # Resolve the existence of all objects that are not in the S3 check cache up front if
+            # listing the CAS prefix is cheaper than a head-object call per object. If it isn't,
+            # existing_cas_keys is None and each object is checked right before it is uploaded.
+            unchecked_s3_keys = set()
+            for file in manifest.paths:
+                s3_key = self._get_cas_key(file.hash, manifest.hashAlg, s3_cas_prefix)
+                if not s3_cache.get_entry(s3_key=f"{s3_bucket}/{s3_key}"):
+                    unchecked_s3_keys.add(s3_key)
+            existing_cas_keys = self._resolve_existing_cas_keys_by_listing(
+                s3_bucket, s3_cas_prefix, unchecked_s3_keys
+            )
+
+            # First, process the whole 'small file' queue with parallel object uploads. With adaptive
+            # concurrency, there is a worker for each connection, and the controller decides how many
+            # of them are uploading at once.
+            with adaptive_concurrency(
+                "upload",
+                self._s3,
+                initial_limit=self.num_upload_workers,
+                max_limit=self._transfer_budget.max_connections,
+                progress_tracker=progress_tracker,
+            ) as controller, concurrent.futures.ThreadPoolExecutor(
+                max_workers=controller.max_limit if controller else self.num_upload_workers
+            ) as executor, concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.num_large_file_upload_workers
+            ) as large_file_executor:
+                if self.large_file_upload_mode == LargeFileUploadMode.CONCURRENT:
+                    # Upload the 'large' files several at a time alongside the 'small' files, leaving
+                    # the transfer budget to keep the bytes and connections in flight within limits.
+                    files_to_upload_in_parallel = manifest.paths
+                    large_file_queue = []
+                else:
+                    files_to_upload_in_parallel = small_file_queue
+
+                # Files are submitted as workers free up, rather than all at once, so that the memory
+                # used doesn't grow with the number of files.
+                submissions = (
+                    (
+                        (
+                            large_file_executor
+                            if file.size > self.small_file_threshold
+                            else executor
+                        ),
+                        call_in_slot,
+                        (
+                            controller,
+                            file.size,
+                            self.upload_object_to_cas,
+                            file,
+                            manifest.hashAlg,
+                            s3_bucket,
+                            source_root,
+                            s3_cas_prefix,
+                            s3_cache,
+                            progress_tracker,
+                            existing_cas_keys,
+                        ),
+                    )
+                    for file in files_to_upload_in_parallel
+                )
                 # surfaces any exceptions in the thread
-                for future in concurrent.futures.as_completed(futures):
+                for future in as_completed_bounded(submissions):
                     (is_uploaded, file_size) = future.result()
                     if progress_tracker and not is_uploaded:
                         progress_tracker.increase_skipped(1, file_size)
@@ -353,6 +532,7 @@ class S3AssetUploader:
                     s3_cas_prefix,
                     s3_cache,
                     progress_tracker,
+                    existing_cas_keys,
                 )
                 if progress_tracker and not is_uploaded:
                     progress_tracker.increase_skipped(1, file_size)
@@ -366,6 +546,242 @@ class S3AssetUploader:
                     "File upload cancelled.", progress_tracker.get_summary_statistics()
                 )
 
+    def upload_input_files_from_queue(
+        self,
+        file_queue: queue.Queue[Optional[Tuple[Path, base_manifest.BaseManifestPath]]],
+        hash_algorithm: HashAlgorithm,
+        s3_bucket: str,
+        s3_cas_prefix: str,
+        stop_event: threading.Event,
+        progress_tracker: Optional[ProgressTracker] = None,
+        s3_check_cache_dir: Optional[str] = None,
+    ) -> None:
+        """
+        Uploads the files put on the given queue, as tuples of (source root, manifest path), to S3 as
+        they arrive if they don't exist in the given S3 prefix already, until None is put on the queue.
+        This lets files be uploaded while later files are still being hashed.
+
+        As in `upload_input_files`, small files are uploaded in parallel and large files one at a time,
+        unless the large file upload mode is CONCURRENT.
+        Since the full set of files isn't known up front, the existence of objects is checked with the
+        S3 check cache or a head-object call per object, rather than resolved in bulk by listing.
+
+        The upload stops early, without an error, once `stop_event` is set. If the upload fails, this
+        sets `stop_event` so that the producer of the queue can stop too.
+        """
+        large_file_queue: queue.Queue[Optional[Tuple[Path, base_manifest.BaseManifestPath]]] = (
+            queue.Queue()
+        )
+
+        with S3CheckCache(
+            s3_check_cache_dir, preload_key_prefix=_join_s3_paths(s3_bucket, s3_cas_prefix)
+        ) as s3_cache:
+
+            def upload_queued_files(
+                files: queue.Queue[Optional[Tuple[Path, base_manifest.BaseManifestPath]]],
+                is_small_file_queue: bool,
+            ) -> None:
+                try:
+                    while True:
+                        item = _get_from_pipeline_queue(files, stop_event)
+                        if item is None:
+                            if not stop_event.is_set():
+                                # Put the end of the queue back for the other workers to see.
+                                files.put(None)
+                            return
+                        (source_root, file) = item
+                        if is_small_file_queue and file.size > self.small_file_threshold:
+                            large_file_queue.put(item)
+                            continue
+
+                        (is_uploaded, file_size) = self.upload_object_to_cas(
+                            file,
+                            hash_algorithm,
+                            s3_bucket,
+                            source_root,
+                            s3_cas_prefix,
+                            s3_cache,
+                            progress_tracker,
+                        )
+                        if progress_tracker and not is_uploaded:
+                            progress_tracker.increase_skipped(1, file_size)
+                            if not progress_tracker.report_progress():
+                                raise AssetSyncCancelledError(
+                                    "File upload cancelled.",
+                                    progress_tracker.get_summary_statistics(),
+                                )
+                except BaseException:
+                    stop_event.set()
+                    raise
+
+            # Small files are uploaded by a pool of workers, which pass large files on to the large file
+            # workers (of which there's one, unless the large file upload mode is CONCURRENT.)
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.num_upload_workers + self.num_large_file_upload_workers
+            ) as executor:
+                large_file_futures = [
+                    executor.submit(upload_queued_files, large_file_queue, False)
+                    for _ in range(self.num_large_file_upload_workers)
+                ]
+                small_file_futures = [
+                    executor.submit(upload_queued_files, file_queue, True)
+                    for _ in range(self.num_upload_workers)
+                ]
+                try:
+                    # surfaces any exceptions in the threads
+                    for future in concurrent.futures.as_completed(small_file_futures):
+                        future.result()
+                finally:
+                    large_file_queue.put(None)
+                for future in concurrent.futures.as_completed(large_file_futures):
+                    future.result()
+
+        # to report progress 100% at the end, and
+        # to check if the job submission was canceled in the middle of processing the last batch of files.
+        if progress_tracker and not stop_event.is_set():
+            progress_tracker.report_progress()
+            if not progress_tracker.continue_reporting:
+                raise AssetSyncCancelledError(
+                    "File upload cancelled.", progress_tracker.get_summary_statistics()
+                )
+
+    def upload_output_files(
+        self,
+        output_file_batches: Iterable[Sequence[OutputFile]],
+        s3_bucket: str,
+        s3_cas_prefix: str,
+        progress_tracker: Optional[ProgressTracker] = None,
+    ) -> None:
+        """
+        Uploads the given batches of output files to their keys in S3 if they don't exist there already.
+        The batches are taken from the iterable as workers free up, so that files can be uploaded while
+        later files are still being hashed.
+
+        As in `upload_input_files`, small files are uploaded in parallel and large files one at a time
+        after them, unless the large file upload mode is CONCURRENT. The existence of the objects of each
+        batch that aren't known to be in S3 is resolved in bulk before they are uploaded (see
+        `get_existing_cas_keys`), so larger batches can be resolved by listing the CAS prefix.
+        """
+        large_file_queue: List[OutputFile] = []
+
+        with adaptive_concurrency(
+            "upload",
+            self._s3,
+            initial_limit=self.num_upload_workers,
+            max_limit=self._transfer_budget.max_connections,
+            progress_tracker=progress_tracker,
+        ) as controller, concurrent.futures.ThreadPoolExecutor(
+            max_workers=controller.max_limit if controller else self.num_upload_workers
+        ) as executor, concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.num_large_file_upload_workers
+        ) as large_file_executor:
+
+            def get_submissions() -> Iterator[
+                Tuple[
+                    concurrent.futures.Executor,
+                    Callable[..., Tuple[bool, int]],
+                    Tuple[Any, ...],
+                ]
+            ]:
+                for output_file in self._resolve_output_files_in_s3(
+                    output_file_batches, s3_bucket, s3_cas_prefix, progress_tracker
+                ):
+                    if progress_tracker and not progress_tracker.continue_reporting:
+                        # Stop taking files from the producer once the upload is cancelled.
+                        return
+                    is_large_file = output_file.file_size > self.small_file_threshold
+                    if (
+                        is_large_file
+                        and self.large_file_upload_mode != LargeFileUploadMode.CONCURRENT
+                    ):
+                        large_file_queue.append(output_file)
+                        continue
+                    yield (
+                        large_file_executor if is_large_file else executor,
+                        call_in_slot,
+                        (
+                            controller,
+                            output_file.file_size,
+                            self._upload_output_file,
+                            output_file,
+                            s3_bucket,
+                            progress_tracker,
+                        ),
+                    )
+
+            # surfaces any exceptions in the thread
+            for future in as_completed_bounded(get_submissions()):
+                (is_uploaded, file_size) = future.result()
+                if progress_tracker and not is_uploaded:
+                    progress_tracker.increase_skipped(1, file_size)
+
+        # Now process the whole 'large file' queue with serial object uploads (but still parallel multi-part upload.)
+        for output_file in large_file_queue:
+            (is_uploaded, file_size) = self._upload_output_file(
+                output_file, s3_bucket, progress_tracker
+            )
+            if progress_tracker and not is_uploaded:
+                progress_tracker.increase_skipped(1, file_size)
+
+        # to report progress 100% at the end, and
+        # to check if the job submission was canceled in the middle of processing the last batch of files.
+        if progress_tracker:
+            progress_tracker.report_progress()
+            if not progress_tracker.continue_reporting:
+                raise AssetSyncCancelledError(
+                    "File upload cancelled.", progress_tracker.get_summary_statistics()
+                )
+
+    def _resolve_output_files_in_s3(
+        self,
+        output_file_batches: Iterable[Sequence[OutputFile]],
+        s3_bucket: str,
+        s3_cas_prefix: str,
+        progress_tracker: Optional[ProgressTracker] = None,
+    ) -> Iterator[OutputFile]:
+        """
+        Yields the output files of the given batches, with whether each exists in S3 resolved in bulk
+        for each batch. Stops taking batches once the upload is cancelled.
+        """
+        for output_file_batch in output_file_batches:
+            if progress_tracker and not progress_tracker.continue_reporting:
+                return
+            unchecked_s3_keys = [
+                output_file.s3_key for output_file in output_file_batch if not output_file.in_s3
+            ]
+            if unchecked_s3_keys:
+                existing_cas_keys = self.get_existing_cas_keys(
+                    s3_bucket, s3_cas_prefix, unchecked_s3_keys
+                )
+                for output_file in output_file_batch:
+                    output_file.in_s3 = output_file.in_s3 or output_file.s3_key in existing_cas_keys
+            yield from output_file_batch
+
+    def _upload_output_file(
+        self,
+        output_file: OutputFile,
+        s3_bucket: str,
+        progress_tracker: Optional[ProgressTracker] = None,
+    ) -> Tuple[bool, int]:
+        """
+        Uploads an output file to its key in S3, unless it exists there already.
+        Returns a tuple (whether it has been uploaded, the file size).
+        """
+        if output_file.in_s3:
+            logger.debug(
+                f"skipping {output_file.full_path} because it has already been uploaded to s3://{s3_bucket}/{output_file.s3_key}"
+            )
+            return (False, output_file.file_size)
+
+        self.upload_file_to_s3(
+            local_path=Path(output_file.full_path),
+            s3_bucket=s3_bucket,
+            s3_upload_key=output_file.s3_key,
+            progress_tracker=progress_tracker,
+            base_dir_path=Path(output_file.base_dir) if output_file.base_dir else None,
+        )
+        return (True, output_file.file_size)
+
     def _separate_files_by_size(
         self,
         files_to_upload: list[base_manifest.BaseManifestPath],
@@ -386,6 +802,14 @@ class S3AssetUploader:
     def _get_current_timestamp(self) -> str:
         return str(datetime.now().timestamp())
 
+    def _get_cas_key(
+        self, file_hash: str, hash_algorithm: HashAlgorithm, s3_cas_prefix: str
+    ) -> str:
+        s3_key = f"{file_hash}.{hash_algorithm.value}"
+        if s3_cas_prefix:
+            s3_key = _join_s3_paths(s3_cas_prefix, s3_key)
+        return s3_key
+
     def upload_object_to_cas(
         self,
         file: base_manifest.BaseManifestPath,
@@ -395,16 +819,17 @@ class S3AssetUploader:
         s3_cas_prefix: str,
         s3_check_cache: S3CheckCache,
         progress_tracker: Optional[ProgressTracker] = None,
+        existing_cas_keys: Optional[Set[str]] = None,
     ) -> Tuple[bool, int]:
         """
         Uploads an object to the S3 content-addressable storage (CAS) prefix. Optionally,
         does a head-object check and only uploads the file if it doesn't exist in S3 already.
+        If `existing_cas_keys` is given, the existence of the object has already been resolved
+        in bulk and it is looked up in that set instead of doing a head-object call.
         Returns a tuple (whether it has been uploaded, the file size).
         """
         local_path = source_root.joinpath(file.path)
-        s3_upload_key = f"{file.hash}.{hash_algorithm.value}"
-        if s3_cas_prefix:
-            s3_upload_key = _join_s3_paths(s3_cas_prefix, s3_upload_key)
+        s3_upload_key = self._get_cas_key(file.hash, hash_algorithm, s3_cas_prefix)
         is_uploaded = False
         file_size = local_path.resolve().stat().st_size
 
@@ -414,7 +839,12 @@ class S3AssetUploader:
             )
             return (is_uploaded, file_size)
 
-        if self.file_already_uploaded(s3_bucket, s3_upload_key):
+        if existing_cas_keys is not None:
+            already_uploaded = s3_upload_key in existing_cas_keys
+        else:
+            already_uploaded = self.file_already_uploaded(s3_bucket, s3_upload_key)
+
+        if already_uploaded:
             logger.debug(
                 f"skipping {local_path} because it has already been uploaded to s3://{s3_bucket}/{s3_upload_key}"
             )
@@ -450,7 +880,10 @@ class S3AssetUploader:
         which also checks if the upload should continue or not. If the `progress_tracker`
         signals to stop, the ongoing upload is cancelled.
         """
-        transfer_manager = get_s3_transfer_manager(s3_client=self._s3)
+        # The transfer manager makes as many requests at once as the budget has connections.
+        transfer_manager = get_s3_transfer_manager(
+            s3_client=self._s3, max_concurrency=self._transfer_budget.max_connections
+        )
 
         future: concurrent.futures.Future
 
@@ -481,15 +914,19 @@ class S3AssetUploader:
             if file_obj is None:
                 return
 
-            future = transfer_manager.upload(
-                fileobj=file_obj,
-                bucket=s3_bucket,
-                key=s3_upload_key,
-                subscribers=subscribers,
-            )
-
+            file_size = os.fstat(file_obj.fileno()).st_size
             try:
-                future.result()
+                with self._transfer_budget.reserve(
+                    self._get_upload_bytes_in_flight(file_size),
+                    self._get_upload_connections(file_size),
+                ):
+                    future = transfer_manager.upload(
+                        fileobj=file_obj,
+                        bucket=s3_bucket,
+                        key=s3_upload_key,
+                        subscribers=subscribers,
+                    )
+                    future.result()
                 is_uploaded = True
                 if progress_tracker and is_uploaded:
                     progress_tracker.increase_processed(1, 0)
@@ -533,6 +970,28 @@ class S3AssetUploader:
             except Exception as e:
                 raise AssetSyncError(e) from e
 
+    def _get_upload_bytes_in_flight(self, file_size: int) -> int:
+        """
+        Returns the number of bytes that uploading a file of the given size holds in memory at most:
+        the whole file, or for a multipart upload, as many parts as the transfer manager holds in
+        memory at once, which is its maximum concurrency.
+        """
+        return min(
+            file_size, S3_MULTIPART_UPLOAD_CHUNK_SIZE * self._transfer_budget.max_connections
+        )
+
+    def _get_upload_connections(self, file_size: int) -> int:
+        """
+        Returns the number of connections that uploading a file of the given size uses at most: one,
+        or one per part of a multipart upload, up to the transfer manager's maximum concurrency, which
+        is the budget's number of connections.
+        """
+        if file_size < S3_MULTIPART_UPLOAD_CHUNK_SIZE:
+            return 1
+        return min(
+            -(-file_size // S3_MULTIPART_UPLOAD_CHUNK_SIZE), self._transfer_budget.max_connections
+        )
+
     @contextmanager
     def _open_non_symlink_file_binary(
         self, path: str
@@ -691,6 +1150,173 @@ class S3AssetUploader:
         except Exception as e:
             raise AssetSyncError(e) from e
 
+    def get_existing_cas_keys(
+        self,
+        s3_bucket: str,
+        s3_cas_prefix: str,
+        s3_keys: Iterable[str],
+    ) -> Set[str]:
+        """
+        Returns the subset of the given CAS object keys that already exist in S3. Depending on the
+        number of keys and the estimated size of the CAS, this either lists the CAS prefix, or does
+        a head-object call for each key in parallel.
+        """
+        keys_to_check = set(s3_keys)
+        existing_cas_keys = self._resolve_existing_cas_keys_by_listing(
+            s3_bucket, s3_cas_prefix, keys_to_check
+        )
+        if existing_cas_keys is not None:
+            return existing_cas_keys
+
+        def check_key(s3_key: str) -> Tuple[str, bool]:
+            return (s3_key, self.file_already_uploaded(s3_bucket, s3_key))
+
+        existing_cas_keys = set()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.num_upload_workers) as executor:
+            # surfaces any exceptions in the thread
+            for future in as_completed_bounded(
+                (executor, check_key, (s3_key,)) for s3_key in keys_to_check
+            ):
+                (s3_key, exists) = future.result()
+                if exists:
+                    existing_cas_keys.add(s3_key)
+        return existing_cas_keys
+
+    def _resolve_existing_cas_keys_by_listing(
+        self,
+        s3_bucket: str,
+        s3_cas_prefix: str,
+        s3_keys: Set[str],
+    ) -> Optional[Set[str]]:
+        """
+        Resolves which of the given CAS object keys exist in S3 by listing the CAS prefix, if doing so
+        is estimated to take fewer requests than a head-object call per key. Returns None if listing
+        isn't worthwhile, in which case the keys should be checked individually.
+        """
+        if len(s3_keys) < S3_CAS_LISTING_MIN_OBJECTS:
+            return None
+
+        shard_prefixes = self._get_cas_shard_prefixes(s3_cas_prefix, s3_keys)
+        try:
+            estimated_object_count = self._estimate_cas_object_count(s3_bucket, s3_cas_prefix)
+            estimated_list_requests = len(shard_prefixes) + (
+                estimated_object_count // S3_LIST_OBJECTS_PAGE_SIZE
+            )
+            if estimated_list_requests >= len(s3_keys):
+                logger.debug(
+                    f"Checking {len(s3_keys)} objects individually, as listing the estimated {estimated_object_count}"
+                    f" objects in s3://{s3_bucket}/{s3_cas_prefix} would take {estimated_list_requests} requests."
+                )
+                return None
+
+            logger.debug(
+                f"Listing the estimated {estimated_object_count} objects in s3://{s3_bucket}/{s3_cas_prefix}"
+                f" across {len(shard_prefixes)} shards to check for the existence of {len(s3_keys)} objects."
+            )
+            existing_cas_keys: Set[str] = set()
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=min(len(shard_prefixes), self.num_upload_workers)
+            ) as executor:
+                futures = [
+                    executor.submit(self._list_object_keys, s3_bucket, shard_prefix, s3_keys)
+                    for shard_prefix in shard_prefixes
+                ]
+                # surfaces any exceptions in the thread
+                for future in concurrent.futures.as_completed(futures):
+                    existing_cas_keys.update(future.result())
+        except JobAttachmentsS3ClientError as exc:
+            if exc.status_code != 403:
+                raise
+            # Listing needs the 's3:ListBucket' permission, which a head-object call per key doesn't.
+            logger.warning(
+                f"Checking {len(s3_keys)} objects individually, as listing s3://{s3_bucket}/{s3_cas_prefix}"
+                " was denied. Grant the 's3:ListBucket' permission for the bucket to check them in bulk."
+            )
+            return None
+        return existing_cas_keys
+
+    def _get_cas_shard_prefixes(self, s3_cas_prefix: str, s3_keys: Set[str]) -> list[str]:
+        """
+        Returns the key prefixes to list in parallel, one for each distinct first character of the
+        hashes among the given CAS object keys. For hex-encoded hashes, this is at most 16 prefixes.
+        """
+        hash_start = len(s3_cas_prefix) + 1 if s3_cas_prefix else 0
+        first_characters = {s3_key[hash_start : hash_start + 1] for s3_key in s3_keys}
+        return sorted(
+            _join_s3_paths(s3_cas_prefix, character) if s3_cas_prefix else character
+            for character in first_characters
+        )
+
+    def _estimate_cas_object_count(self, s3_bucket: str, s3_cas_prefix: str) -> int:
+        """
+        Estimates the number of objects under the CAS prefix by counting the objects under a single
+        sample key prefix with one list-objects-v2 request. Since the keys start with hex-encoded
+        hashes, which are uniformly distributed, this is scaled up by the number of possible samples.
+        The estimate saturates when the sample fills a whole page, which is enough to rule out listing.
+        """
+        sample_prefix = (
+            _join_s3_paths(s3_cas_prefix, S3_CAS_SIZE_SAMPLE_PREFIX)
+            if s3_cas_prefix
+            else S3_CAS_SIZE_SAMPLE_PREFIX
+        )
+        sample_count = len(
+            self._list_object_keys(s3_bucket, sample_prefix, max_keys=S3_LIST_OBJECTS_PAGE_SIZE)
+        )
+        return sample_count * 16 ** len(S3_CAS_SIZE_SAMPLE_PREFIX)
+
+    def _list_object_keys(
+        self,
+        s3_bucket: str,
+        prefix: str,
+        keys_to_find: Optional[Set[str]] = None,
+        max_keys: Optional[int] = None,
+    ) -> Set[str]:
+        """
+        Lists the object keys under the given prefix. If `keys_to_find` is given, only the listed keys
+        that are in that set are returned, so that listing a large CAS doesn't hold all of its keys in memory.
+        """
+        found_keys: Set[str] = set()
+        try:
+            paginator = self._s3.get_paginator("list_objects_v2")
+            pagination_config = {"PageSize": S3_LIST_OBJECTS_PAGE_SIZE}
+            if max_keys is not None:
+                pagination_config["MaxItems"] = max_keys
+            page_iterator = paginator.paginate(
+                Bucket=s3_bucket,
+                Prefix=prefix,
+                PaginationConfig=pagination_config,
+            )
+            for page in page_iterator:
+                for content in page.get("Contents", []):
+                    if keys_to_find is None or content["Key"] in keys_to_find:
+                        found_keys.add(content["Key"])
+        except ClientError as exc:
+            status_code = int(exc.response["ResponseMetadata"]["HTTPStatusCode"])
+            status_code_guidance = {
+                **COMMON_ERROR_GUIDANCE_FOR_S3,
+                403: (
+                    f"Access denied. Ensure that the bucket is in the account {get_account_id(session=self._session)}, "
+                    "and your AWS IAM Role or User has the 's3:ListBucket' permission for this bucket."
+                ),
+                404: "Not found. Please check your bucket name, and ensure that it exists in the AWS account.",
+            }
+            raise JobAttachmentsS3ClientError(
+                action="listing bucket contents",
+                status_code=status_code,
+                bucket_name=s3_bucket,
+                key_or_prefix=prefix,
+                message=f"{status_code_guidance.get(status_code, '')} {str(exc)}",
+            ) from exc
+        except BotoCoreError as bce:
+            raise JobAttachmentS3BotoCoreError(
+                action="listing bucket contents",
+                error_details=str(bce),
+            ) from bce
+        except Exception as e:
+            raise AssetSyncError(e) from e
+
+        return found_keys
+
     def upload_bytes_to_s3(
         self,
         bytes: BytesIO,
@@ -789,7 +1415,21 @@ class S3AssetManager:
         hash_cache: HashCache,
         progress_tracker: Optional[ProgressTracker] = None,
         update: bool = True,
+        cached_entries: Optional[Dict[str, HashCacheEntry]] = None,
+        entries_to_update: Optional[List[HashCacheEntry]] = None,
+        process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None,
+        file_record: Optional[FileRecord] = None,
     ) -> Tuple[FileStatus, int, base_manifest.BaseManifestPath]:
+        """
+        Hashes the given file if it isn't in the hash cache or was modified since it was cached, and returns
+        a tuple of (the file status, the file size, the manifest path for the file.)
+
+        If `cached_entries` is given, it's used to look up the file before querying the hash cache (see
+        `HashCache.get_entries`.) If `entries_to_update` is given, new or updated entries are appended to
+        it for the caller to write in batches, rather than written to the hash cache one by one. If
+        `process_pool` is given, large files are hashed in it (see `_hashing.hash_file_in_pool`.) If
+        `file_record` is given, the file's metadata is taken from it rather than queried again.
+        """
         # If it's cancelled, raise an AssetSyncCancelledError exception
         if progress_tracker and not progress_tracker.continue_reporting:
             raise AssetSyncCancelledError(
@@ -801,31 +1441,53 @@ class S3AssetManager:
         )
         hash_alg: HashAlgorithm = manifest_model.AssetManifest.get_default_hash_alg()
 
-        full_path = str(path.resolve())
         file_status: FileStatus = FileStatus.UNCHANGED
-        actual_modified_time = str(datetime.fromtimestamp(path.stat().st_mtime))
-
-        entry: Optional[HashCacheEntry] = hash_cache.get_entry(full_path, hash_alg)
+        if file_record is not None:
+            full_path = file_record.resolved_path
+            file_size = file_record.size
+            mtime_ns = file_record.mtime_ns
+            # Computed as os.stat_result.st_mtime is, so that the time matches the cached one exactly.
+            (mtime_seconds, mtime_nanoseconds) = divmod(mtime_ns, 1_000_000_000)
+            mtime = mtime_seconds + mtime_nanoseconds * 1e-9
+        else:
+            full_path = str(path.resolve())
+            stat_result = os.stat(full_path)
+            file_size = stat_result.st_size
+            mtime_ns = stat_result.st_mtime_ns
+            mtime = stat_result.st_mtime
+        actual_modified_time = str(datetime.fromtimestamp(mtime))
+
+        entry: Optional[HashCacheEntry] = None
+        if cached_entries is not None:
+            entry = cached_entries.get(full_path)
+        if entry is None:
+            entry = hash_cache.get_entry(full_path, hash_alg)
         if entry is not None:
             # If the file was modified, we need to rehash it
             if actual_modified_time != entry.last_modified_time:
                 entry.last_modified_time = actual_modified_time
-                entry.file_hash = hash_file(full_path, hash_alg)
+                entry.file_hash = hash_file_in_pool(
+                    hash_file, full_path, hash_alg, file_size, process_pool
+                )
                 entry.hash_algorithm = hash_alg
                 file_status = FileStatus.MODIFIED
         else:
             entry = HashCacheEntry(
                 file_path=full_path,
                 hash_algorithm=hash_alg,
-                file_hash=hash_file(full_path, hash_alg),
+                file_hash=hash_file_in_pool(
+                    hash_file, full_path, hash_alg, file_size, process_pool
+                ),
                 last_modified_time=actual_modified_time,
             )
             file_status = FileStatus.NEW
 
         if file_status != FileStatus.UNCHANGED and update:
-            hash_cache.put_entry(entry)
+            if entries_to_update is not None:
+                entries_to_update.append(entry)
+            else:
+                hash_cache.put_entry(entry)
 
-        file_size = path.resolve().stat().st_size
         path_args: dict[str, Any] = {
             "path": path.relative_to(root_path).as_posix(),
             "hash": entry.file_hash,
@@ -833,7 +1495,7 @@ class S3AssetManager:
 
         # stat().st_mtime_ns returns an int that represents the time in nanoseconds since the epoch.
         # The asset manifest spec requires the mtime to be represented as an integer in microseconds.
-        path_args["mtime"] = trunc(path.stat().st_mtime_ns // 1000)
+        path_args["mtime"] = trunc(mtime_ns // 1000)
         path_args["size"] = file_size
 
         return (file_status, file_size, manifest_model.Path(**path_args))
@@ -844,7 +1506,15 @@ class S3AssetManager:
         root_path: str,
         hash_cache: HashCache,
         progress_tracker: Optional[ProgressTracker] = None,
+        on_path_hashed: Optional[Callable[[base_manifest.BaseManifestPath], None]] = None,
+        file_records: Optional[Dict[str, FileRecord]] = None,
     ) -> BaseAssetManifest:
+        """
+        Creates the manifest of the given input files under the given root path, hashing the files
+        that aren't in the hash cache or were modified since they were cached. If `on_path_hashed` is
+        given, it's called with the manifest path of each file as soon as the file is processed. If
+        `file_records` is given, the metadata of the files in it is taken from their records.
+        """
         manifest_model: Type[BaseManifestModel] = ManifestModelRegistry.get_manifest_model(
             version=self.manifest_version
         )
@@ -853,22 +1523,50 @@ class S3AssetManager:
         }:
             paths: list[base_manifest.BaseManifestPath] = []
 
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                futures = {
-                    executor.submit(
-                        self._process_input_path, path, root_path, hash_cache, progress_tracker
-                    ): path
-                    for path in input_paths
-                }
-                for future in concurrent.futures.as_completed(futures):
-                    (file_status, file_size, path_to_put_in_manifest) = future.result()
-                    paths.append(path_to_put_in_manifest)
-                    if progress_tracker:
-                        if file_status == FileStatus.NEW or file_status == FileStatus.MODIFIED:
-                            progress_tracker.increase_processed(1, file_size)
-                        else:
-                            progress_tracker.increase_skipped(1, file_size)
-                        progress_tracker.report_progress()
+            # Load the hash cache entries for the whole asset root with a single query, and write
+            # the entries of new or modified files in batches.
+            cached_entries = hash_cache.get_entries(
+                os.path.join(str(Path(root_path).resolve()), ""),
+                manifest_model.AssetManifest.get_default_hash_alg(),
+            )
+            entries_to_update: List[HashCacheEntry] = []
+
+            try:
+                with hashing_process_pool() as process_pool, concurrent.futures.ThreadPoolExecutor() as executor:
+                    submissions = (
+                        (
+                            executor,
+                            self._process_input_path,
+                            (
+                                path,
+                                root_path,
+                                hash_cache,
+                                progress_tracker,
+                                True,
+                                cached_entries,
+                                entries_to_update,
+                                process_pool,
+                                file_records.get(str(path)) if file_records else None,
+                            ),
+                        )
+                        for path in input_paths
+                    )
+                    for future in as_completed_bounded(submissions):
+                        (file_status, file_size, path_to_put_in_manifest) = future.result()
+                        paths.append(path_to_put_in_manifest)
+                        if on_path_hashed:
+                            on_path_hashed(path_to_put_in_manifest)
+                        if progress_tracker:
+                            if file_status == FileStatus.NEW or file_status == FileStatus.MODIFIED:
+                                progress_tracker.increase_processed(1, file_size)
+                            else:
+                                progress_tracker.increase_skipped(1, file_size)
+                            progress_tracker.report_progress()
+                        if len(entries_to_update) >= hash_cache.WRITE_BATCH_SIZE:
+                            hash_cache.flush_entries(entries_to_update)
+            finally:
+                # Write what was hashed even if hashing was cancelled or failed part way.
+                hash_cache.flush_entries(entries_to_update)
 
             # Need to sort the list to keep it canonical
             paths.sort(key=lambda x: x.path, reverse=True)
@@ -894,10 +1592,13 @@ class S3AssetManager:
         local_type_locations: dict[str, str] = {},
         shared_type_locations: dict[str, str] = {},
         require_paths_exist: bool = False,
+        file_records: Optional[Dict[str, FileRecord]] = None,
     ) -> list[AssetRootGroup]:
         """
         For the given input paths and output paths, a list of groups is returned, where paths sharing
         the same root path are grouped together. Note that paths can be files or directories.
+        Input paths that have a record in `file_records` are known to be existing files, so they
+        aren't checked again, and their records are kept with their group.
 
         The returned list satisfies the following conditions:
         - If a path is relative to any of the paths in the given `shared_type_locations` paths, it is
@@ -916,7 +1617,8 @@ class S3AssetManager:
         for _path in input_paths:
             # Need to use absolute to not resolve symlinks, but need normpath to get rid of relative paths, i.e. '..'
             abs_path = Path(os.path.normpath(Path(_path).absolute()))
-            if not abs_path.exists():
+            file_record = file_records.get(_path) if file_records else None
+            if file_record is None and not abs_path.exists():
                 if require_paths_exist:
                     missing_input_paths.add(abs_path)
                 else:
@@ -925,7 +1627,7 @@ class S3AssetManager:
                     )
                     referenced_paths.add(_path)
                 continue
-            if abs_path.is_dir():
+            if file_record is None and abs_path.is_dir():
                 misconfigured_directories.add(abs_path)
                 continue
 
@@ -943,6 +1645,8 @@ class S3AssetManager:
             )
             matched_group = self._get_matched_group(matched_root, groupings)
             matched_group.inputs.add(abs_path)
+            if file_record is not None:
+                matched_group.input_file_records[str(abs_path)] = file_record
 
         if missing_input_paths or misconfigured_directories:
             all_misconfigured_inputs = ""
@@ -1006,7 +1710,7 @@ class S3AssetManager:
                     list(asset_group.inputs | asset_group.outputs | asset_group.references)
                 )
             )
-            if common_path.is_file():
+            if str(common_path) in asset_group.input_file_records or common_path.is_file():
                 common_path = common_path.parent
             asset_group.root_path = str(common_path)
 
@@ -1096,7 +1800,14 @@ class S3AssetManager:
         total_bytes = 0
         for group in groups:
             input_paths = [str(input) for input in group.inputs]
-            total_bytes += self._get_total_size_of_files(input_paths)
+            total_bytes += sum(
+                group.input_file_records[path].size
+                for path in input_paths
+                if path in group.input_file_records
+            )
+            total_bytes += self._get_total_size_of_files(
+                [path for path in input_paths if path not in group.input_file_records]
+            )
             total_files += len(input_paths)
         return (total_files, total_bytes)
 
@@ -1125,6 +1836,7 @@ class S3AssetManager:
         referenced_paths: list[str],
         storage_profile: Optional[StorageProfile] = None,
         require_paths_exist: bool = False,
+        file_records: Optional[Dict[str, FileRecord]] = None,
     ) -> list[AssetRootGroup]:
         """
         Resolves all of the paths that will be uploaded, sorting by storage profile location.
@@ -1145,6 +1857,7 @@ class S3AssetManager:
             local_type_locations,
             shared_type_locations,
             require_paths_exist,
+            file_records,
         )
 
         return asset_groups
@@ -1156,11 +1869,16 @@ class S3AssetManager:
         referenced_paths: list[str],
         storage_profile: Optional[StorageProfile] = None,
         require_paths_exist: bool = False,
+        file_records: Optional[Dict[str, FileRecord]] = None,
     ) -> AssetUploadGroup:
         """
         Processes all of the paths required for upload, grouping them by asset root and local storage profile locations.
         Returns an object containing the grouped paths, which also includes a dictionary of input directories and file counts
         for files that were not under the root path or any local storage profile locations.
+
+        If `file_records` is given, it maps input paths to the records of the files gathered when they
+        were discovered (see `_discovery.scan_directories`), which are used instead of querying the
+        file system for those files again while grouping, totalling and hashing them.
         """
         asset_groups = self._group_asset_paths(
             input_paths,
@@ -1168,6 +1886,7 @@ class S3AssetManager:
             referenced_paths,
             storage_profile,
             require_paths_exist,
+            file_records,
         )
         (input_file_count, input_bytes) = self._get_total_input_size_from_asset_group(asset_groups)
         return AssetUploadGroup(
@@ -1216,7 +1935,11 @@ class S3AssetManager:
                 # Create manifest, using local hash cache
                 with HashCache(hash_cache_dir) as hash_cache:
                     asset_manifest = self._create_manifest_file(
-                        sorted(list(group.inputs)), group.root_path, hash_cache, progress_tracker
+                        sorted(list(group.inputs)),
+                        group.root_path,
+                        hash_cache,
+                        progress_tracker,
+                        file_records=group.input_file_records,
                     )
 
             asset_root_manifests.append(
@@ -1270,17 +1993,7 @@ class S3AssetManager:
         manifest_properties_list: list[ManifestProperties] = []
 
         for asset_root_manifest in manifests:
-            output_rel_paths: list[str] = [
-                str(path.relative_to(asset_root_manifest.root_path))
-                for path in asset_root_manifest.outputs
-            ]
-
-            manifest_properties = ManifestProperties(
-                fileSystemLocationName=asset_root_manifest.file_system_location_name,
-                rootPath=asset_root_manifest.root_path,
-                rootPathFormat=PathFormat.get_host_path_format(),
-                outputRelativeDirectories=output_rel_paths,
-            )
+            manifest_properties = self._get_manifest_properties(asset_root_manifest)
 
             if asset_root_manifest.asset_manifest:
                 (partial_manifest_key, asset_manifest_hash) = self.asset_uploader.upload_assets(
@@ -1319,3 +2032,167 @@ class S3AssetManager:
             progress_tracker.get_summary_statistics(),
             Attachments(manifests=manifest_properties_list),
         )
+
+    def hash_and_upload_assets(
+        self,
+        asset_groups: list[AssetRootGroup],
+        total_input_files: int,
+        total_input_bytes: int,
+        hash_cache_dir: Optional[str] = None,
+        s3_check_cache_dir: Optional[str] = None,
+        on_preparing_to_submit: Optional[Callable[[Any], bool]] = None,
+        on_uploading_assets: Optional[Callable[[Any], bool]] = None,
+        manifest_write_dir: Optional[str] = None,
+    ) -> tuple[SummaryStatistics, SummaryStatistics, list[AssetRootManifest], Attachments]:
+        """
+        Hashes the input files and uploads them to S3 in a pipeline, rather than hashing all of the
+        files before uploading any of them as `hash_assets_and_create_manifest` followed by
+        `upload_assets` does. Each file is queued for upload as soon as it's hashed, so the total time
+        approaches the longer of the hashing and upload times rather than their sum. The manifests are
+        uploaded once all of the files are.
+
+        Args:
+            asset_groups: the groups of asset paths, by asset root (see `prepare_paths_for_upload`.)
+            total_input_files: the number of input files, for reporting progress.
+            total_input_bytes: the size of the input files, for reporting progress.
+            hash_cache_dir: a path to local hash cache directory. If it's None, use default path.
+            s3_check_cache_dir: a path to local S3 check cache directory. If it's None, use default path.
+            on_preparing_to_submit: a callback to be called to periodically report hashing progress to the caller.
+            on_uploading_assets: a callback to be called to periodically report upload progress to the caller.
+            Each callback returns True if the operation should continue as normal, or False to cancel.
+            manifest_write_dir: an optional directory to write the manifests to locally as well.
+
+        Returns:
+            a tuple with (1) the summary statistics of the hash operation, (2) the summary statistics
+            of the upload operation, (3) a list of AssetRootManifest (a manifest and output paths for
+            each asset root), and (4) the attachments, with the S3 paths to the asset manifest files.
+        """
+        # This is a programming error if the user did not construct the object with Farm and Queue IDs.
+        if not self.farm_id or not self.queue_id:
+            logger.error("hash_and_upload_assets: Farm or Fleet ID is missing.")
+            raise JobAttachmentsError("hash_and_upload_assets: Farm or Fleet ID is missing.")
+        job_attachment_settings: JobAttachmentS3Settings = self.job_attachment_settings  # type: ignore[assignment]
+
+        # Sets up progress trackers to report hashing and upload progress separately back to the caller.
+        hashing_progress_tracker = ProgressTracker(
+            status=ProgressStatus.PREPARING_IN_PROGRESS,
+            total_files=total_input_files,
+            total_bytes=total_input_bytes,
+            on_progress_callback=on_preparing_to_submit,
+        )
+        upload_progress_tracker = ProgressTracker(
+            status=ProgressStatus.UPLOAD_IN_PROGRESS,
+            total_files=total_input_files,
+            total_bytes=total_input_bytes,
+            on_progress_callback=on_uploading_assets,
+        )
+
+        start_time = time.perf_counter()
+
+        file_queue: queue.Queue[Optional[Tuple[Path, base_manifest.BaseManifestPath]]] = (
+            queue.Queue(maxsize=UPLOAD_PIPELINE_QUEUE_SIZE)
+        )
+        # Set when either side of the pipeline stops early, so that the other side stops too.
+        stop_event = threading.Event()
+        asset_root_manifests: list[AssetRootManifest] = []
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as upload_executor:
+            upload_future = upload_executor.submit(
+                self.asset_uploader.upload_input_files_from_queue,
+                file_queue,
+                ManifestModelRegistry.get_manifest_model(
+                    version=self.manifest_version
+                ).AssetManifest.get_default_hash_alg(),
+                job_attachment_settings.s3BucketName,
+                job_attachment_settings.full_cas_prefix(),
+                stop_event,
+                upload_progress_tracker,
+                s3_check_cache_dir,
+            )
+
+            def queue_for_upload(source_root: Path, path: base_manifest.BaseManifestPath) -> None:
+                if not _put_on_pipeline_queue(file_queue, (source_root, path), stop_event):
+                    # The upload stopped early, so raise its error.
+                    upload_future.result()
+                    raise AssetSyncError("The upload of job attachments stopped unexpectedly.")
+
+            try:
+                for group in asset_groups:
+                    # Might have output directories, but no inputs for this group
+                    asset_manifest: Optional[BaseAssetManifest] = None
+                    if group.inputs:
+                        # Create manifest, using local hash cache
+                        source_root = Path(group.root_path)
+                        with HashCache(hash_cache_dir) as hash_cache:
+                            asset_manifest = self._create_manifest_file(
+                                sorted(list(group.inputs)),
+                                group.root_path,
+                                hash_cache,
+                                hashing_progress_tracker,
+                                lambda path: queue_for_upload(source_root, path),
+                                group.input_file_records,
+                            )
+
+                    asset_root_manifests.append(
+                        AssetRootManifest(
+                            file_system_location_name=group.file_system_location_name,
+                            root_path=group.root_path,
+                            asset_manifest=asset_manifest,
+                            outputs=sorted(list(group.outputs)),
+                        )
+                    )
+            except BaseException:
+                stop_event.set()
+                raise
+            hashing_progress_tracker.total_time = time.perf_counter() - start_time
+
+            if not _put_on_pipeline_queue(file_queue, None, stop_event):
+                upload_future.result()
+            upload_future.result()
+
+        manifest_properties_list: list[ManifestProperties] = []
+        for asset_root_manifest in asset_root_manifests:
+            manifest_properties = self._get_manifest_properties(asset_root_manifest)
+
+            if asset_root_manifest.asset_manifest:
+                (partial_manifest_key, asset_manifest_hash) = self.asset_uploader.upload_manifest(
+                    job_attachment_settings=job_attachment_settings,
+                    manifest=asset_root_manifest.asset_manifest,
+                    source_root=Path(asset_root_manifest.root_path),
+                    partial_manifest_prefix=job_attachment_settings.partial_manifest_prefix(
+                        self.farm_id, self.queue_id
+                    ),
+                    file_system_location_name=asset_root_manifest.file_system_location_name,
+                    manifest_write_dir=manifest_write_dir,
+                )
+                manifest_properties.inputManifestPath = partial_manifest_key
+                manifest_properties.inputManifestHash = asset_manifest_hash
+
+            manifest_properties_list.append(manifest_properties)
+
+        upload_progress_tracker.total_time = time.perf_counter() - start_time
+
+        return (
+            hashing_progress_tracker.get_summary_statistics(),
+            upload_progress_tracker.get_summary_statistics(),
+            asset_root_manifests,
+            Attachments(manifests=manifest_properties_list),
+        )
+
+    def _get_manifest_properties(
+        self, asset_root_manifest: AssetRootManifest
+    ) -> ManifestProperties:
+        """
+        Returns the manifest properties of the given asset root, without the manifest path and hash.
+        """
+        output_rel_paths: list[str] = [
+            str(path.relative_to(asset_root_manifest.root_path))
+            for path in asset_root_manifest.outputs
+        ]
+
+        return ManifestProperties(
+            fileSystemLocationName=asset_root_manifest.file_system_location_name,
+            rootPath=asset_root_manifest.root_path,
+            rootPathFormat=PathFormat.get_host_path_format(),
+            outputRelativeDirectories=output_rel_paths,
+        )
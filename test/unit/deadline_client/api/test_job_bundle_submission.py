@@ -564,7 +564,14 @@ def test_create_job_from_job_bundle_job_attachments(
             referenced_paths=[],
             storage_profile=MOCK_STORAGE_PROFILE,
             require_paths_exist=False,
+            file_records=ANY,
         )
+        # The files found in the input directory are passed on with their records
+        file_records = mock_prepare_paths.call_args.kwargs["file_records"]
+        asset_2_path = os.path.join(temp_assets_dir, os.path.normpath("somedir/asset-2.txt"))
+        asset_3_path = os.path.join(temp_assets_dir, os.path.normpath("somedir/asset-3.bat"))
+        assert sorted(file_records.keys()) == sorted([asset_2_path, asset_3_path])
+        assert file_records[asset_2_path].size == len("Asset 2")
         mock_hash_attachments.assert_called_once_with(
             asset_manager=ANY,
             asset_groups=[AssetRootGroup()],
@@ -588,6 +595,102 @@ def test_create_job_from_job_bundle_job_attachments(
         assert mock_telemetry.call_count == 3
 
 
+def test_create_job_from_job_bundle_job_attachments_overlap_hashing_and_upload(
+    fresh_deadline_config, temp_job_bundle_dir, temp_assets_dir
+):
+    """
+    Test that a job bundle with asset references is hashed and uploaded in a single pipeline
+    when the 'settings.overlap_hashing_and_upload' setting is on.
+    """
+    with patch.object(_submit_job_bundle.api, "get_boto3_session"), patch.object(
+        _submit_job_bundle.api, "get_boto3_client"
+    ) as client_mock, patch.object(
+        _submit_job_bundle.api, "get_queue_user_boto3_session"
+    ), patch.object(
+        _submit_job_bundle, "_hash_attachments"
+    ) as mock_hash_attachments, patch.object(
+        S3AssetManager,
+        "prepare_paths_for_upload",
+    ) as mock_prepare_paths, patch.object(
+        S3AssetManager, "upload_assets"
+    ) as mock_upload_assets, patch.object(
+        S3AssetManager, "hash_and_upload_assets"
+    ) as mock_hash_and_upload_assets, patch.object(
+        _submit_job_bundle.api, "get_deadline_cloud_library_telemetry_client"
+    ), patch.object(
+        api._telemetry, "get_deadline_endpoint_url", side_effect=["https://fake-endpoint-url"]
+    ):
+        client_mock().get_queue.side_effect = [MOCK_GET_QUEUE_RESPONSE]
+        client_mock().create_job.side_effect = [MOCK_CREATE_JOB_RESPONSE]
+        client_mock().get_job.side_effect = [MOCK_GET_JOB_RESPONSE]
+        mock_prepare_paths.return_value = AssetUploadGroup(
+            total_input_files=1, total_input_bytes=15, asset_groups=[AssetRootGroup()]
+        )
+        mock_hash_and_upload_assets.return_value = (
+            SummaryStatistics(),
+            SummaryStatistics(),
+            [],
+            Attachments([]),
+        )
+
+        config.set_setting("defaults.farm_id", MOCK_FARM_ID)
+        config.set_setting("defaults.queue_id", MOCK_QUEUE_ID)
+        config.set_setting("settings.overlap_hashing_and_upload", "true")
+
+        with open(os.path.join(temp_job_bundle_dir, "template.json"), "w", encoding="utf8") as f:
+            f.write(MOCK_JOB_TEMPLATE_CASES["MINIMAL_JSON"][1])
+        _write_asset_files(temp_assets_dir, {"asset-1.txt": "This is asset 1"})
+        with open(
+            os.path.join(temp_job_bundle_dir, "asset_references.json"), "w", encoding="utf8"
+        ) as f:
+            json.dump(
+                {
+                    "assetReferences": {
+                        "inputs": {"filenames": [os.path.join(temp_assets_dir, "asset-1.txt")]}
+                    }
+                },
+                f,
+            )
+
+        def fake_hashing_callback(metadata: ProgressReportMetadata) -> bool:
+            return True
+
+        def fake_upload_callback(metadata: ProgressReportMetadata) -> bool:
+            return True
+
+        # WHEN
+        api.create_job_from_job_bundle(
+            temp_job_bundle_dir,
+            hashing_progress_callback=fake_hashing_callback,
+            upload_progress_callback=fake_upload_callback,
+            queue_parameter_definitions=[],
+        )
+
+        # THEN
+        mock_hash_and_upload_assets.assert_called_once_with(
+            asset_groups=[AssetRootGroup()],
+            total_input_files=1,
+            total_input_bytes=15,
+            hash_cache_dir=ANY,
+            s3_check_cache_dir=ANY,
+            on_preparing_to_submit=fake_hashing_callback,
+            on_uploading_assets=fake_upload_callback,
+        )
+        mock_hash_attachments.assert_not_called()
+        mock_upload_assets.assert_not_called()
+        client_mock().create_job.assert_called_once_with(
+            farmId=MOCK_FARM_ID,
+            queueId=MOCK_QUEUE_ID,
+            template=ANY,
+            templateType=ANY,
+            priority=50,
+            attachments={
+                "manifests": [],
+                "fileSystem": JobAttachmentsFileSystem.COPIED,
+            },
+        )
+
+
 def test_create_job_from_job_bundle_empty_job_attachments(
     fresh_deadline_config, temp_job_bundle_dir, temp_assets_dir
 ):
@@ -683,6 +786,7 @@ def test_create_job_from_job_bundle_empty_job_attachments(
             referenced_paths=[],
             storage_profile=MOCK_STORAGE_PROFILE,
             require_paths_exist=False,
+            file_records=ANY,
         )
         mock_hash_attachments.assert_not_called()
         mock_upload_assets.assert_not_called()
@@ -1009,6 +1113,7 @@ def test_create_job_from_job_bundle_with_single_asset_file(
             referenced_paths=[],
             storage_profile=MOCK_STORAGE_PROFILE,
             require_paths_exist=False,
+            file_records=ANY,
         )
         mock_hash_attachments.assert_called_once_with(
             asset_manager=ANY,
@@ -35,7 +35,7 @@ def test_cli_config_show_defaults(fresh_deadline_config):
     assert fresh_deadline_config in result.output
 
     # Assert the expected number of settings
-    assert len(settings.keys()) == 15
+    assert len(settings.keys()) == 26
 
     for setting_name in settings.keys():
         assert setting_name in result.output
@@ -104,6 +104,17 @@ def test_cli_config_show_modified_config(fresh_deadline_config):
     config.set_setting("telemetry.identifier", "user-id-123abc-456def")
     config.set_setting("settings.s3_max_pool_connections", "100")
     config.set_setting("settings.small_file_threshold_multiplier", "15")
+    config.set_setting("settings.file_hashing_backend", "PROCESS")
+    config.set_setting("settings.large_file_upload_mode", "CONCURRENT")
+    config.set_setting("settings.upload_max_megabytes_in_flight", "4096")
+    config.set_setting("settings.adaptive_transfer_concurrency", "true")
+    config.set_setting("settings.overlap_hashing_and_upload", "true")
+    config.set_setting("settings.manifest_cache_megabytes", "512")
+    config.set_setting("settings.download_cache_megabytes", "20480")
+    config.set_setting("settings.download_cache_hardlinks", "true")
+    config.set_setting("settings.small_file_download_threshold_megabytes", "16")
+    config.set_setting("settings.large_file_download_part_megabytes", "64")
+    config.set_setting("settings.large_file_download_max_concurrency", "16")
 
     runner = CliRunner()
     result = runner.invoke(main, ["config", "show"])
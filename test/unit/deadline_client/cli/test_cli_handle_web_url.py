@@ -11,7 +11,7 @@ from unittest.mock import ANY, MagicMock, call, patch
 import pytest
 from click.testing import CliRunner
 
-from deadline.client import api
+from deadline.client import api, config
 from deadline.client.cli import main
 from deadline.client.cli._deadline_web_url import (
     parse_query_string,
@@ -295,6 +295,9 @@ def test_cli_handle_web_url_download_output_only_required_input(fresh_deadline_c
         mock_download.assert_called_once_with(
             file_conflict_resolution=FileConflictResolution.CREATE_COPY,
             on_downloading_files=ANY,
+            download_journal_dir=config.config_file.get_cache_directory(),
+            resume=False,
+            hash_cache_dir=config.config_file.get_cache_directory(),
         )
         assert result.exit_code == 0
 
@@ -348,6 +351,9 @@ def test_cli_handle_web_url_download_output_with_optional_input(fresh_deadline_c
         mock_download.assert_called_once_with(
             file_conflict_resolution=FileConflictResolution.CREATE_COPY,
             on_downloading_files=ANY,
+            download_journal_dir=config.config_file.get_cache_directory(),
+            resume=False,
+            hash_cache_dir=config.config_file.get_cache_directory(),
         )
 
 
@@ -947,6 +947,9 @@ def test_cli_job_download_output_handle_web_url_with_optional_input(fresh_deadli
         mock_download.assert_called_once_with(
             file_conflict_resolution=FileConflictResolution.CREATE_COPY,
             on_downloading_files=ANY,
+            download_journal_dir=config.config_file.get_cache_directory(),
+            resume=False,
+            hash_cache_dir=config.config_file.get_cache_directory(),
         )
         assert result.exit_code == 0
 
@@ -203,3 +203,63 @@ def test_decode_manifest_hash_not_alphanumeric():
                 "}"
             )
             decode.decode_manifest(manifest_str)
+
+
+def test_get_validator_is_cached():
+    """
+    Test that the schema of a manifest version is loaded and checked only once.
+    """
+    version = versions.ManifestVersion.v2023_03_03
+
+    assert decode._get_validator(version) is decode._get_validator(version)
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        pytest.param(lambda manifest: manifest.pop("hashAlg"), id="missing_hashAlg"),
+        pytest.param(lambda manifest: manifest.update(hashAlg="md5"), id="unknown_hashAlg"),
+        pytest.param(lambda manifest: manifest.update(totalSize="10"), id="string_totalSize"),
+        pytest.param(lambda manifest: manifest.update(totalSize=True), id="boolean_totalSize"),
+        pytest.param(lambda manifest: manifest.update(paths=[]), id="empty_paths"),
+        pytest.param(lambda manifest: manifest.update(paths={}), id="object_paths"),
+        pytest.param(lambda manifest: manifest["paths"][0].pop("mtime"), id="missing_mtime"),
+        pytest.param(lambda manifest: manifest["paths"][0].update(size=1.5), id="float_size"),
+        pytest.param(lambda manifest: manifest["paths"][0].update(path=1), id="integer_path"),
+        pytest.param(lambda manifest: manifest["paths"].append("a"), id="string_path_entry"),
+    ],
+)
+def test_fast_validator_agrees_with_schema(default_manifest_str_v2023_03_03: str, mutate):
+    """
+    Test that the fast v2023-03-03 validator rejects the manifests that the schema rejects, and that
+    decoding them still raises the schema's explanation of what's not valid.
+    """
+    # GIVEN
+    manifest: dict[str, Any] = json.loads(default_manifest_str_v2023_03_03)
+    assert decode._is_valid_v2023_03_03(manifest)
+    mutate(manifest)
+
+    # WHEN
+    fast_valid = decode._is_valid_v2023_03_03(manifest)
+    schema_valid, error_str = decode.validate_manifest(
+        manifest, versions.ManifestVersion.v2023_03_03
+    )
+
+    # THEN
+    assert not fast_valid
+    assert not schema_valid
+    with pytest.raises(ManifestDecodeValidationError) as raised:
+        decode.decode_manifest(json.dumps(manifest))
+    assert str(raised.value) == error_str
+
+
+@pytest.mark.parametrize("strict", [False, True])
+def test_decode_manifest_strict(default_manifest_str_v2023_03_03: str, strict: bool):
+    """
+    Test that a valid manifest is only validated against the full schema when decoding strictly.
+    """
+    with patch.object(decode, "validate_manifest", wraps=decode.validate_manifest) as mock_validate:
+        decoded = decode.decode_manifest(default_manifest_str_v2023_03_03, strict=strict)
+
+    assert decoded == decode.decode_manifest(default_manifest_str_v2023_03_03, strict=not strict)
+    assert mock_validate.called == strict
@@ -0,0 +1,92 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+""" Tests for hashing files and data """
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from xxhash import xxh3_128
+
+import deadline
+from deadline.job_attachments.asset_manifests.hash_algorithms import (
+    HASH_FILE_MAX_CHUNK_SIZE,
+    HASH_FILE_MIN_CHUNK_SIZE,
+    HashAlgorithm,
+    HashFileReadMode,
+    hash_data,
+    hash_file,
+)
+
+
+@pytest.mark.parametrize("read_mode", list(HashFileReadMode))
+@pytest.mark.parametrize(
+    "file_size",
+    [
+        0,
+        1,
+        HASH_FILE_MIN_CHUNK_SIZE - 1,
+        HASH_FILE_MIN_CHUNK_SIZE + 1,
+        HASH_FILE_MAX_CHUNK_SIZE * 2 + 3,
+    ],
+)
+def test_hash_file(tmp_path: Path, read_mode: HashFileReadMode, file_size: int):
+    """
+    Test that files hash to the same value as their contents, regardless of how they are read.
+    """
+    # GIVEN
+    data = bytes(i % 251 for i in range(file_size))
+    test_file = tmp_path / "test.bin"
+    test_file.write_bytes(data)
+
+    # WHEN
+    file_hash = hash_file(str(test_file), HashAlgorithm.XXH128, read_mode)
+
+    # THEN
+    assert file_hash == xxh3_128(data).hexdigest()
+    assert file_hash == hash_data(data, HashAlgorithm.XXH128)
+
+
+def test_hash_file_auto_uses_mmap_for_large_files(tmp_path: Path):
+    """
+    Test that in AUTO read mode, only files at or above the threshold are memory mapped.
+    """
+    # GIVEN
+    small_file = tmp_path / "small.bin"
+    small_file.write_bytes(b"a" * 10)
+    large_file = tmp_path / "large.bin"
+    large_file.write_bytes(b"a" * 20)
+
+    # WHEN
+    with patch(
+        f"{deadline.__package__}.job_attachments.asset_manifests.hash_algorithms.HASH_FILE_MMAP_THRESHOLD",
+        20,
+    ), patch(
+        f"{deadline.__package__}.job_attachments.asset_manifests.hash_algorithms._update_from_mmap",
+        return_value=True,
+    ) as mock_update_from_mmap:
+        hash_file(str(small_file), HashAlgorithm.XXH128)
+        hash_file(str(large_file), HashAlgorithm.XXH128)
+
+    # THEN
+    assert mock_update_from_mmap.call_count == 1
+    assert mock_update_from_mmap.call_args.args[2] == 20
+
+
+def test_hash_file_mmap_falls_back_to_buffered(tmp_path: Path):
+    """
+    Test that a file that can't be memory mapped is read instead.
+    """
+    # GIVEN
+    test_file = tmp_path / "test.bin"
+    test_file.write_bytes(b"some data")
+
+    # WHEN
+    with patch(
+        f"{deadline.__package__}.job_attachments.asset_manifests.hash_algorithms.mmap.mmap",
+        side_effect=OSError("mmap not supported"),
+    ):
+        file_hash = hash_file(str(test_file), HashAlgorithm.XXH128, HashFileReadMode.MMAP)
+
+    # THEN
+    assert file_hash == xxh3_128(b"some data").hexdigest()
@@ -1,13 +1,18 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 """ Tests for the v2023-03-03 version of the manifest file. """
+import copy
+import dataclasses
+import io
 import json
+import pickle
+from typing import List
 
 from deadline.job_attachments.asset_manifests.v2023_03_03.asset_manifest import (
     AssetManifest,
     ManifestPath,
 )
-from deadline.job_attachments.asset_manifests import HashAlgorithm
+from deadline.job_attachments.asset_manifests import BaseManifestPath, HashAlgorithm
 
 
 def test_encode():
@@ -88,3 +93,40 @@ def test_decode(default_manifest_str_v2023_03_03: str):
     assert (
         AssetManifest.decode(manifest_data=json.loads(default_manifest_str_v2023_03_03)) == expected
     )
+
+
+def test_manifest_path_has_no_instance_dict():
+    """
+    Ensure manifest paths use slots, so that manifests with millions of paths stay small in memory,
+    while still copying and pickling like the other data classes.
+    """
+    manifest_path = ManifestPath(path="test_file", hash="a", size=1, mtime=167907934333848)
+
+    assert not hasattr(manifest_path, "__dict__")
+    assert pickle.loads(pickle.dumps(manifest_path)) == manifest_path
+    assert copy.deepcopy(manifest_path).path == "test_file"
+
+
+def test_encode_to_file_matches_encode():
+    """
+    Ensure the streamed encoding is byte-identical to the encoding of the whole manifest as a dictionary,
+    including for paths that need escaping, so that manifest hashes don't change.
+    """
+    paths: List[BaseManifestPath] = [
+        ManifestPath(path=f"dir/file_{i}.exr", hash=f"{i:032x}", size=10**9, mtime=i)
+        for i in range(25000)
+    ]
+    paths += [
+        ManifestPath(path='quote"back\\slash', hash="a", size=0, mtime=1),
+        ManifestPath(path="\ude0a€😀\r\x00", hash="b", size=1, mtime=1679079344833848),
+    ]
+    manifest = AssetManifest(hash_alg=HashAlgorithm("xxh128"), total_size=3 * 10**12, paths=paths)
+
+    buffer = io.BytesIO()
+    manifest.encode_to_file(buffer)
+
+    expected = json.dumps(
+        dataclasses.asdict(manifest), sort_keys=True, separators=(",", ":"), ensure_ascii=True
+    )
+    assert buffer.getvalue() == expected.encode("ascii")
+    assert manifest.encode() == expected
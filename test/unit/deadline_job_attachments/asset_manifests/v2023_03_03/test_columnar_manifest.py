@@ -0,0 +1,173 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+""" Tests for the columnar form of the v2023-03-03 version of the manifest. """
+import tracemalloc
+from typing import List
+
+import pytest
+
+from deadline.job_attachments.api.manifest import compare_manifest
+from deadline.job_attachments.asset_manifests import BaseManifestPath, HashAlgorithm
+from deadline.job_attachments.asset_manifests.decode import decode_manifest
+from deadline.job_attachments.asset_manifests.v2023_03_03 import (
+    AssetManifest,
+    ColumnarAssetManifest,
+    ManifestPath,
+)
+
+
+def _make_paths(count: int) -> List[BaseManifestPath]:
+    return [
+        ManifestPath(
+            path=f"renders/shot_{i % 7}/frame_{i:05d}.exr",
+            hash=f"{i:032x}",
+            size=i * 1000,
+            mtime=1679079344833848 + i,
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def manifest() -> AssetManifest:
+    paths = _make_paths(50) + [
+        ManifestPath(path="top_level_file", hash="f" * 32, size=5, mtime=1),
+        ManifestPath(path="/leading_slash", hash="e" * 32, size=6, mtime=2),
+        ManifestPath(path="renders/€/\ude0a", hash="d" * 32, size=7, mtime=3),
+    ]
+    return AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=paths,
+        total_size=sum(path.size for path in paths),
+    )
+
+
+def test_paths_view_matches_manifest(manifest: AssetManifest):
+    """
+    Test that the paths of a columnar manifest read back the same as the manifest it was created from.
+    """
+    columnar = ColumnarAssetManifest.from_manifest(manifest)
+
+    assert len(columnar.paths) == len(manifest.paths)
+    assert list(columnar.paths) == manifest.paths
+    assert columnar.paths[-1] == manifest.paths[-1]
+    assert columnar.paths[2:5] == manifest.paths[2:5]
+    assert columnar.to_manifest() == manifest
+    assert columnar.get_paths_size() == manifest.totalSize
+
+
+def test_encode_matches_manifest(manifest: AssetManifest):
+    """
+    Test that a columnar manifest encodes to the same canonical JSON as the manifest it was created
+    from, so that manifest hashes don't change.
+    """
+    manifest.paths.reverse()
+    columnar = ColumnarAssetManifest.from_manifest(manifest)
+
+    assert columnar.encode() == manifest.encode()
+
+
+def test_decode_columnar(default_manifest_str_v2023_03_03: str):
+    """
+    Test that decoding into the columnar form reads the same paths as decoding normally, including
+    hashes that aren't hex digests.
+    """
+    decoded = decode_manifest(default_manifest_str_v2023_03_03)
+    columnar = decode_manifest(default_manifest_str_v2023_03_03, columnar=True)
+
+    assert isinstance(columnar, ColumnarAssetManifest)
+    assert not columnar.has_fixed_width_hashes
+    assert list(columnar.paths) == decoded.paths
+    assert columnar.encode() == decoded.encode()
+
+
+def test_hashes_kept_when_switching_to_strings():
+    """
+    Test that once a hash that can't be packed is added, the packed hashes before it are kept.
+    """
+    paths = _make_paths(3) + [ManifestPath(path="other", hash="NotHex", size=1, mtime=1)]
+
+    columnar = ColumnarAssetManifest(hash_alg=HashAlgorithm.XXH128, paths=paths, total_size=0)
+
+    assert [path.hash for path in columnar.paths] == [path.hash for path in paths]
+
+
+@pytest.mark.parametrize("directory_path", ["renders", "renders/shot_3", "renders/shot", "missing"])
+def test_select_directory(manifest: AssetManifest, directory_path: str):
+    """
+    Test that selecting a directory returns the paths that start with the directory path and '/'.
+    """
+    columnar = ColumnarAssetManifest.from_manifest(manifest)
+
+    selected = columnar.select_directory(directory_path)
+
+    expected = [path for path in manifest.paths if path.path.startswith(directory_path + "/")]
+    assert list(selected.paths) == expected
+    assert selected.get_paths_size() == sum(path.size for path in expected)
+
+
+def test_compare_manifest_columnar():
+    """
+    Test that comparing columnar manifests gives the same differences as comparing the manifests.
+    """
+    reference_paths = _make_paths(20)
+    compare_paths = _make_paths(25)[5:]
+    compare_paths[0] = ManifestPath(
+        path=compare_paths[0].path, hash="a" * 32, size=compare_paths[0].size, mtime=1
+    )
+    reference = AssetManifest(hash_alg=HashAlgorithm.XXH128, paths=reference_paths, total_size=0)
+    compare = AssetManifest(hash_alg=HashAlgorithm.XXH128, paths=compare_paths, total_size=0)
+
+    differences = compare_manifest(
+        ColumnarAssetManifest.from_manifest(reference),
+        ColumnarAssetManifest.from_manifest(compare),
+    )
+
+    assert differences == compare_manifest(reference, compare)
+
+
+def test_compare_manifest_columnar_without_unchanged():
+    """
+    Test that comparing a columnar manifest with a manifest only returns the changed paths, when
+    unchanged paths aren't included.
+    """
+    reference_paths = _make_paths(20)
+    compare_paths = _make_paths(25)[5:]
+    compare_paths[0] = ManifestPath(
+        path=compare_paths[0].path, hash="a" * 32, size=compare_paths[0].size, mtime=1
+    )
+    reference = AssetManifest(hash_alg=HashAlgorithm.XXH128, paths=reference_paths, total_size=0)
+    compare = AssetManifest(hash_alg=HashAlgorithm.XXH128, paths=compare_paths, total_size=0)
+
+    differences = compare_manifest(
+        ColumnarAssetManifest.from_manifest(reference), compare, include_unchanged=False
+    )
+
+    assert differences == compare_manifest(reference, compare, include_unchanged=False)
+    assert sorted((status.name, path.path) for status, path in differences) == sorted(
+        [("MODIFIED", compare_paths[0].path)]
+        + [("NEW", path.path) for path in compare_paths[15:]]
+        + [("DELETED", path.path) for path in reference_paths[:5]]
+    )
+
+
+def test_memory_per_path_is_smaller():
+    """
+    Test that a columnar manifest takes several times less memory than a list of paths, even though
+    the file names in this manifest are most of the length of its paths.
+    """
+    count = 20000
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        paths = _make_paths(count)
+        list_memory = tracemalloc.get_traced_memory()[0] - baseline
+        columnar = ColumnarAssetManifest(hash_alg=HashAlgorithm.XXH128, paths=paths, total_size=0)
+        del paths
+        columnar_memory = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+
+    assert len(columnar.paths) == count
+    assert columnar_memory * 4 < list_memory
@@ -5,6 +5,7 @@ from unittest.mock import Mock, patch
 from deadline.job_attachments._aws.aws_clients import (
     get_deadline_client,
     get_s3_client,
+    get_s3_transfer_manager,
     get_sts_client,
 )
 import deadline
@@ -62,3 +63,21 @@ def test_get_sts_client(boto_config):
     sts_client = get_sts_client()
 
     assert sts_client.meta.endpoint_url == "https://sts.us-west-2.amazonaws.com"
+
+
+def test_get_s3_transfer_manager_max_concurrency(boto_config):
+    """
+    Test that a transfer manager with a maximum concurrency makes that many requests at once and holds
+    that many parts of uploads in memory, and that one without it uses the defaults.
+    """
+    s3_client = get_s3_client()
+
+    default_config = get_s3_transfer_manager(s3_client=s3_client).config
+    config = get_s3_transfer_manager(s3_client=s3_client, max_concurrency=50).config
+
+    assert default_config.max_request_concurrency == 10
+    assert (
+        config.max_request_concurrency,
+        config.max_submission_concurrency,
+        config.max_in_memory_upload_chunks,
+    ) == (50, 50, 50)
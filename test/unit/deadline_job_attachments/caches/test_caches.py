@@ -1,7 +1,9 @@
 # Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
 
 import os
+import sys
 from datetime import datetime
+from pathlib import Path
 from sqlite3 import OperationalError
 from unittest.mock import patch
 
@@ -9,11 +11,19 @@ import pytest
 
 import deadline
 from deadline.job_attachments.asset_manifests import HashAlgorithm
+from deadline.job_attachments.asset_manifests.v2023_03_03 import (
+    AssetManifest,
+    ColumnarAssetManifest,
+    ManifestPath,
+)
 from deadline.job_attachments.exceptions import JobAttachmentsError
 from deadline.job_attachments.caches import (
     CacheDB,
+    ContentCache,
     HashCache,
     HashCacheEntry,
+    ManifestCache,
+    ManifestCacheEntry,
     S3CheckCache,
     S3CheckCacheEntry,
 )
@@ -118,6 +128,50 @@ class TestHashCache:
             # THEN
             assert actual_entry == expected_entry
 
+    def test_get_entries_returns_entries_under_prefix(self, tmpdir):
+        """
+        Tests that all entries whose file paths start with the given prefix are returned at once, keyed by file path.
+        """
+        # GIVEN
+        cache_dir = tmpdir.mkdir("cache")
+        entries = [
+            HashCacheEntry("/root/a.txt", HashAlgorithm.XXH128, "hash_a", "1234.5"),
+            HashCacheEntry("/root/ñ/\ude0a.txt", HashAlgorithm.XXH128, "hash_b", "1234.5"),
+            HashCacheEntry("/root2/c.txt", HashAlgorithm.XXH128, "hash_c", "1234.5"),
+            HashCacheEntry("/other/d.txt", HashAlgorithm.XXH128, "hash_d", "1234.5"),
+        ]
+
+        # WHEN
+        with HashCache(cache_dir) as hc:
+            hc.put_entries(entries)
+            actual_entries = hc.get_entries("/root/", HashAlgorithm.XXH128)
+
+        # THEN
+        assert actual_entries == {entry.file_path: entry for entry in entries[:2]}
+
+    def test_flush_entries_writes_and_clears_list(self, tmpdir):
+        """
+        Tests that flushing entries writes them in a single transaction and removes them from the list.
+        """
+        # GIVEN
+        cache_dir = tmpdir.mkdir("cache")
+        entries = [
+            HashCacheEntry(f"/root/{i}.txt", HashAlgorithm.XXH128, f"hash{i}", "1234.5")
+            for i in range(3)
+        ]
+        entries_to_update = list(entries)
+
+        # WHEN
+        with HashCache(cache_dir) as hc:
+            with patch.object(hc, "_write_entries", wraps=hc._write_entries) as mock_write_entries:
+                hc.flush_entries(entries_to_update)
+
+            # THEN
+            mock_write_entries.assert_called_once()
+            assert entries_to_update == []
+            for entry in entries:
+                assert hc.get_entry(entry.file_path, HashAlgorithm.XXH128) == entry
+
     def test_enter_sqlite_import_error(self, tmpdir):
         """
         Tests that the cache doesn't throw errors when the SQLite module can't be found
@@ -210,3 +264,315 @@ class TestS3CheckCache:
                     )
                 )
                 assert s3c.get_entry("bucket/Data/somehash") is None
+
+    def test_enter_enables_write_ahead_logging(self, tmpdir):
+        """
+        Tests that the cache database runs in WAL mode, so that concurrent processes don't block each other.
+        """
+        with S3CheckCache(tmpdir.mkdir("cache")) as s3c:
+            assert s3c.db_connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_preloaded_entries(self, tmpdir):
+        """
+        Tests that when a key prefix is preloaded, unexpired entries under the prefix are returned from memory,
+        and new entries are only written to the database when exiting the context manager.
+        """
+        # GIVEN
+        cache_dir = tmpdir.mkdir("cache")
+        now = str(datetime.now().timestamp())
+        with S3CheckCache(cache_dir) as s3c:
+            s3c.put_entry(S3CheckCacheEntry("bucket/Data/hash1", now))
+            s3c.put_entry(S3CheckCacheEntry("bucket/Data/expired", "123.456"))
+            s3c.put_entry(S3CheckCacheEntry("bucket/Datb/hash2", now))
+
+        # WHEN
+        with S3CheckCache(cache_dir, preload_key_prefix="bucket/Data/") as s3c:
+            # THEN
+            assert s3c._preloaded_entries == {"bucket/Data/hash1": now}
+            with patch.object(s3c, "db_connection") as mock_connection:
+                assert s3c.get_entry("bucket/Data/hash1") == S3CheckCacheEntry(
+                    "bucket/Data/hash1", now
+                )
+                assert s3c.get_entry("bucket/Data/expired") is None
+                s3c.put_entry(S3CheckCacheEntry("bucket/Data/hash3", now))
+                assert s3c.get_entry("bucket/Data/hash3") == S3CheckCacheEntry(
+                    "bucket/Data/hash3", now
+                )
+                mock_connection.assert_not_called()
+                mock_connection.execute.assert_not_called()
+            # Keys outside of the preloaded prefix are looked up in the database.
+            assert s3c.get_entry("bucket/Datb/hash2") == S3CheckCacheEntry("bucket/Datb/hash2", now)
+
+        with S3CheckCache(cache_dir) as s3c:
+            assert s3c.get_entry("bucket/Data/hash3") == S3CheckCacheEntry("bucket/Data/hash3", now)
+
+    def test_preloaded_put_entry_writes_in_batches(self, tmpdir):
+        """
+        Tests that when a key prefix is preloaded, new entries are written in batches of WRITE_BATCH_SIZE.
+        """
+        # GIVEN
+        cache_dir = tmpdir.mkdir("cache")
+        now = str(datetime.now().timestamp())
+
+        # WHEN
+        with patch.object(S3CheckCache, "WRITE_BATCH_SIZE", 2):
+            with S3CheckCache(cache_dir, preload_key_prefix="bucket/Data") as s3c:
+                with patch.object(
+                    s3c, "_write_entries", wraps=s3c._write_entries
+                ) as mock_write_entries:
+                    for i in range(5):
+                        s3c.put_entry(S3CheckCacheEntry(f"bucket/Data/hash{i}", now))
+
+                    # THEN
+                    assert [len(call.args[1]) for call in mock_write_entries.call_args_list] == [
+                        2,
+                        2,
+                    ]
+
+        with S3CheckCache(cache_dir) as s3c:
+            for i in range(5):
+                assert s3c.get_entry(f"bucket/Data/hash{i}") is not None
+
+
+def _make_manifest(path_count: int) -> AssetManifest:
+    return AssetManifest(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=[
+            ManifestPath(path=f"dir/file{i}\u00e9", hash=f"{i:032x}", size=i, mtime=1234 + i)
+            for i in range(path_count)
+        ],
+        total_size=sum(range(path_count)),
+    )
+
+
+class TestManifestCache:
+    """
+    Tests for the local manifest cache
+    """
+
+    def test_get_entry_returns_valid_entry(self, tmpdir):
+        """
+        Tests that an entry reads back with an equal manifest, that isn't the manifest that was put.
+        """
+        # GIVEN
+        cache_dir = tmpdir.mkdir("cache")
+        expected_entry = ManifestCacheEntry(
+            s3_key="bucket/Manifests/farm/queue/Inputs/guid/hash_input",
+            etag='"0123abcd"',
+            metadata={"asset-root": "/tmp"},
+            manifest=_make_manifest(3),
+        )
+
+        # WHEN
+        with ManifestCache(cache_dir) as manifest_cache:
+            manifest_cache.put_entry(expected_entry)
+            actual_entry = manifest_cache.get_entry(expected_entry.s3_key)
+
+        # THEN
+        assert actual_entry == expected_entry
+        assert actual_entry is not None
+        assert actual_entry.manifest is not expected_entry.manifest
+
+    def test_get_entry_returns_columnar_manifest(self, tmpdir):
+        """
+        Tests that an entry reads back with a columnar manifest of the same paths, if requested.
+        """
+        # GIVEN
+        cache_dir = tmpdir.mkdir("cache")
+        entry = ManifestCacheEntry(
+            s3_key="bucket/Manifests/farm/queue/Inputs/guid/hash_input",
+            etag='"0123abcd"',
+            metadata={"asset-root": "/tmp"},
+            manifest=_make_manifest(3),
+        )
+
+        # WHEN
+        with ManifestCache(cache_dir) as manifest_cache:
+            manifest_cache.put_entry(entry)
+            actual_entry = manifest_cache.get_entry(entry.s3_key, columnar=True)
+
+        # THEN
+        assert actual_entry is not None
+        assert isinstance(actual_entry.manifest, ColumnarAssetManifest)
+        assert actual_entry.manifest.to_manifest() == entry.manifest
+
+    def test_get_entry_returns_none_when_missing(self, tmpdir):
+        """
+        Tests that nothing is returned for a key that isn't in the cache.
+        """
+        with ManifestCache(tmpdir.mkdir("cache")) as manifest_cache:
+            assert manifest_cache.get_entry("bucket/missing") is None
+
+    def test_put_entry_evicts_least_recently_used(self, tmpdir):
+        """
+        Tests that when the cache exceeds its maximum size, the least recently used entries are evicted.
+        """
+        # GIVEN
+        cache_dir = tmpdir.mkdir("cache")
+        manifest = _make_manifest(10)
+
+        with ManifestCache(tmpdir.mkdir("sizing")) as manifest_cache:
+            manifest_cache.put_entry(ManifestCacheEntry("bucket/size", "etag", {}, manifest))
+            (entry_size,) = manifest_cache.db_connection.execute(
+                f"SELECT size FROM {manifest_cache.table_name}"
+            ).fetchone()
+
+        # WHEN
+        with ManifestCache(cache_dir, max_size_bytes=3 * entry_size) as manifest_cache:
+            with patch(
+                f"{deadline.__package__}.job_attachments.caches.manifest_cache.time.time",
+                side_effect=range(100),
+            ):
+                for i in range(3):
+                    manifest_cache.put_entry(
+                        ManifestCacheEntry(f"bucket/{i}", "etag", {}, manifest)
+                    )
+                # Using the first entry makes the second the least recently used.
+                assert manifest_cache.get_entry("bucket/0") is not None
+                manifest_cache.put_entry(ManifestCacheEntry("bucket/3", "etag", {}, manifest))
+
+                # THEN
+                assert manifest_cache.get_entry("bucket/1") is None
+                for key in ["bucket/0", "bucket/2", "bucket/3"]:
+                    assert manifest_cache.get_entry(key) is not None
+
+    def test_get_entry_ignores_unreadable_entry(self, tmpdir):
+        """
+        Tests that an entry that can't be loaded is treated as missing.
+        """
+        with ManifestCache(tmpdir.mkdir("cache")) as manifest_cache:
+            manifest_cache.put_entry(
+                ManifestCacheEntry("bucket/key", "etag", {}, _make_manifest(1))
+            )
+            manifest_cache.db_connection.execute(
+                f"UPDATE {manifest_cache.table_name} SET manifest=?", [b"not marshal"]
+            )
+
+            assert manifest_cache.get_entry("bucket/key") is None
+
+    def test_enter_sqlite_import_error(self, tmpdir):
+        """
+        Tests that the cache doesn't throw errors when the SQLite module can't be found
+        """
+        with patch.dict("sys.modules", {"sqlite3": None}):
+            new_dir = tmpdir.join("does_not_exist")
+            manifest_cache = ManifestCache(new_dir)
+            assert not os.path.exists(new_dir)
+            with manifest_cache:
+                manifest_cache.put_entry(
+                    ManifestCacheEntry("bucket/key", "etag", {}, _make_manifest(1))
+                )
+                assert manifest_cache.get_entry("bucket/key") is None
+
+
+class TestContentCache:
+    """
+    Tests for the host-level cache of downloaded files
+    """
+
+    def _put_file(
+        self, content_cache: ContentCache, tmp_path: Path, file_hash: str, data: bytes
+    ) -> None:
+        source = tmp_path / f"downloaded_{file_hash}"
+        source.write_bytes(data)
+        content_cache.put(file_hash, HashAlgorithm.XXH128, len(data), source)
+
+    def test_init_empty_path(self, tmp_path):
+        """
+        Tests that when no cache directory is given, the default is used.
+        """
+        with patch.dict(os.environ, {"HOME": str(tmp_path)}):
+            content_cache = ContentCache(max_size_bytes=100)
+
+        assert (
+            content_cache.cache_dir == tmp_path / ".deadline" / "job_attachments" / "content_cache"
+        )
+        assert content_cache.cache_dir.is_dir()
+
+    def test_materialize_copies_cached_file(self, tmp_path):
+        """
+        Tests that a file that was put in the cache is materialized as a separate copy, and that hits
+        and misses are counted.
+        """
+        # GIVEN
+        content_cache = ContentCache(max_size_bytes=100, cache_dir=str(tmp_path / "cache"))
+        destination = tmp_path / "session" / "file.txt"
+        destination.parent.mkdir()
+
+        # WHEN
+        assert not content_cache.materialize("abcd", HashAlgorithm.XXH128, 5, destination)
+        self._put_file(content_cache, tmp_path, "abcd", b"hello")
+        materialized = content_cache.materialize("abcd", HashAlgorithm.XXH128, 5, destination)
+
+        # THEN
+        assert materialized
+        assert destination.read_bytes() == b"hello"
+        assert not os.path.samefile(
+            destination, content_cache.get_path("abcd", HashAlgorithm.XXH128)
+        )
+        assert content_cache.get_path("abcd", HashAlgorithm.XXH128) == (
+            tmp_path / "cache" / "ab" / "abcd.xxh128"
+        )
+        assert (content_cache.hit_bytes, content_cache.miss_bytes) == (5, 5)
+
+    def test_materialize_hardlinks_cached_file(self, tmp_path):
+        """
+        Tests that with hardlinks enabled, the materialized file is the cached file, and replaces an
+        existing file.
+        """
+        content_cache = ContentCache(
+            max_size_bytes=100, cache_dir=str(tmp_path / "cache"), use_hardlinks=True
+        )
+        self._put_file(content_cache, tmp_path, "abcd", b"hello")
+        destination = tmp_path / "file.txt"
+        destination.write_bytes(b"existing")
+
+        assert content_cache.materialize("abcd", HashAlgorithm.XXH128, 5, destination)
+
+        assert destination.read_bytes() == b"hello"
+        assert os.path.samefile(destination, content_cache.get_path("abcd", HashAlgorithm.XXH128))
+
+    def test_put_evicts_least_recently_used(self, tmp_path):
+        """
+        Tests that when the cache exceeds its maximum size, the least recently used files are
+        evicted until it's down to its eviction target.
+        """
+        # GIVEN
+        content_cache = ContentCache(max_size_bytes=30, cache_dir=str(tmp_path / "cache"))
+        for i, file_hash in enumerate(["aa01", "bb02", "cc03"]):
+            self._put_file(content_cache, tmp_path, file_hash, b"0123456789")
+            cached_path = content_cache.get_path(file_hash, HashAlgorithm.XXH128)
+            os.utime(cached_path, (1000 + i, 1000 + i))
+
+        # WHEN
+        with patch(
+            f"{deadline.__package__}.job_attachments.caches.content_cache._get_last_used_time",
+            side_effect=lambda stat: stat.st_mtime,
+        ):
+            self._put_file(content_cache, tmp_path, "dd04", b"0123456789")
+
+        # THEN
+        def is_cached(file_hash: str) -> bool:
+            return content_cache.get_path(file_hash, HashAlgorithm.XXH128).exists()
+
+        assert not is_cached("aa01")
+        assert not is_cached("bb02")
+        assert is_cached("cc03")
+        assert is_cached("dd04")
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="Tests the POSIX file lock.")
+    def test_put_skips_eviction_while_another_process_evicts(self, tmp_path):
+        """
+        Tests that a cache doesn't evict files while the eviction lock is held elsewhere.
+        """
+        import fcntl
+
+        content_cache = ContentCache(max_size_bytes=15, cache_dir=str(tmp_path / "cache"))
+        self._put_file(content_cache, tmp_path, "aa01", b"0123456789")
+
+        with open(content_cache.cache_dir / ".lock", "a+b") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            self._put_file(content_cache, tmp_path, "bb02", b"0123456789")
+
+        assert content_cache.get_path("aa01", HashAlgorithm.XXH128).exists()
+        assert content_cache.get_path("bb02", HashAlgorithm.XXH128).exists()
@@ -16,6 +16,7 @@ import pytest
 from moto import mock_aws
 
 import deadline
+from deadline.job_attachments.asset_manifests import HashAlgorithm, hash_data
 from deadline.job_attachments.asset_manifests.decode import decode_manifest
 from deadline.job_attachments.asset_sync import AssetSync
 from deadline.job_attachments.os_file_permission import PosixFileSystemPermissionSettings
@@ -628,9 +629,12 @@ class TestAssetSync:
         )
 
         # WHEN
+        # The output files are hashed in parallel, so their hashes are given by file name.
         with patch(
             f"{deadline.__package__}.job_attachments.asset_sync.hash_file",
-            side_effect=["hash1", "hash2"],
+            side_effect=lambda path, hash_alg: {"test.txt": "hash1", "test2.txt": "hash2"}[
+                Path(path).name
+            ],
         ), patch(
             f"{deadline.__package__}.job_attachments.asset_sync.hash_data", side_effect=["hash3"]
         ), patch(
@@ -777,6 +781,72 @@ class TestAssetSync:
             is False
         )
 
+    @pytest.mark.skipif(
+        is_windows_non_admin(),
+        reason="Windows requires Admin to create symlinks, skipping this test.",
+    )
+    def test_find_and_hash_output_files(
+        self, tmp_path: Path, default_job_attachment_s3_settings: JobAttachmentS3Settings
+    ):
+        """
+        Test that the output files are found in the output directories and their subdirectories, and
+        hashed in batches, skipping the symbolic links that resolve outside of the session directory,
+        and the files that haven't been modified since they were last found.
+        """
+        session_dir = tmp_path / "session"
+        local_root = session_dir / "assetroot"
+        (local_root / "outputs" / "sub").mkdir(parents=True)
+        (local_root / "outputs" / "a.txt").write_text("a")
+        (local_root / "outputs" / "sub" / "b.txt").write_text("b")
+        (tmp_path / "outside.txt").write_text("outside")
+        os.symlink(local_root / "outputs" / "a.txt", local_root / "outputs" / "link_inside.txt")
+        os.symlink(tmp_path / "outside.txt", local_root / "outputs" / "link_outside.txt")
+        manifest_properties = ManifestProperties(
+            rootPath="/tmp",
+            rootPathFormat=PathFormat.get_host_path_format(),
+            outputRelativeDirectories=["outputs", "missing"],
+        )
+
+        file_records = self.default_asset_sync._find_output_files(
+            manifest_properties, local_root, session_dir
+        )
+        output_file_batches = list(
+            self.default_asset_sync._hash_output_files(
+                file_records, default_job_attachment_s3_settings, local_root, session_dir
+            )
+        )
+        file_records_again = self.default_asset_sync._find_output_files(
+            manifest_properties, local_root, session_dir
+        )
+
+        assert all(output_file_batches)
+        output_files = [
+            output_file
+            for output_file_batch in output_file_batches
+            for output_file in output_file_batch
+        ]
+        assert [output_file.full_path for output_file in output_files] == [
+            file_record.resolved_path for file_record in file_records
+        ]
+        assert not any(output_file.in_s3 for output_file in output_files)
+
+        files_by_rel_path = {output_file.rel_path: output_file for output_file in output_files}
+        assert sorted(files_by_rel_path) == [
+            "outputs/a.txt",
+            "outputs/link_inside.txt",
+            "outputs/sub/b.txt",
+        ]
+        assert files_by_rel_path["outputs/link_inside.txt"].full_path == str(
+            (local_root / "outputs" / "a.txt").resolve()
+        )
+        assert files_by_rel_path["outputs/link_inside.txt"].file_hash == (
+            files_by_rel_path["outputs/a.txt"].file_hash
+        )
+        assert files_by_rel_path["outputs/sub/b.txt"].file_hash == hash_data(
+            b"b", HashAlgorithm.XXH128
+        )
+        assert file_records_again == []
+
     @pytest.mark.parametrize(
         ("job", "expected_settings"),
         [(Job(jobId="job-98765567890123456789012345678901"), None), (None, None)],
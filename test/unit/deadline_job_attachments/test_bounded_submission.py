@@ -0,0 +1,80 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for submitting tasks with a bounded number of them pending at once."""
+
+import concurrent.futures
+import threading
+
+import pytest
+
+from deadline.job_attachments._bounded_submission import as_completed_bounded
+
+
+class TestAsCompletedBounded:
+    """
+    Tests for as_completed_bounded.
+    """
+
+    def test_yields_all_results(self):
+        """
+        Tests that every submitted task's future is yielded once it's complete.
+        """
+        # GIVEN
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as executor:
+            submissions = ((executor, pow, (i, 2)) for i in range(100))
+
+            # WHEN
+            results = [future.result() for future in as_completed_bounded(submissions, 10)]
+
+        # THEN
+        assert sorted(results) == [i**2 for i in range(100)]
+
+    def test_bounds_pending_tasks(self):
+        """
+        Tests that no more than `max_pending` tasks are submitted and not yet yielded at once, and
+        that submissions are taken from the iterable lazily.
+        """
+        # GIVEN
+        lock = threading.Lock()
+        submitted = 0
+        max_outstanding = 0
+        yielded = 0
+
+        def submissions(executor):
+            nonlocal submitted, max_outstanding
+            for i in range(50):
+                with lock:
+                    submitted += 1
+                    max_outstanding = max(max_outstanding, submitted - yielded)
+                yield (executor, abs, (i,))
+
+        # WHEN
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            for future in as_completed_bounded(submissions(executor), max_pending=5):
+                future.result()
+                with lock:
+                    yielded += 1
+
+        # THEN
+        assert yielded == 50
+        assert max_outstanding <= 6
+
+    def test_exception_surfaces(self):
+        """
+        Tests that an exception raised by a task is raised from its future's result.
+        """
+
+        def fail():
+            raise RuntimeError("failed")
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            with pytest.raises(RuntimeError):
+                for future in as_completed_bounded([(executor, fail, ())]):
+                    future.result()
+
+    def test_nonvalid_max_pending(self):
+        """
+        Tests that the maximum number of pending tasks must be positive.
+        """
+        with pytest.raises(ValueError):
+            list(as_completed_bounded([], max_pending=0))
@@ -0,0 +1,328 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for the adaptive control of how many S3 transfers run at once."""
+
+import threading
+from unittest.mock import MagicMock, patch
+
+import boto3
+import pytest
+from botocore.config import Config
+from botocore.hooks import HierarchicalEmitter
+from moto import mock_aws
+
+from deadline.client import config
+from deadline.job_attachments import _concurrency
+from deadline.job_attachments._concurrency import (
+    AdaptiveConcurrencyController,
+    adaptive_concurrency,
+    call_in_slot,
+)
+from deadline.job_attachments.exceptions import AssetSyncError
+
+
+class FakeClock:
+    """A monotonic clock that only moves when advanced."""
+
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    fake_clock = FakeClock()
+    with patch.object(_concurrency.time, "monotonic", fake_clock):
+        yield fake_clock
+
+
+def run_sample(
+    controller: AdaptiveConcurrencyController,
+    clock: FakeClock,
+    num_bytes: int,
+    latency: float = 0.1,
+    throttled: bool = False,
+) -> None:
+    """Runs one sample interval in which every slot is used, and `num_bytes` are transferred."""
+    slots = [controller.slot(0) for _ in range(controller.limit)]
+    for slot in slots:
+        slot.__enter__()
+    controller.record_latency(latency)
+    if throttled:
+        controller.record_throttle()
+    controller._completed_bytes += num_bytes
+    clock.advance(1.0)
+    for slot in slots:
+        slot.__exit__(None, None, None)
+
+
+class TestAdaptiveConcurrencyController:
+    """
+    Tests for AdaptiveConcurrencyController.
+    """
+
+    def test_increases_while_throughput_rises(self, clock):
+        """
+        Tests that the limit grows by one each sample while the throughput rises, up to the maximum.
+        """
+        # GIVEN
+        controller = AdaptiveConcurrencyController("test", initial_limit=2, max_limit=4)
+
+        # WHEN
+        limits = []
+        for num_bytes in [100, 200, 300, 400]:
+            run_sample(controller, clock, num_bytes)
+            limits.append(controller.limit)
+
+        # THEN
+        assert limits == [3, 4, 4, 4]
+
+    def test_holds_when_throughput_is_flat(self, clock):
+        """
+        Tests that the limit stays the same when more concurrency doesn't raise the throughput.
+        """
+        # GIVEN
+        controller = AdaptiveConcurrencyController("test", initial_limit=2, max_limit=10)
+        run_sample(controller, clock, 100)
+
+        # WHEN
+        run_sample(controller, clock, 100)
+
+        # THEN
+        assert controller.limit == 3
+
+    def test_holds_when_limit_not_reached(self, clock):
+        """
+        Tests that the limit doesn't grow when the transfers don't use all of the slots.
+        """
+        # GIVEN
+        controller = AdaptiveConcurrencyController("test", initial_limit=4, max_limit=10)
+
+        # WHEN
+        with controller.slot(100):
+            clock.advance(1.0)
+
+        # THEN
+        assert controller.limit == 4
+
+    def test_decreases_on_throttling(self, clock):
+        """
+        Tests that the limit is halved when requests are throttled, but not below the minimum.
+        """
+        # GIVEN
+        controller = AdaptiveConcurrencyController("test", initial_limit=8, max_limit=10)
+
+        # WHEN
+        limits = []
+        for _ in range(4):
+            run_sample(controller, clock, 100, throttled=True)
+            limits.append(controller.limit)
+
+        # THEN
+        assert limits == [4, 2, 1, 1]
+
+    def test_decreases_on_latency_spike(self, clock):
+        """
+        Tests that the limit is reduced when the latency rises well above the lowest seen.
+        """
+        # GIVEN
+        controller = AdaptiveConcurrencyController("test", initial_limit=8, max_limit=10)
+        run_sample(controller, clock, 100, latency=0.1)
+
+        # WHEN
+        run_sample(controller, clock, 1000, latency=1.0)
+
+        # THEN
+        assert controller.limit == 6
+
+    def test_initial_limit_within_bounds(self):
+        """
+        Tests that the initial limit is kept between the minimum and maximum.
+        """
+        assert AdaptiveConcurrencyController("test", initial_limit=50, max_limit=10).limit == 10
+        assert (
+            AdaptiveConcurrencyController("test", initial_limit=0, max_limit=10, min_limit=2).limit
+            == 2
+        )
+
+    def test_uses_progress_tracker_bytes(self, clock):
+        """
+        Tests that the throughput is measured from the progress tracker when there is one.
+        """
+        # GIVEN
+        progress_tracker = MagicMock(processed_bytes=0)
+        controller = AdaptiveConcurrencyController(
+            "test", initial_limit=1, max_limit=10, progress_tracker=progress_tracker
+        )
+        run_sample(controller, clock, 0)
+
+        # WHEN
+        run_sample(controller, clock, 1000)
+
+        # THEN
+        # The bytes of the completed slots are ignored, so the throughput didn't rise.
+        assert controller.limit == 2
+
+    def test_slot_waits_for_limit(self):
+        """
+        Tests that no more than `limit` slots are held at once.
+        """
+        # GIVEN
+        controller = AdaptiveConcurrencyController("test", initial_limit=1, max_limit=1)
+        second_acquired = threading.Event()
+
+        def acquire_second():
+            with controller.slot():
+                second_acquired.set()
+
+        # WHEN
+        with controller.slot():
+            thread = threading.Thread(target=acquire_second)
+            thread.start()
+            # THEN
+            assert not second_acquired.wait(timeout=0.2)
+            assert controller.in_flight == 1
+        assert second_acquired.wait(timeout=5)
+        thread.join()
+        assert controller.in_flight == 0
+
+    def test_call_in_slot(self):
+        """
+        Tests that the function is called with the given arguments, with or without a controller.
+        """
+        controller = AdaptiveConcurrencyController("test", initial_limit=1, max_limit=1)
+
+        assert call_in_slot(None, 0, max, 1, 2) == 2
+        assert call_in_slot(controller, 0, max, 1, 2) == 2
+        assert controller.in_flight == 0
+
+
+class TestSignalHandlers:
+    """
+    Tests for the handlers that receive the signals of an S3 client's requests.
+    """
+
+    @pytest.fixture
+    def s3_client(self):
+        with mock_aws():
+            yield boto3.client(
+                "s3", region_name="us-west-2", config=Config(retries={"mode": "standard"})
+            )
+
+    @pytest.fixture
+    def events_only_client(self):
+        """A client with only the event emitter, so that botocore's own retry handler isn't called."""
+        return MagicMock(meta=MagicMock(events=HierarchicalEmitter()))
+
+    @pytest.mark.parametrize(
+        "status_code, error_code",
+        [
+            pytest.param(503, "SlowDown", id="SlowDown"),
+            pytest.param(429, "TooManyRequests", id="TooManyRequests"),
+            pytest.param(400, "RequestLimitExceeded", id="RequestLimitExceeded"),
+        ],
+    )
+    def test_needs_retry_records_throttling(self, events_only_client, status_code, error_code):
+        """
+        Tests that a throttling response is recorded by the controllers monitoring the client,
+        without deciding on the retry itself.
+        """
+        # GIVEN
+        controller = AdaptiveConcurrencyController("test", initial_limit=1, max_limit=1)
+        http_response = MagicMock(status_code=status_code)
+        parsed_response = {"Error": {"Code": error_code}}
+
+        # WHEN
+        with controller.monitor(events_only_client):
+            responses = events_only_client.meta.events.emit(
+                "needs-retry.s3.PutObject",
+                response=(http_response, parsed_response),
+                endpoint=None,
+                operation=None,
+                attempts=1,
+                caught_exception=None,
+                request_dict={"context": {}},
+            )
+
+        # THEN
+        assert controller._sample_throttled
+        assert any(
+            handler.__name__ == "on_needs_retry" and response is None
+            for (handler, response) in responses
+        )
+
+    def test_needs_retry_ignores_other_errors(self, events_only_client):
+        """
+        Tests that an error that isn't throttling isn't recorded.
+        """
+        # GIVEN
+        controller = AdaptiveConcurrencyController("test", initial_limit=1, max_limit=1)
+
+        # WHEN
+        with controller.monitor(events_only_client):
+            events_only_client.meta.events.emit(
+                "needs-retry.s3.PutObject",
+                response=(MagicMock(status_code=500), {"Error": {"Code": "InternalError"}}),
+                endpoint=None,
+                operation=None,
+                attempts=1,
+                caught_exception=None,
+                request_dict={"context": {}},
+            )
+
+        # THEN
+        assert not controller._sample_throttled
+
+    def test_requests_record_latency(self, s3_client):
+        """
+        Tests that the latency of each request is recorded, and only while the controller monitors
+        the client.
+        """
+        # GIVEN
+        controller = AdaptiveConcurrencyController("test", initial_limit=1, max_limit=1)
+        s3_client.create_bucket(
+            Bucket="test-bucket", CreateBucketConfiguration={"LocationConstraint": "us-west-2"}
+        )
+
+        # WHEN
+        with controller.monitor(s3_client):
+            s3_client.put_object(Bucket="test-bucket", Key="key", Body=b"data")
+        s3_client.put_object(Bucket="test-bucket", Key="key", Body=b"data")
+
+        # THEN
+        assert len(controller._sample_latencies) == 1
+
+
+class TestAdaptiveConcurrencySetting:
+    """
+    Tests for the 'settings.adaptive_transfer_concurrency' configuration setting.
+    """
+
+    def test_disabled_by_default(self, fresh_deadline_config):
+        with adaptive_concurrency("test", MagicMock(), initial_limit=2, max_limit=10) as controller:
+            assert controller is None
+
+    def test_enabled(self, fresh_deadline_config):
+        # GIVEN
+        config.set_setting("settings.adaptive_transfer_concurrency", "true")
+        s3_client = MagicMock()
+
+        # WHEN
+        with adaptive_concurrency("test", s3_client, initial_limit=2, max_limit=10) as controller:
+            # THEN
+            assert controller is not None
+            assert controller.limit == 2
+            assert controller.max_limit == 10
+            assert s3_client.meta.events.register.call_count == 3
+
+    def test_nonvalid_setting(self, fresh_deadline_config):
+        config.set_setting("settings.adaptive_transfer_concurrency", "sometimes")
+
+        with pytest.raises(AssetSyncError):
+            with adaptive_concurrency("test", MagicMock(), initial_limit=2, max_limit=10):
+                pass
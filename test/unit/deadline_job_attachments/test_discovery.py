@@ -0,0 +1,100 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for discovering the files under directories."""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from deadline.job_attachments._discovery import scan_directories
+
+
+class TestScanDirectories:
+    """
+    Tests for scan_directories.
+    """
+
+    def test_scan_directories_finds_nested_files(self, tmp_path: Path):
+        """
+        Tests that the files in all subdirectories are found with their metadata, by the given directory.
+        """
+        # GIVEN
+        first_dir = tmp_path / "first"
+        (first_dir / "a" / "b").mkdir(parents=True)
+        (first_dir / "top.txt").write_text("top")
+        (first_dir / "a" / "middle.txt").write_text("middle")
+        (first_dir / "a" / "b" / "bottom.txt").write_text("bottom!")
+        second_dir = tmp_path / "second"
+        second_dir.mkdir()
+        (second_dir / "other.txt").write_text("other")
+
+        # WHEN
+        results = scan_directories([str(first_dir), str(second_dir)])
+
+        # THEN
+        first_records = {record.path: record for record in results[str(first_dir)].file_records}
+        assert sorted(first_records) == sorted(
+            [
+                str(first_dir / "top.txt"),
+                str(first_dir / "a" / "middle.txt"),
+                str(first_dir / "a" / "b" / "bottom.txt"),
+            ]
+        )
+        bottom_path = first_dir / "a" / "b" / "bottom.txt"
+        bottom_record = first_records[str(bottom_path)]
+        assert bottom_record.size == len("bottom!")
+        assert bottom_record.mtime_ns == os.stat(bottom_path).st_mtime_ns
+        assert bottom_record.resolved_path == str(bottom_path.resolve())
+        assert not bottom_record.is_symlink
+        assert [record.path for record in results[str(second_dir)].file_records] == [
+            str(second_dir / "other.txt")
+        ]
+        assert results[str(first_dir)].unreadable_file_paths == []
+
+    def test_scan_directories_empty_directory(self, tmp_path: Path):
+        """
+        Tests that a directory with only empty subdirectories has no files.
+        """
+        # GIVEN
+        (tmp_path / "empty" / "nested").mkdir(parents=True)
+
+        # WHEN
+        results = scan_directories([str(tmp_path / "empty")])
+
+        # THEN
+        assert results[str(tmp_path / "empty")].file_records == []
+        assert results[str(tmp_path / "empty")].unreadable_file_paths == []
+
+    @pytest.mark.skipif(
+        sys.platform == "win32",
+        reason="Creating symbolic links requires extra privileges on Windows.",
+    )
+    def test_scan_directories_symlinks(self, tmp_path: Path):
+        """
+        Tests that symbolic links to files are found with the metadata of their targets, that symbolic
+        links to directories are not followed, and that broken symbolic links are reported as unreadable.
+        """
+        # GIVEN
+        target_dir = tmp_path / "target"
+        target_dir.mkdir()
+        (target_dir / "target.txt").write_text("the target")
+        scanned_dir = tmp_path / "scanned"
+        scanned_dir.mkdir()
+        (scanned_dir / "file_link.txt").symlink_to(target_dir / "target.txt")
+        (scanned_dir / "dir_link").symlink_to(target_dir, target_is_directory=True)
+        (scanned_dir / "broken_link.txt").symlink_to(tmp_path / "missing.txt")
+
+        # WHEN
+        results = scan_directories([str(scanned_dir)])
+
+        # THEN
+        result = results[str(scanned_dir)]
+        assert len(result.file_records) == 1
+        link_record = result.file_records[0]
+        assert link_record.path == str(scanned_dir / "file_link.txt")
+        assert link_record.resolved_path == str((target_dir / "target.txt").resolve())
+        assert link_record.size == len("the target")
+        assert link_record.is_symlink
+        assert result.unreadable_file_paths == [str(scanned_dir / "broken_link.txt")]
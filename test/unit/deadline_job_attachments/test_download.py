@@ -3,36 +3,48 @@
 """Tests for downloading files from the Job Attachment CAS."""
 from __future__ import annotations
 
+import concurrent.futures
 import os
 import shutil
 
 from collections import Counter
 from dataclasses import dataclass, fields
+from datetime import datetime
 from io import BytesIO
 import json
 from pathlib import Path
 import sys
 import tempfile
-from typing import Any, Callable, List
+import time
+from typing import Any, Callable, List, Sequence, Tuple
 from unittest.mock import MagicMock, call, patch
 
 import boto3
-from botocore.exceptions import BotoCoreError, ClientError, ReadTimeoutError
+from botocore.exceptions import BotoCoreError, ClientError, IncompleteReadError, ReadTimeoutError
 from botocore.stub import Stubber
 
 import pytest
 from moto import mock_aws
 
 import deadline
-from deadline.job_attachments.asset_manifests import HashAlgorithm
+from deadline.client.config import config_file
+from deadline.job_attachments.asset_manifests import HashAlgorithm, hash_data
 from deadline.job_attachments.asset_manifests.base_manifest import (
     BaseAssetManifest,
     BaseManifestPath as BaseManifestPath,
 )
 from deadline.job_attachments.asset_manifests.v2023_03_03 import (
+    AssetManifest as AssetManifestv2023_03_03,
     ManifestPath as ManifestPathv2023_03_03,
 )
 from deadline.job_attachments.asset_manifests.versions import ManifestVersion
+from deadline.job_attachments._aws.aws_clients import get_s3_transfer_manager
+from deadline.job_attachments.caches import HashCache
+from deadline.job_attachments._download_journal import (
+    DownloadJournal,
+    DownloadJournalInUseError,
+    get_download_journal_path,
+)
 from deadline.job_attachments.download import (
     OutputDownloader,
     download_file,
@@ -42,12 +54,18 @@ from deadline.job_attachments.download import (
     get_job_input_paths_by_asset_root,
     get_job_output_paths_by_asset_root,
     get_manifest_from_s3,
+    get_output_manifests_by_asset_root,
     handle_existing_vfs,
+    iter_merged_manifest_paths,
     mount_vfs_from_manifests,
     merge_asset_manifests,
+    _download_files_from_roots_parallel,
     _ensure_paths_within_directory,
     _get_asset_root_from_s3,
     _get_tasks_manifests_keys_from_s3,
+    _get_manifest_journal_key,
+    _open_content_cache,
+    S3_DOWNLOAD_MULTIPART_THRESHOLD,
     VFS_CACHE_REL_PATH_IN_SESSION,
     VFS_MANIFEST_FOLDER_IN_SESSION,
     VFS_MANIFEST_FOLDER_PERMISSIONS,
@@ -57,6 +75,7 @@ from deadline.job_attachments.exceptions import (
     AssetSyncError,
     JobAttachmentsError,
     JobAttachmentsS3ClientError,
+    ManifestNotSortedError,
     MissingAssetRootError,
     PathOutsideDirectoryError,
 )
@@ -72,6 +91,7 @@ from deadline.job_attachments.progress_tracker import (
     DownloadSummaryStatistics,
     ProgressReportMetadata,
     ProgressStatus,
+    ProgressTracker,
 )
 from deadline.job_attachments.asset_manifests.decode import decode_manifest
 
@@ -197,7 +217,7 @@ def assert_download_task_output(
     Assert that the expected files are downloaded when download_job_output is called with a task id.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=str(tmp_path.resolve()),
     ):
         mock_on_downloading_files = MagicMock(return_value=True)
@@ -244,7 +264,7 @@ def assert_download_step_output(
     Assert that the expected files are downloaded when download_job_output is called with a step id.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=str(tmp_path.resolve()),
     ):
         mock_on_downloading_files = MagicMock(return_value=True)
@@ -291,7 +311,7 @@ def assert_download_job_output(
     Assert that the expected files are downloaded when download_job_output is called.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=str(tmp_path.resolve()),
     ):
         mock_on_downloading_files = MagicMock(return_value=True)
@@ -339,7 +359,7 @@ def assert_download_files_in_directory(
     Assert that the expected files are downloaded when download_files_in_directory is called.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=str(tmp_path.resolve()),
     ):
         mock_on_downloading_files = MagicMock(return_value=True)
@@ -498,7 +518,7 @@ def assert_get_job_output_paths_by_asset_root(
     Assert that get_job_output_paths_by_asset_root returns a list of (hash, path) pairs of all output files.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value="/test",
     ):
         paths_by_root = get_job_output_paths_by_asset_root(
@@ -524,7 +544,7 @@ def assert_get_job_output_paths_by_asset_root_when_no_asset_root_throws_error(
     Assert that get_job_output_paths_by_asset_root raises MissingAssetRootError when fail to get manifest.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value=None,
     ), pytest.raises(MissingAssetRootError) as raised_err:
         get_job_output_paths_by_asset_root(s3_settings, farm_id, queue_id, "job-1")
@@ -545,7 +565,7 @@ def assert_get_job_input_output_paths_by_asset_root(
     asset files and output files.
     """
     with patch(
-        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
         return_value="/tmp",
     ):
         paths_by_root = get_job_input_output_paths_by_asset_root(
@@ -1169,7 +1189,7 @@ class TestFullDownload:
         tmp_path: Path,
     ):
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1203,7 +1223,7 @@ class TestFullDownload:
     @mock_aws
     def test_OutputDownloader_set_root_path(self, farm_id, queue_id, tmp_path: Path):
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1251,7 +1271,7 @@ class TestFullDownload:
         resolving the symlink target, the absolute path with ".." removed is stored.
         """
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1289,7 +1309,7 @@ class TestFullDownload:
         Assert a ValueError is thrown when given a non-existent root path.
         """
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1333,7 +1353,7 @@ class TestFullDownload:
         ]
 
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1396,7 +1416,7 @@ class TestFullDownload:
         ]
 
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1475,7 +1495,7 @@ class TestFullDownload:
         expected_files_after_create_copy.extend(expected_files)
 
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1505,7 +1525,7 @@ class TestFullDownload:
         self, farm_id, queue_id, tmp_path: Path
     ):
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value=str(tmp_path.resolve()),
         ):
             output_downloader = OutputDownloader(
@@ -1545,7 +1565,7 @@ class TestFullDownload:
         ]
 
         with patch(
-            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+            f"{deadline.__package__}.job_attachments.download._get_asset_root_from_metadata",
             return_value="/test_root",
         ):
             output_downloader = OutputDownloader(
@@ -1882,12 +1902,12 @@ class TestFullDownload:
     def test_download_file_error_message_on_access_denied(self):
         """
         Test if the function raises the expected exception with a proper error message
-        when S3 client's download_file returns an Access Denied (403) error.
+        when S3 client's get_object returns an Access Denied (403) error.
         """
         s3_client = boto3.client("s3")
         stubber = Stubber(s3_client)
         stubber.add_client_error(
-            "head_object",
+            "get_object",
             service_error_code="AccessDenied",
             service_message="Access Denied",
             http_status_code=403,
@@ -1953,6 +1973,7 @@ class TestFullDownload:
                     "test-bucket",
                     "rootPrefix/Data",
                     mock_s3_client,
+                    small_file_threshold=0,
                 )
             assert isinstance(exc.value.__cause__, BotoCoreError)
             assert (
@@ -2001,6 +2022,7 @@ class TestFullDownload:
                     "test-bucket",
                     "rootPrefix/Data",
                     mock_s3_client,
+                    small_file_threshold=0,
                 )
 
         expected_message = "Test exception"
@@ -2044,6 +2066,7 @@ class TestFullDownload:
                     "test-bucket",
                     "rootPrefix/Data",
                     mock_s3_client,
+                    small_file_threshold=0,
                 )
 
         expected_message = "Your file path is longer than what Windows allow.\nThis could be the error if you do not enable longer file path in Windows"
@@ -2090,6 +2113,7 @@ class TestFullDownload:
                     "test-bucket",
                     "rootPrefix/Data",
                     mock_s3_client,
+                    small_file_threshold=0,
                 )
 
         expected_message = "Test exception\nUNC notation exist, but long path registry not enabled. Undefined error"
@@ -2136,6 +2160,7 @@ class TestFullDownload:
                     "test-bucket",
                     "rootPrefix/Data",
                     mock_s3_client,
+                    small_file_threshold=0,
                 )
 
         expected_message = "Test exception"
@@ -2404,6 +2429,900 @@ def test_merge_asset_manifest_single(test_manifest_one: dict):
     assert actual_merged_manifest == manifest
 
 
+@mock_aws
+def test_get_output_manifests_by_asset_root_from_get_metadata(
+    create_s3_bucket: Callable[[str], None],
+    default_job_attachment_s3_settings: JobAttachmentS3Settings,
+    farm_id: str,
+    queue_id: str,
+    test_manifest_one: dict,
+    test_manifest_two: dict,
+):
+    """
+    Test that output manifests are fetched with the asset root from the metadata of their GET
+    responses, without a HEAD request, and are grouped in the order of their keys.
+    """
+    bucket_name = default_job_attachment_s3_settings.s3BucketName
+    create_s3_bucket(bucket_name)
+    s3_client = boto3.client("s3")
+    objects = [
+        ("task-1/output", test_manifest_one, {"asset-root-json": json.dumps("/root/a")}),
+        ("task-2/output", test_manifest_two, {"asset-root": "/root/b"}),
+        ("task-3/output", test_manifest_two, {"asset-root-json": json.dumps("/root/a")}),
+    ]
+    for key, manifest, metadata in objects:
+        s3_client.put_object(
+            Bucket=bucket_name, Key=key, Body=json.dumps(manifest).encode(), Metadata=metadata
+        )
+
+    with patch(
+        f"{deadline.__package__}.job_attachments.download._get_tasks_manifests_keys_from_s3",
+        return_value=[key for key, _, _ in objects],
+    ), patch(
+        f"{deadline.__package__}.job_attachments.download._get_asset_root_from_s3",
+        side_effect=AssertionError("The asset root should come from the GET response."),
+    ):
+        manifests_by_root = get_output_manifests_by_asset_root(
+            default_job_attachment_s3_settings, farm_id, queue_id, "job-1"
+        )
+
+    assert manifests_by_root == {
+        "/root/a": [
+            decode_manifest(json.dumps(test_manifest_one)),
+            decode_manifest(json.dumps(test_manifest_two)),
+        ],
+        "/root/b": [decode_manifest(json.dumps(test_manifest_two))],
+    }
+
+
+@mock_aws
+def test_get_manifest_from_s3_uses_manifest_cache(
+    fresh_deadline_config,
+    create_s3_bucket: Callable[[str], None],
+    tmp_path: Path,
+    test_manifest_one: dict,
+    test_manifest_two: dict,
+):
+    """
+    Test that with the manifest cache enabled, a manifest that hasn't changed is read from the cache
+    after a conditional GET, and a manifest that has changed is downloaded again.
+    """
+    config_file.set_setting("settings.manifest_cache_megabytes", "1")
+    create_s3_bucket("test-bucket")
+    s3_client = boto3.client("s3")
+    s3_client.put_object(
+        Bucket="test-bucket", Key="manifest_input", Body=json.dumps(test_manifest_one).encode()
+    )
+
+    with patch(
+        f"{deadline.__package__}.job_attachments.caches.CacheDB.get_default_cache_db_file_dir",
+        return_value=str(tmp_path),
+    ), patch(
+        f"{deadline.__package__}.job_attachments.download.decode_manifest",
+        wraps=decode_manifest,
+    ) as mock_decode_manifest:
+        first_manifest = get_manifest_from_s3("manifest_input", "test-bucket")
+        second_manifest = get_manifest_from_s3("manifest_input", "test-bucket")
+
+        assert first_manifest == second_manifest == decode_manifest(json.dumps(test_manifest_one))
+        assert first_manifest is not second_manifest
+        assert mock_decode_manifest.call_count == 1
+
+        s3_client.put_object(
+            Bucket="test-bucket", Key="manifest_input", Body=json.dumps(test_manifest_two).encode()
+        )
+        third_manifest = get_manifest_from_s3("manifest_input", "test-bucket")
+
+        assert third_manifest == decode_manifest(json.dumps(test_manifest_two))
+        assert mock_decode_manifest.call_count == 2
+    assert (tmp_path / "manifest_cache.db").exists()
+
+
+@mock_aws
+def test_download_files_from_manifests_uses_download_cache(
+    fresh_deadline_config,
+    create_s3_bucket: Callable[[str], None],
+    tmp_path: Path,
+    merged_manifest: dict,
+):
+    """
+    Test that with the download cache enabled, a second session copies the files that the first
+    session downloaded from the cache, and reports the bytes found and not found in the cache.
+    """
+    config_file.set_setting("settings.download_cache_megabytes", "1")
+    create_s3_bucket("test-bucket")
+    s3_client = boto3.client("s3")
+    manifest = decode_manifest(json.dumps(merged_manifest))
+    for path in manifest.paths:
+        s3_client.put_object(
+            Bucket="test-bucket",
+            Key=f"Data/{path.hash}.xxh128",
+            Body=path.path[0].encode() * path.size,
+        )
+
+    with patch.dict(os.environ, {"HOME": str(tmp_path / "home")}):
+        first_statistics = download_files_from_manifests(
+            s3_bucket="test-bucket",
+            manifests_by_root={str(tmp_path / "session1"): manifest},
+            cas_prefix="Data",
+        )
+        with patch(
+            f"{deadline.__package__}.job_attachments.download.get_s3_transfer_manager"
+        ) as mock_get_transfer_manager:
+            second_statistics = download_files_from_manifests(
+                s3_bucket="test-bucket",
+                manifests_by_root={str(tmp_path / "session2"): manifest},
+                cas_prefix="Data",
+            )
+
+    mock_get_transfer_manager.return_value.download.assert_not_called()
+    assert (first_statistics.cache_hit_bytes, first_statistics.cache_miss_bytes) == (0, 70)
+    assert (second_statistics.cache_hit_bytes, second_statistics.cache_miss_bytes) == (70, 0)
+    assert second_statistics.processed_files == 4
+    for path in manifest.paths:
+        session_file = tmp_path / "session2" / path.path
+        assert session_file.read_bytes() == (tmp_path / "session1" / path.path).read_bytes()
+        assert session_file.stat().st_mtime == path.mtime / 1000000  # type: ignore[attr-defined]
+
+
+def test_open_content_cache_hardlinks(fresh_deadline_config, tmp_path: Path):
+    """
+    Test that the download cache hardlinks files if the setting is on, unless hardlinks aren't allowed.
+    """
+    config_file.set_setting("settings.download_cache_megabytes", "1")
+    config_file.set_setting("settings.download_cache_hardlinks", "true")
+
+    with patch.dict(os.environ, {"HOME": str(tmp_path / "home")}):
+        content_cache = _open_content_cache()
+        copying_content_cache = _open_content_cache(allow_hardlinks=False)
+
+    assert content_cache is not None and content_cache.use_hardlinks
+    assert copying_content_cache is not None and not copying_content_cache.use_hardlinks
+
+
+@mock_aws
+def test_download_files_from_manifests_with_fs_permission_settings_doesnt_hardlink(
+    create_s3_bucket: Callable[[str], None],
+    tmp_path: Path,
+):
+    """
+    Test that the files of a download whose permissions are changed for the session aren't hardlinked
+    from the download cache, as that would change the permissions of the cached files.
+    """
+    create_s3_bucket("test-bucket")
+    paths: List[BaseManifestPath] = []
+    manifest = AssetManifestv2023_03_03(hash_alg=HashAlgorithm.XXH128, paths=paths, total_size=0)
+
+    with patch(
+        f"{deadline.__package__}.job_attachments.download._open_content_cache", return_value=None
+    ) as mock_open_content_cache, patch(
+        f"{deadline.__package__}.job_attachments.download._set_fs_group"
+    ):
+        download_files_from_manifests(
+            s3_bucket="test-bucket",
+            manifests_by_root={str(tmp_path / "root"): manifest},
+            cas_prefix="Data",
+            fs_permission_settings=PosixFileSystemPermissionSettings(
+                os_user="user", os_group="group", dir_mode=0o20, file_mode=0o20
+            ),
+        )
+
+    mock_open_content_cache.assert_called_once_with(allow_hardlinks=False)
+
+
+def test_download_files_from_manifests_downloads_each_hash_once(
+    create_s3_bucket: Callable[[str], None],
+    tmp_path: Path,
+):
+    """
+    Test that files with the same hash are downloaded from S3 once and copied to the other files'
+    paths with their own modification times, and that the copies are counted as skipped.
+    """
+    create_s3_bucket("test-bucket")
+    s3_client = boto3.client("s3")
+    s3_client.put_object(Bucket="test-bucket", Key="Data/a.xxh128", Body=b"aaaa")
+    s3_client.put_object(Bucket="test-bucket", Key="Data/b.xxh128", Body=b"bb")
+    paths: List[BaseManifestPath] = [
+        ManifestPathv2023_03_03(path="one/a.txt", hash="a", size=4, mtime=1000000),
+        ManifestPathv2023_03_03(path="two/a.txt", hash="a", size=4, mtime=2000000),
+        ManifestPathv2023_03_03(path="a_copy.txt", hash="a", size=4, mtime=3000000),
+        ManifestPathv2023_03_03(path="b.txt", hash="b", size=2, mtime=4000000),
+    ]
+    manifest = AssetManifestv2023_03_03(hash_alg=HashAlgorithm.XXH128, paths=paths, total_size=14)
+    with patch(
+        f"{deadline.__package__}.job_attachments.download.download_file", wraps=download_file
+    ) as mock_download_file:
+        statistics = download_files_from_manifests(
+            s3_bucket="test-bucket",
+            manifests_by_root={str(tmp_path): manifest},
+            cas_prefix="Data",
+        )
+
+    assert sorted(c.args[0].hash for c in mock_download_file.call_args_list) == ["a", "b"]
+    for path in paths:
+        local_file = tmp_path / path.path
+        assert local_file.read_bytes() == (b"aaaa" if path.hash == "a" else b"bb")
+        assert local_file.stat().st_mtime == path.mtime / 1000000
+    assert statistics.processed_files == 2
+    assert statistics.skipped_files == 2
+    assert statistics.skipped_bytes == 8
+
+
+def test_download_files_from_roots_parallel_shares_one_pool(tmp_path: Path):
+    """
+    Test that the files of several roots are downloaded on a single thread pool, with small files
+    scheduled before large files, and that the downloaded paths are returned by root.
+    """
+    large_size = S3_DOWNLOAD_MULTIPART_THRESHOLD + 1
+    files_by_root: List[Tuple[str, HashAlgorithm, Sequence[BaseManifestPath]]] = [
+        (
+            str(tmp_path / "root1"),
+            HashAlgorithm.XXH128,
+            [
+                ManifestPathv2023_03_03(path="large.bin", hash="l", size=large_size, mtime=1),
+                ManifestPathv2023_03_03(path="small1.txt", hash="s1", size=1, mtime=1),
+            ],
+        ),
+        (
+            str(tmp_path / "root2"),
+            HashAlgorithm.XXH128,
+            [ManifestPathv2023_03_03(path="small2.txt", hash="s2", size=1, mtime=1)],
+        ),
+    ]
+    downloaded_hashes: list[str] = []
+
+    def download_file(file, hash_algorithm, local_download_dir, *args):
+        downloaded_hashes.append(file.hash)
+        return (file.size, Path(local_download_dir) / file.path)
+
+    with patch(
+        f"{deadline.__package__}.job_attachments.download.download_file", side_effect=download_file
+    ), patch(
+        f"{deadline.__package__}.job_attachments.download.concurrent.futures.ThreadPoolExecutor",
+        wraps=concurrent.futures.ThreadPoolExecutor,
+    ) as mock_executor:
+        downloaded_files_by_root = _download_files_from_roots_parallel(
+            files_by_root,
+            num_download_workers=1,
+            s3_bucket="test-bucket",
+            cas_prefix="Data",
+        )
+
+    mock_executor.assert_called_once()
+    assert downloaded_hashes == ["s1", "s2", "l"]
+    assert downloaded_files_by_root == {
+        str(tmp_path / "root1"): [
+            str((tmp_path / "root1" / "small1.txt").resolve()),
+            str((tmp_path / "root1" / "large.bin").resolve()),
+        ],
+        str(tmp_path / "root2"): [str((tmp_path / "root2" / "small2.txt").resolve())],
+    }
+
+
+@pytest.mark.parametrize(
+    "small_file_threshold,expected_operations",
+    [
+        pytest.param(1024, ["GetObject"], id="small"),
+        pytest.param(0, ["HeadObject", "GetObject"], id="transfer_manager"),
+    ],
+)
+def test_download_file_small_file_requests(
+    create_s3_bucket: Callable[[str], None],
+    tmp_path: Path,
+    small_file_threshold: int,
+    expected_operations: list[str],
+):
+    """
+    Test that a file up to the small file threshold is downloaded with a single GetObject request,
+    without the HeadObject request of the S3 transfer manager, and is written the same either way.
+    """
+    create_s3_bucket("test-bucket")
+    s3_client = boto3.client("s3")
+    s3_client.put_object(Bucket="test-bucket", Key="Data/a.xxh128", Body=b"abc")
+    operations: list[str] = []
+    s3_client.meta.events.register(
+        "before-call.s3", lambda model, **kwargs: operations.append(model.name)
+    )
+    file = ManifestPathv2023_03_03(path="dir/a.txt", hash="a", size=3, mtime=1000000)
+    progress_tracker = ProgressTracker(
+        status=ProgressStatus.DOWNLOAD_IN_PROGRESS, total_files=1, total_bytes=3
+    )
+
+    (file_bytes, local_file_name) = download_file(
+        file,
+        HashAlgorithm.XXH128,
+        str(tmp_path),
+        "test-bucket",
+        "Data",
+        s3_client,
+        progress_tracker=progress_tracker,
+        small_file_threshold=small_file_threshold,
+    )
+
+    assert operations == expected_operations
+    assert (file_bytes, local_file_name) == (3, tmp_path / "dir" / "a.txt")
+    assert local_file_name is not None
+    assert local_file_name.read_bytes() == b"abc"
+    assert local_file_name.stat().st_mtime == 1
+    assert progress_tracker.processed_bytes == 3
+    assert os.listdir(tmp_path / "dir") == ["a.txt"]
+
+
+def test_download_file_small_retries_interrupted_read(tmp_path: Path):
+    """
+    Test that a small file download is retried when reading the object fails, without counting the
+    bytes of the failed attempt in the progress.
+    """
+    good_body = MagicMock()
+    good_body.iter_chunks.return_value = iter([b"abc"])
+    bad_body = MagicMock()
+
+    def interrupted_chunks(chunk_size):
+        yield b"ab"
+        raise IncompleteReadError(actual_bytes=2, expected_bytes=3)
+
+    bad_body.iter_chunks.side_effect = interrupted_chunks
+    s3_client = MagicMock()
+    s3_client.get_object.side_effect = [{"Body": bad_body}, {"Body": good_body}]
+    file = ManifestPathv2023_03_03(path="a.txt", hash="a", size=3, mtime=1000000)
+    progress_tracker = ProgressTracker(
+        status=ProgressStatus.DOWNLOAD_IN_PROGRESS, total_files=1, total_bytes=3
+    )
+
+    with patch(
+        f"{deadline.__package__}.job_attachments.download.get_account_id", return_value="123"
+    ):
+        (_, local_file_name) = download_file(
+            file,
+            HashAlgorithm.XXH128,
+            str(tmp_path),
+            "test-bucket",
+            "Data",
+            s3_client,
+            progress_tracker=progress_tracker,
+            small_file_threshold=1024,
+        )
+
+    assert s3_client.get_object.call_count == 2
+    assert local_file_name is not None
+    assert local_file_name.read_bytes() == b"abc"
+    assert progress_tracker.processed_bytes == 3
+
+
+def test_download_file_large_in_ranged_parts(
+    fresh_deadline_config,
+    create_s3_bucket: Callable[[str], None],
+    tmp_path: Path,
+):
+    """
+    Test that with a large file download part size set, a large file is downloaded with a ranged
+    GetObject request per part, written into place, and that the limit of the concurrency controller
+    caps the parts in flight.
+    """
+    config_file.set_setting("settings.large_file_download_part_megabytes", "1")
+    create_s3_bucket("test-bucket")
+    s3_client = boto3.client("s3")
+    size = 2 * 1024 * 1024 + 3
+    body = os.urandom(size)
+    s3_client.put_object(Bucket="test-bucket", Key="Data/a.xxh128", Body=body)
+    requests: list[tuple[str, Any]] = []
+    s3_client.meta.events.register(
+        "before-parameter-build.s3",
+        lambda model, params, **kwargs: requests.append((model.name, params.get("Range"))),
+    )
+    file = ManifestPathv2023_03_03(path="a.bin", hash="a", size=size, mtime=1000000)
+    progress_tracker = ProgressTracker(
+        status=ProgressStatus.DOWNLOAD_IN_PROGRESS, total_files=1, total_bytes=size
+    )
+
+    (_, local_file_name) = download_file(
+        file,
+        HashAlgorithm.XXH128,
+        str(tmp_path),
+        "test-bucket",
+        "Data",
+        s3_client,
+        progress_tracker=progress_tracker,
+        small_file_threshold=0,
+        concurrency_controller=MagicMock(limit=1),
+    )
+
+    assert requests == [
+        ("GetObject", "bytes=0-1048575"),
+        ("GetObject", "bytes=1048576-2097151"),
+        ("GetObject", f"bytes=2097152-{size - 1}"),
+    ]
+    assert local_file_name is not None
+    assert local_file_name.read_bytes() == body
+    assert local_file_name.stat().st_mtime == 1
+    assert progress_tracker.processed_bytes == size
+    assert os.listdir(tmp_path) == ["a.bin"]
+
+
+def test_download_file_large_part_failure_removes_file(fresh_deadline_config, tmp_path: Path):
+    """
+    Test that if a part of a large file fails to download, the error is raised and the partially
+    written file is removed.
+    """
+    config_file.set_setting("settings.large_file_download_part_megabytes", "1")
+    size = 2 * 1024 * 1024
+    good_body = MagicMock()
+    good_body.iter_chunks.return_value = iter([b"a" * (1024 * 1024)])
+    s3_client = MagicMock()
+    s3_client.get_object.side_effect = [
+        {"Body": good_body},
+        ClientError(
+            {"Error": {"Code": "AccessDenied"}, "ResponseMetadata": {"HTTPStatusCode": 403}},
+            "GetObject",
+        ),
+    ]
+    file = ManifestPathv2023_03_03(path="a.bin", hash="a", size=size, mtime=1000000)
+
+    with patch(
+        f"{deadline.__package__}.job_attachments.download.get_account_id", return_value="123"
+    ), pytest.raises(JobAttachmentsS3ClientError):
+        download_file(
+            file,
+            HashAlgorithm.XXH128,
+            str(tmp_path),
+            "test-bucket",
+            "Data",
+            s3_client,
+            small_file_threshold=0,
+            concurrency_controller=MagicMock(limit=1),
+        )
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_download_journal_records_and_verifies_files(tmp_path: Path):
+    """
+    Test that a resumed download journal reports the files recorded as complete, unless the local file
+    has changed since it was recorded, and that a journal that isn't resumed doesn't read them.
+    """
+    cache_dir = str(tmp_path / "cache")
+    local_root = tmp_path / "root"
+    (local_root / "dir").mkdir(parents=True)
+    local_file = local_root / "dir" / "a.txt"
+    local_file.write_bytes(b"abc")
+    file = ManifestPathv2023_03_03(path="dir/a.txt", hash="a", size=3, mtime=1000000)
+    journal = DownloadJournal(cache_dir, str(local_root), "job")
+    journal.record_file(file, local_file)
+    journal.record_part(file, 0, 2)
+    journal.close()
+
+    journal_path = get_download_journal_path(cache_dir, str(local_root), "job")
+    assert journal_path.parent == tmp_path / "cache" / "download_journals"
+    with open(journal_path, "a") as journal_file:
+        journal_file.write('{"file": "truncated')
+    resumed = DownloadJournal(cache_dir, str(local_root), "job", resume=True)
+    assert resumed.get_completed_file(file) == local_file
+    assert resumed.get_completed_parts(file) == {(0, 2)}
+    changed_file = ManifestPathv2023_03_03(path="dir/a.txt", hash="b", size=3, mtime=1000000)
+    assert resumed.get_completed_file(changed_file) is None
+    os.utime(local_file, ns=(0, 0))
+    assert resumed.get_completed_file(file) is None
+    resumed.close()
+
+    assert DownloadJournal(cache_dir, str(local_root), "job").get_completed_parts(file) == set()
+
+
+def test_download_journal_is_locked_by_its_download(tmp_path: Path):
+    """
+    Test that the journal of a download can't be opened by a concurrent download of the same files to
+    the same root, but can for other files, and that closing it doesn't remove the other journals.
+    """
+    cache_dir = str(tmp_path / "cache")
+    local_root = str(tmp_path / "root")
+    journal = DownloadJournal(cache_dir, local_root, "job-1")
+
+    with pytest.raises(DownloadJournalInUseError):
+        DownloadJournal(cache_dir, local_root, "job-1", resume=True)
+    other_journal = DownloadJournal(cache_dir, local_root, "job-2")
+    journal.close(remove=True)
+
+    assert not get_download_journal_path(cache_dir, local_root, "job-1").exists()
+    assert get_download_journal_path(cache_dir, local_root, "job-2").is_file()
+    other_journal.close(remove=True)
+    DownloadJournal(cache_dir, local_root, "job-1").close(remove=True)
+
+
+def test_download_files_from_manifests_resumes_from_journal(
+    create_s3_bucket: Callable[[str], None],
+    tmp_path: Path,
+):
+    """
+    Test that after a download fails, resuming it only downloads the files that it didn't complete,
+    and that the journal in the cache directory is removed once the download completes.
+    """
+    create_s3_bucket("test-bucket")
+    s3_client = boto3.client("s3")
+    s3_client.put_object(Bucket="test-bucket", Key="Data/a.xxh128", Body=b"aaaa")
+    s3_client.put_object(Bucket="test-bucket", Key="Data/b.xxh128", Body=b"bb")
+    paths: List[BaseManifestPath] = [
+        ManifestPathv2023_03_03(path="a.txt", hash="a", size=4, mtime=1000000),
+        ManifestPathv2023_03_03(path="dir/b.txt", hash="b", size=2, mtime=2000000),
+    ]
+    manifest = AssetManifestv2023_03_03(hash_alg=HashAlgorithm.XXH128, paths=paths, total_size=6)
+    local_root = str(tmp_path / "root")
+    cache_dir = str(tmp_path / "cache")
+    journal_path = get_download_journal_path(
+        cache_dir, local_root, _get_manifest_journal_key(manifest)
+    )
+
+    def fail_on_b(file, *args, **kwargs):
+        if file.hash == "b":
+            raise AssetSyncError("Interrupted")
+        return download_file(file, *args, **kwargs)
+
+    with patch(
+        f"{deadline.__package__}.job_attachments.download.download_file", side_effect=fail_on_b
+    ), pytest.raises(AssetSyncError):
+        download_files_from_manifests(
+            s3_bucket="test-bucket",
+            manifests_by_root={local_root: manifest},
+            cas_prefix="Data",
+            download_journal_dir=cache_dir,
+        )
+    assert journal_path.is_file()
+
+    with patch(
+        f"{deadline.__package__}.job_attachments.download.download_file", wraps=download_file
+    ) as mock_download_file:
+        download_files_from_manifests(
+            s3_bucket="test-bucket",
+            manifests_by_root={local_root: manifest},
+            cas_prefix="Data",
+            download_journal_dir=cache_dir,
+            resume=True,
+        )
+
+    assert [c.args[0].hash for c in mock_download_file.call_args_list] == ["b"]
+    assert (tmp_path / "root" / "a.txt").read_bytes() == b"aaaa"
+    assert (tmp_path / "root" / "dir" / "b.txt").read_bytes() == b"bb"
+    assert not journal_path.exists()
+
+
+def test_download_files_from_manifests_without_journal_dir_isnt_journaled(
+    create_s3_bucket: Callable[[str], None],
+    tmp_path: Path,
+):
+    """
+    Test that a download from manifests isn't journaled unless a download journal directory is given.
+    """
+    create_s3_bucket("test-bucket")
+    boto3.client("s3").put_object(Bucket="test-bucket", Key="Data/a.xxh128", Body=b"aaaa")
+    paths: List[BaseManifestPath] = [
+        ManifestPathv2023_03_03(path="a.txt", hash="a", size=4, mtime=1000000)
+    ]
+    manifest = AssetManifestv2023_03_03(hash_alg=HashAlgorithm.XXH128, paths=paths, total_size=4)
+
+    with patch(f"{deadline.__package__}.job_attachments.download.DownloadJournal") as mock_journal:
+        download_files_from_manifests(
+            s3_bucket="test-bucket",
+            manifests_by_root={str(tmp_path / "root"): manifest},
+            cas_prefix="Data",
+        )
+
+    mock_journal.assert_not_called()
+    assert (tmp_path / "root" / "a.txt").read_bytes() == b"aaaa"
+
+
+def test_download_file_large_resumes_completed_parts(
+    fresh_deadline_config,
+    create_s3_bucket: Callable[[str], None],
+    tmp_path: Path,
+):
+    """
+    Test that a large file downloaded in ranged parts only downloads the parts that its download
+    journal doesn't record as complete in its partially downloaded file.
+    """
+    config_file.set_setting("settings.large_file_download_part_megabytes", "1")
+    create_s3_bucket("test-bucket")
+    s3_client = boto3.client("s3")
+    part_size = 1024 * 1024
+    size = 2 * part_size + 3
+    body = os.urandom(size)
+    s3_client.put_object(Bucket="test-bucket", Key="Data/0123456789.xxh128", Body=body)
+    ranges: list[Any] = []
+    s3_client.meta.events.register(
+        "before-parameter-build.s3",
+        lambda model, params, **kwargs: ranges.append(params.get("Range")),
+    )
+    file = ManifestPathv2023_03_03(path="a.bin", hash="0123456789", size=size, mtime=1000000)
+    local_root = tmp_path / "root"
+    local_root.mkdir()
+    (local_root / "a.bin.01234567").write_bytes(body[:part_size] + bytes(size - part_size))
+    cache_dir = str(tmp_path / "cache")
+    download_journal = DownloadJournal(cache_dir, str(local_root), "job")
+    download_journal.record_part(file, 0, part_size)
+    download_journal.close()
+    download_journal = DownloadJournal(cache_dir, str(local_root), "job", resume=True)
+    progress_tracker = ProgressTracker(
+        status=ProgressStatus.DOWNLOAD_IN_PROGRESS, total_files=1, total_bytes=size
+    )
+
+    (_, local_file_name) = download_file(
+        file,
+        HashAlgorithm.XXH128,
+        str(local_root),
+        "test-bucket",
+        "Data",
+        s3_client,
+        progress_tracker=progress_tracker,
+        small_file_threshold=0,
+        concurrency_controller=MagicMock(limit=1),
+        download_journal=download_journal,
+    )
+    download_journal.close(remove=True)
+
+    assert ranges == [f"bytes={part_size}-{2 * part_size - 1}", f"bytes={2 * part_size}-{size - 1}"]
+    assert local_file_name is not None
+    assert local_file_name.read_bytes() == body
+    assert progress_tracker.processed_bytes == size
+    assert os.listdir(local_root) == ["a.bin"]
+
+
+def test_download_files_from_roots_parallel_sync_downloads_changed_files(
+    create_s3_bucket: Callable[[str], None],
+    tmp_path: Path,
+):
+    """
+    Test that with the SYNC file conflict resolution, only the files that are missing or whose
+    contents differ from the manifest are downloaded, that the unchanged files are counted as skipped,
+    and that syncing again downloads nothing.
+    """
+    create_s3_bucket("test-bucket")
+    s3_client = boto3.client("s3")
+    contents = {"a.txt": b"aaaa", "b.txt": b"bbbb", "c.txt": b"cc"}
+    paths = []
+    for path, body in contents.items():
+        file_hash = hash_data(body, HashAlgorithm.XXH128)
+        s3_client.put_object(Bucket="test-bucket", Key=f"Data/{file_hash}.xxh128", Body=body)
+        paths.append(
+            ManifestPathv2023_03_03(path=path, hash=file_hash, size=len(body), mtime=1000000)
+        )
+    local_root = tmp_path / "root"
+    local_root.mkdir()
+    # Unchanged, but with a different modified time, so its hash is checked.
+    (local_root / "a.txt").write_bytes(b"aaaa")
+    # Changed, with the same size.
+    (local_root / "b.txt").write_bytes(b"xxxx")
+    files_by_root: List[Tuple[str, HashAlgorithm, Sequence[BaseManifestPath]]] = [
+        (str(local_root), HashAlgorithm.XXH128, paths)
+    ]
+
+    for expected_downloads in [["b.txt", "c.txt"], []]:
+        progress_tracker = ProgressTracker(
+            status=ProgressStatus.DOWNLOAD_IN_PROGRESS, total_files=3, total_bytes=10
+        )
+        with patch(
+            f"{deadline.__package__}.job_attachments.download.download_file", wraps=download_file
+        ) as mock_download_file, HashCache(str(tmp_path / "cache")) as hash_cache:
+            _download_files_from_roots_parallel(
+                files_by_root,
+                num_download_workers=1,
+                s3_bucket="test-bucket",
+                cas_prefix="Data",
+                s3_client=s3_client,
+                file_mod_time=time.time(),
+                progress_tracker=progress_tracker,
+                file_conflict_resolution=FileConflictResolution.SYNC,
+                hash_cache=hash_cache,
+            )
+
+        assert sorted(c.args[0].path for c in mock_download_file.call_args_list) == (
+            expected_downloads
+        )
+        assert progress_tracker.skipped_files == 3 - len(expected_downloads)
+        assert sorted(os.listdir(local_root)) == ["a.txt", "b.txt", "c.txt"]
+        for path, body in contents.items():
+            assert (local_root / path).read_bytes() == body
+
+
+def test_download_file_transfer_manager_uses_all_connections(
+    create_s3_bucket: Callable[[str], None],
+    tmp_path: Path,
+):
+    """
+    Test that a file downloaded by the S3 transfer manager uses one that makes as many requests at
+    once as the S3 client has connections, rather than the default of 10.
+    """
+    create_s3_bucket("test-bucket")
+    s3_client = boto3.client("s3")
+    s3_client.put_object(Bucket="test-bucket", Key="Data/a.xxh128", Body=b"abc")
+    file = ManifestPathv2023_03_03(path="a.txt", hash="a", size=3, mtime=1000000)
+
+    with patch(
+        f"{deadline.__package__}.job_attachments.download.get_s3_transfer_manager",
+        wraps=get_s3_transfer_manager,
+    ) as mock_get_s3_transfer_manager:
+        download_file(
+            file,
+            HashAlgorithm.XXH128,
+            str(tmp_path / "root"),
+            "test-bucket",
+            "Data",
+            s3_client,
+            small_file_threshold=0,
+        )
+
+    mock_get_s3_transfer_manager.assert_called_once_with(s3_client=s3_client, max_concurrency=50)
+    assert (tmp_path / "root" / "a.txt").read_bytes() == b"abc"
+
+
+def test_download_file_verifies_and_records_hash(
+    create_s3_bucket: Callable[[str], None],
+    tmp_path: Path,
+):
+    """
+    Test that with a hash cache, a file downloaded with a single request is verified against its hash
+    in the manifest and its hash is recorded in the hash cache at its final modified time, and that a
+    file that doesn't match its hash is removed.
+    """
+    small_file_threshold = 1024
+    create_s3_bucket("test-bucket")
+    s3_client = boto3.client("s3")
+    file_hash = hash_data(b"abc", HashAlgorithm.XXH128)
+    s3_client.put_object(Bucket="test-bucket", Key=f"Data/{file_hash}.xxh128", Body=b"abc")
+    s3_client.put_object(Bucket="test-bucket", Key="Data/0bad.xxh128", Body=b"abc")
+    file = ManifestPathv2023_03_03(path="a.txt", hash=file_hash, size=3, mtime=1000000)
+    bad_file = ManifestPathv2023_03_03(path="bad.txt", hash="0bad", size=3, mtime=1000000)
+
+    with HashCache(str(tmp_path / "cache")) as hash_cache:
+        (_, local_file_name) = download_file(
+            file,
+            HashAlgorithm.XXH128,
+            str(tmp_path / "root"),
+            "test-bucket",
+            "Data",
+            s3_client,
+            small_file_threshold=small_file_threshold,
+            hash_cache=hash_cache,
+        )
+        with pytest.raises(AssetSyncError, match="doesn't match its hash 0bad"):
+            download_file(
+                bad_file,
+                HashAlgorithm.XXH128,
+                str(tmp_path / "root"),
+                "test-bucket",
+                "Data",
+                s3_client,
+                small_file_threshold=small_file_threshold,
+                hash_cache=hash_cache,
+            )
+        assert local_file_name is not None
+        entry = hash_cache.get_entry(str(local_file_name.resolve()), HashAlgorithm.XXH128)
+
+    assert entry is not None
+    assert entry.file_hash == file_hash
+    assert entry.last_modified_time == str(datetime.fromtimestamp(1))
+    assert os.listdir(tmp_path / "root") == ["a.txt"]
+
+
+def test_download_file_transfer_manager_isnt_hashed(
+    create_s3_bucket: Callable[[str], None],
+    tmp_path: Path,
+):
+    """
+    Test that with a hash cache, a file downloaded by the S3 transfer manager isn't read again to hash
+    it, and so isn't recorded in the hash cache.
+    """
+    create_s3_bucket("test-bucket")
+    s3_client = boto3.client("s3")
+    file_hash = hash_data(b"abc", HashAlgorithm.XXH128)
+    s3_client.put_object(Bucket="test-bucket", Key=f"Data/{file_hash}.xxh128", Body=b"abc")
+    file = ManifestPathv2023_03_03(path="a.txt", hash=file_hash, size=3, mtime=1000000)
+
+    with HashCache(str(tmp_path / "cache")) as hash_cache, patch(
+        f"{deadline.__package__}.job_attachments.download.hash_file"
+    ) as mock_hash_file:
+        (_, local_file_name) = download_file(
+            file,
+            HashAlgorithm.XXH128,
+            str(tmp_path / "root"),
+            "test-bucket",
+            "Data",
+            s3_client,
+            small_file_threshold=0,
+            hash_cache=hash_cache,
+        )
+        assert local_file_name is not None
+        entry = hash_cache.get_entry(str(local_file_name.resolve()), HashAlgorithm.XXH128)
+
+    mock_hash_file.assert_not_called()
+    assert entry is None
+    assert local_file_name.read_bytes() == b"abc"
+
+
+def _manifest_of(paths: list[tuple[str, str]]) -> AssetManifestv2023_03_03:
+    return AssetManifestv2023_03_03(
+        hash_alg=HashAlgorithm.XXH128,
+        paths=[
+            ManifestPathv2023_03_03(path=path, hash=hash, size=1, mtime=1) for path, hash in paths
+        ],
+        total_size=len(paths),
+    )
+
+
+def test_merge_asset_manifests_many_sorted():
+    """
+    Test that merging many manifests in canonical order keeps the path from the last manifest, and
+    returns the paths in canonical order.
+    """
+    manifests: List[BaseAssetManifest] = [
+        _manifest_of([("a.txt", "a0"), ("c.txt", "c0"), ("\ue000.txt", "e0")]),
+        _manifest_of([("b.txt", "b1"), ("c.txt", "c1"), ("\U0001f600.txt", "f1")]),
+        _manifest_of([]),
+        _manifest_of([("a.txt", "a3"), ("c.txt", "c3")]),
+    ]
+
+    merged_manifest = merge_asset_manifests(manifests)
+
+    assert merged_manifest is not None
+    assert [(path.path, path.hash) for path in merged_manifest.paths] == [
+        ("a.txt", "a3"),
+        ("b.txt", "b1"),
+        ("c.txt", "c3"),
+        # In UTF-16, the surrogate pair of the emoji comes before the private use character.
+        ("\U0001f600.txt", "f1"),
+        ("\ue000.txt", "e0"),
+    ]
+    assert merged_manifest.totalSize == 5  # type: ignore[attr-defined]
+
+
+def test_merge_asset_manifests_unsorted():
+    """
+    Test that manifests whose paths aren't in canonical order are still merged, keeping the path
+    from the last manifest.
+    """
+    manifests: List[BaseAssetManifest] = [
+        _manifest_of([("c.txt", "c0"), ("a.txt", "a0")]),
+        _manifest_of([("b.txt", "b1"), ("a.txt", "a1")]),
+    ]
+
+    with pytest.raises(ManifestNotSortedError):
+        list(iter_merged_manifest_paths(manifests))
+
+    merged_manifest = merge_asset_manifests(manifests)
+
+    assert merged_manifest is not None
+    assert [(path.path, path.hash) for path in merged_manifest.paths] == [
+        ("a.txt", "a1"),
+        ("b.txt", "b1"),
+        ("c.txt", "c0"),
+    ]
+
+
+def test_merge_asset_manifests_duplicate_path_in_manifest():
+    """
+    Test that a manifest that lists the same path twice is merged, keeping the last of its entries.
+    """
+    manifests: List[BaseAssetManifest] = [
+        _manifest_of([("a.txt", "a0"), ("a.txt", "a1")]),
+        _manifest_of([("b.txt", "b1")]),
+    ]
+
+    merged_manifest = merge_asset_manifests(manifests)
+
+    assert merged_manifest is not None
+    assert [(path.path, path.hash) for path in merged_manifest.paths] == [
+        ("a.txt", "a1"),
+        ("b.txt", "b1"),
+    ]
+
+
+def test_merge_asset_manifests_different_hash_algorithms():
+    """
+    Test that merging manifests with different hash algorithms raises an error
+    """
+    other_manifest = _manifest_of([("a.txt", "a1")])
+    other_manifest.hashAlg = MagicMock(value="other")
+
+    with pytest.raises(NotImplementedError):
+        merge_asset_manifests([_manifest_of([("a.txt", "a0")]), other_manifest])
+
+
 def on_downloading_files(progress: ProgressReportMetadata) -> bool:
     return True
 
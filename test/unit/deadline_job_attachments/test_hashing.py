@@ -0,0 +1,104 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for selecting where files are hashed."""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from deadline.client import config
+from deadline.job_attachments._hashing import (
+    PROCESS_HASHING_MIN_FILE_SIZE,
+    HashingBackend,
+    get_hashing_backend,
+    hash_file_in_pool,
+    hashing_process_pool,
+)
+from deadline.job_attachments.asset_manifests import HashAlgorithm, hash_data, hash_file
+from deadline.job_attachments.exceptions import AssetSyncError
+
+
+@pytest.mark.parametrize(
+    "setting_value, expected_backend",
+    [
+        ("THREAD", HashingBackend.THREAD),
+        ("process", HashingBackend.PROCESS),
+    ],
+)
+def test_get_hashing_backend(fresh_deadline_config, setting_value, expected_backend):
+    """
+    Tests that the hashing backend is read from the configuration, case-insensitively.
+    """
+    config.set_setting("settings.file_hashing_backend", setting_value)
+    assert get_hashing_backend() == expected_backend
+
+
+def test_get_hashing_backend_nonvalid(fresh_deadline_config):
+    """
+    Tests that a nonvalid hashing backend setting raises an AssetSyncError.
+    """
+    config.set_setting("settings.file_hashing_backend", "GPU")
+    with pytest.raises(AssetSyncError) as err:
+        get_hashing_backend()
+    assert "'file_hashing_backend' (GPU) must be one of ['THREAD', 'PROCESS']" in str(err.value)
+
+
+def test_hashing_process_pool_thread_backend():
+    """
+    Tests that no process pool is created for the THREAD backend.
+    """
+    with hashing_process_pool(HashingBackend.THREAD) as process_pool:
+        assert process_pool is None
+
+
+def test_hash_file_in_pool_dispatches_by_size():
+    """
+    Tests that only files of at least PROCESS_HASHING_MIN_FILE_SIZE bytes are hashed in the process pool.
+    """
+    # GIVEN
+    process_pool = MagicMock()
+    process_pool.submit.return_value.result.return_value = "large_hash"
+    hash_function = MagicMock(return_value="small_hash")
+
+    # WHEN
+    small_hash = hash_file_in_pool(
+        hash_function,
+        "small",
+        HashAlgorithm.XXH128,
+        PROCESS_HASHING_MIN_FILE_SIZE - 1,
+        process_pool,
+    )
+    large_hash = hash_file_in_pool(
+        hash_function, "large", HashAlgorithm.XXH128, PROCESS_HASHING_MIN_FILE_SIZE, process_pool
+    )
+
+    # THEN
+    assert small_hash == "small_hash"
+    assert large_hash == "large_hash"
+    hash_function.assert_called_once_with("small", HashAlgorithm.XXH128)
+    process_pool.submit.assert_called_once_with(hash_function, "large", HashAlgorithm.XXH128)
+
+
+def test_hash_file_in_process_pool(tmp_path: Path):
+    """
+    Tests that a file hashed in the process pool gets the same hash as when hashed on this thread.
+    """
+    # GIVEN
+    test_file = tmp_path / "test.bin"
+    test_file.write_bytes(b"test data")
+
+    # WHEN
+    with hashing_process_pool(HashingBackend.PROCESS) as process_pool:
+        assert isinstance(process_pool, ProcessPoolExecutor)
+        file_hash = hash_file_in_pool(
+            hash_file,
+            str(test_file),
+            HashAlgorithm.XXH128,
+            PROCESS_HASHING_MIN_FILE_SIZE,
+            process_pool,
+        )
+
+    # THEN
+    assert file_hash == hash_data(b"test data", HashAlgorithm.XXH128)
@@ -155,6 +155,8 @@ class TestDownloadSummaryStatistics:
                 "/home/username/outputs2": 2,
                 "/home/username/outputs3": 4,
             },
+            cache_hit_bytes=600,
+            cache_miss_bytes=100,
         )
         summary2 = DownloadSummaryStatistics(
             total_time=10.0,
@@ -169,6 +171,7 @@ class TestDownloadSummaryStatistics:
                 "/home/username/outputs3": 5,
                 "/home/username/outputs4": 3,
             },
+            cache_miss_bytes=800,
         )
 
         expected_aggregated_stats = DownloadSummaryStatistics(
@@ -186,11 +189,29 @@ class TestDownloadSummaryStatistics:
                 "/home/username/outputs3": 9,
                 "/home/username/outputs4": 3,
             },
+            cache_hit_bytes=600,
+            cache_miss_bytes=900,
         )
 
         aggregated = summary1.aggregate(summary2)
         assert aggregated == expected_aggregated_stats
 
+    def test_convert_to_summary_statistics(self):
+        """
+        Tests that converting to SummaryStatistics drops the download-specific fields.
+        """
+        summary = DownloadSummaryStatistics(
+            total_files=2,
+            processed_files=2,
+            file_counts_by_root_directory={"/home/username/outputs": 2},
+            cache_hit_bytes=10,
+            cache_miss_bytes=20,
+        )
+
+        assert summary.convert_to_summary_statistics() == SummaryStatistics(
+            total_files=2, processed_files=2
+        )
+
     def test_aggregate_with_summary_stats(self):
         """
         Tests if it raises exception when DownloadSummaryStatistics calls aggreate function
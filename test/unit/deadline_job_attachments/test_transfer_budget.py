@@ -0,0 +1,109 @@
+# Copyright Amazon.com, Inc. or its affiliates. All Rights Reserved.
+
+"""Tests for the budget shared by concurrent transfers."""
+
+import threading
+import time
+
+import pytest
+
+from deadline.job_attachments._transfer_budget import TransferBudget
+
+
+class TestTransferBudget:
+    """
+    Tests for TransferBudget.
+    """
+
+    def test_reserve_tracks_in_flight(self):
+        """
+        Tests that a reservation counts towards the budget only while it's held.
+        """
+        # GIVEN
+        budget = TransferBudget(max_bytes=100, max_connections=10)
+
+        # WHEN
+        with budget.reserve(40, 3):
+            # THEN
+            assert budget.bytes_in_flight == 40
+            assert budget.connections_in_flight == 3
+        assert budget.bytes_in_flight == 0
+        assert budget.connections_in_flight == 0
+
+    @pytest.mark.parametrize(
+        "first_reservation, second_reservation",
+        [
+            pytest.param((60, 1), (60, 1), id="bytes"),
+            pytest.param((10, 6), (10, 6), id="connections"),
+        ],
+    )
+    def test_reserve_waits_for_budget(self, first_reservation, second_reservation):
+        """
+        Tests that a reservation that doesn't fit in the budget waits until enough of it is released.
+        """
+        # GIVEN
+        budget = TransferBudget(max_bytes=100, max_connections=10)
+        second_reserved = threading.Event()
+
+        def reserve_second():
+            with budget.reserve(*second_reservation):
+                second_reserved.set()
+
+        # WHEN
+        with budget.reserve(*first_reservation):
+            thread = threading.Thread(target=reserve_second)
+            thread.start()
+            # THEN
+            assert not second_reserved.wait(timeout=0.2)
+        assert second_reserved.wait(timeout=5)
+        thread.join()
+
+    def test_reserve_larger_than_budget_runs_alone(self):
+        """
+        Tests that a reservation larger than the whole budget is reduced to the budget, rather than
+        waiting forever.
+        """
+        # GIVEN
+        budget = TransferBudget(max_bytes=100, max_connections=10)
+
+        # WHEN
+        with budget.reserve(1000, 50):
+            # THEN
+            assert budget.bytes_in_flight == 100
+            assert budget.connections_in_flight == 10
+
+    def test_reserve_in_order(self):
+        """
+        Tests that reservations are granted in the order they're requested, so a small reservation that
+        would fit doesn't overtake a large one that's waiting.
+        """
+        # GIVEN
+        budget = TransferBudget(max_bytes=100, max_connections=10)
+        order = []
+
+        def reserve(name, num_bytes):
+            with budget.reserve(num_bytes, 1):
+                order.append(name)
+
+        # WHEN
+        with budget.reserve(50, 1):
+            large = threading.Thread(target=reserve, args=("large", 100))
+            large.start()
+            time.sleep(0.1)
+            small = threading.Thread(target=reserve, args=("small", 10))
+            small.start()
+            time.sleep(0.1)
+            assert order == []
+        large.join(timeout=5)
+        small.join(timeout=5)
+
+        # THEN
+        assert order == ["large", "small"]
+
+    @pytest.mark.parametrize("max_bytes, max_connections", [(0, 1), (1, 0)])
+    def test_nonvalid_budget(self, max_bytes, max_connections):
+        """
+        Tests that a budget must be positive.
+        """
+        with pytest.raises(ValueError):
+            TransferBudget(max_bytes=max_bytes, max_connections=max_connections)
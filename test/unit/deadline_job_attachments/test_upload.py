@@ -6,13 +6,15 @@ Tests related to the uploading of assets.
 
 import os
 import sys
+import threading
+import time
 from copy import deepcopy
 from datetime import datetime
 from io import BytesIO
 from logging import DEBUG, INFO
 from pathlib import Path
 from typing import Dict, List, Set, Tuple
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
 import boto3
 import py.path
@@ -29,7 +31,8 @@ from deadline.job_attachments.asset_manifests import (
     HashAlgorithm,
     ManifestVersion,
 )
-from deadline.job_attachments.caches import HashCacheEntry, S3CheckCacheEntry
+from deadline.job_attachments.asset_manifests.v2023_03_03 import AssetManifest, ManifestPath
+from deadline.job_attachments.caches import HashCache, HashCacheEntry, S3CheckCacheEntry
 from deadline.job_attachments.exceptions import (
     AssetSyncError,
     JobAttachmentsS3ClientError,
@@ -40,16 +43,20 @@ from deadline.job_attachments.exceptions import (
 from deadline.job_attachments.models import (
     AssetRootGroup,
     Attachments,
+    FileRecord,
     FileSystemLocation,
     FileSystemLocationType,
     ManifestProperties,
     JobAttachmentS3Settings,
+    LargeFileUploadMode,
+    OutputFile,
     StorageProfileOperatingSystemFamily,
     PathFormat,
     StorageProfile,
 )
 from deadline.job_attachments.progress_tracker import (
     ProgressStatus,
+    ProgressTracker,
     SummaryStatistics,
 )
 from deadline.job_attachments.upload import FileStatus, S3AssetManager, S3AssetUploader
@@ -627,6 +634,171 @@ class TestUpload:
             )
             assert_expected_files_on_s3(bucket, expected_files=expected_files)
 
+    @mock_aws
+    @pytest.mark.parametrize(
+        "num_input_files",
+        [
+            1,
+            100,
+        ],
+    )
+    def test_hash_and_upload_assets(
+        self,
+        tmpdir,
+        farm_id,
+        queue_id,
+        assert_expected_files_on_s3,
+        num_input_files: int,
+    ):
+        """
+        Test that hashing and uploading the input files in a pipeline uploads the same files and
+        manifest, and reports the same progress, as hashing them all before uploading them.
+        """
+        # GIVEN
+        asset_root = str(tmpdir)
+
+        asset_manager = S3AssetManager(
+            farm_id=farm_id,
+            queue_id=queue_id,
+            job_attachment_settings=self.job_attachment_s3_settings,
+        )
+        # Make some of the files 'large' files, which are uploaded one at a time.
+        asset_manager.asset_uploader.small_file_threshold = 6
+
+        mock_on_preparing_to_submit = MagicMock(return_value=True)
+        mock_on_uploading_assets = MagicMock(return_value=True)
+
+        input_files = []
+        expected_total_input_bytes = 0
+        test_dir = tmpdir.mkdir("large_submit")
+        for i in range(num_input_files):
+            test_file = test_dir.join(f"test{i}.txt")
+            test_file.write(f"test {i}")
+            expected_total_input_bytes += test_file.size()
+            input_files.append(test_file)
+
+        cache_dir = tmpdir.mkdir("cache")
+
+        with patch(
+            f"{deadline.__package__}.job_attachments.upload.PathFormat.get_host_path_format",
+            return_value=PathFormat.POSIX,
+        ), patch(
+            f"{deadline.__package__}.job_attachments.upload.hash_data",
+            side_effect=["c", "manifesthash"],
+        ), patch(
+            f"{deadline.__package__}.job_attachments.upload.hash_file",
+            side_effect=[str(i) for i in range(num_input_files)],
+        ), patch(
+            f"{deadline.__package__}.job_attachments.models._generate_random_guid",
+            return_value="0000",
+        ):
+            upload_group = asset_manager.prepare_paths_for_upload(
+                input_paths=input_files,
+                output_paths=[str(Path(asset_root).joinpath("outputs"))],
+                referenced_paths=[],
+            )
+
+            # WHEN
+            (
+                hash_summary_statistics,
+                upload_summary_statistics,
+                asset_root_manifests,
+                attachments,
+            ) = asset_manager.hash_and_upload_assets(
+                asset_groups=upload_group.asset_groups,
+                total_input_files=upload_group.total_input_files,
+                total_input_bytes=upload_group.total_input_bytes,
+                hash_cache_dir=cache_dir,
+                s3_check_cache_dir=cache_dir,
+                on_preparing_to_submit=mock_on_preparing_to_submit,
+                on_uploading_assets=mock_on_uploading_assets,
+            )
+
+        # THEN
+        assert attachments == Attachments(
+            manifests=[
+                ManifestProperties(
+                    rootPath=asset_root,
+                    rootPathFormat=PathFormat.POSIX,
+                    inputManifestPath=f"{farm_id}/{queue_id}/Inputs/0000/c_input",
+                    inputManifestHash="manifesthash",
+                    outputRelativeDirectories=["outputs"],
+                )
+            ],
+        )
+        assert len(asset_root_manifests) == 1
+        assert asset_root_manifests[0].asset_manifest is not None
+        assert len(asset_root_manifests[0].asset_manifest.paths) == num_input_files
+
+        assert_progress_report_last_callback(
+            num_input_files=num_input_files,
+            expected_total_input_bytes=expected_total_input_bytes,
+            on_preparing_to_submit=mock_on_preparing_to_submit,
+            on_uploading_assets=mock_on_uploading_assets,
+        )
+        for summary_statistics in [hash_summary_statistics, upload_summary_statistics]:
+            assert_progress_report_summary_statistics(
+                actual_summary_statistics=summary_statistics,
+                processed_files=num_input_files,
+                processed_bytes=expected_total_input_bytes,
+                skipped_files=0,
+                skipped_bytes=0,
+            )
+
+        s3 = boto3.Session(region_name="us-west-2").resource("s3")  # pylint: disable=invalid-name
+        bucket = s3.Bucket(self.job_attachment_s3_settings.s3BucketName)
+        expected_files = set(
+            [
+                f"{self.job_attachment_s3_settings.full_cas_prefix()}/{i}.xxh128"
+                for i in range(num_input_files)
+            ]
+        )
+        expected_files.add(
+            f"assetRoot/Manifests/{farm_id}/{queue_id}/Inputs/0000/c_input",
+        )
+        assert_expected_files_on_s3(bucket, expected_files=expected_files)
+
+    @mock_aws
+    def test_hash_and_upload_assets_upload_error_stops_hashing(self, tmpdir, farm_id, queue_id):
+        """
+        Test that an error uploading a file in the hash and upload pipeline is raised, and that
+        no manifest is uploaded.
+        """
+        # GIVEN
+        asset_manager = S3AssetManager(
+            farm_id=farm_id,
+            queue_id=queue_id,
+            job_attachment_settings=self.job_attachment_s3_settings,
+        )
+        test_dir = tmpdir.mkdir("inputs")
+        input_files = []
+        for i in range(10):
+            test_file = test_dir.join(f"test{i}.txt")
+            test_file.write(f"test {i}")
+            input_files.append(test_file)
+        upload_group = asset_manager.prepare_paths_for_upload(
+            input_paths=input_files, output_paths=[], referenced_paths=[]
+        )
+        cache_dir = tmpdir.mkdir("cache")
+
+        with patch.object(
+            asset_manager.asset_uploader,
+            "upload_object_to_cas",
+            side_effect=AssetSyncError("upload failed"),
+        ), patch.object(asset_manager.asset_uploader, "upload_manifest") as mock_upload_manifest:
+            # WHEN
+            with pytest.raises(AssetSyncError, match="upload failed"):
+                asset_manager.hash_and_upload_assets(
+                    asset_groups=upload_group.asset_groups,
+                    total_input_files=upload_group.total_input_files,
+                    total_input_bytes=upload_group.total_input_bytes,
+                    hash_cache_dir=cache_dir,
+                    s3_check_cache_dir=cache_dir,
+                )
+
+        # THEN
+        mock_upload_manifest.assert_not_called()
+
     @mock_aws
     @pytest.mark.parametrize(
         "num_input_files",
@@ -1323,6 +1495,18 @@ class TestUpload:
                 "Failed to parse configuration settings. Please ensure that the following settings in the config file are integers",
                 id="small_file_threshold_multiplier value is not a number.",
             ),
+            pytest.param(
+                "upload_max_megabytes_in_flight",
+                "0",
+                "'upload_max_megabytes_in_flight' (0) must be positive integer.",
+                id="upload_max_megabytes_in_flight value is 0.",
+            ),
+            pytest.param(
+                "large_file_upload_mode",
+                "SOMETIMES",
+                "'large_file_upload_mode' (SOMETIMES) must be one of ['SERIAL', 'CONCURRENT'].",
+                id="large_file_upload_mode value is not a mode.",
+            ),
         ],
     )
     def test_asset_uploader_constructor_with_nonvalid_config_settings(
@@ -1336,6 +1520,162 @@ class TestUpload:
             _ = S3AssetUploader()
         assert expected_error_msg in str(err.value)
 
+    def test_asset_uploader_constructor_concurrent_large_file_uploads(self, fresh_deadline_config):
+        """
+        Test that in the CONCURRENT large file upload mode, enough large files are uploaded at once to
+        use all of the connections, within a transfer budget of the configured size.
+        """
+        config.set_setting("settings.large_file_upload_mode", "concurrent")
+        config.set_setting("settings.upload_max_megabytes_in_flight", "100")
+
+        uploader = S3AssetUploader()
+
+        assert uploader.large_file_upload_mode == LargeFileUploadMode.CONCURRENT
+        assert uploader.num_large_file_upload_workers == 5
+        assert uploader._transfer_budget.max_bytes == 100 * 1024 * 1024
+        assert uploader._transfer_budget.max_connections == 50
+
+    def test_upload_file_to_s3_uses_transfer_budget(self, tmp_path: Path, fresh_deadline_config):
+        """
+        Test that an upload uses a transfer manager that makes as many requests at once as the budget
+        has connections, and reserves at most that many connections, and as many bytes as that many
+        multipart chunks.
+        """
+        uploader = S3AssetUploader()
+        file = tmp_path / "test_file"
+        file.write_bytes(b"abc")
+        mock_transfer_manager = MagicMock()
+
+        with patch(
+            f"{deadline.__package__}.job_attachments.upload.get_s3_transfer_manager",
+            return_value=mock_transfer_manager,
+        ) as mock_get_s3_transfer_manager, patch.object(
+            uploader._transfer_budget, "reserve", wraps=uploader._transfer_budget.reserve
+        ) as mock_reserve:
+            uploader.upload_file_to_s3(file, "test-bucket", "test_key")
+
+        mock_get_s3_transfer_manager.assert_called_once_with(
+            s3_client=uploader._s3, max_concurrency=50
+        )
+        mock_transfer_manager.upload.assert_called_once()
+        mock_reserve.assert_called_once_with(3, 1)
+        # A large file doesn't take the whole bytes budget, only as many chunks as are in memory.
+        assert uploader._get_upload_bytes_in_flight(10 * 1024**3) == 50 * 8 * 1024 * 1024
+        assert uploader._get_upload_bytes_in_flight(100) == 100
+        # A multipart upload uses at most as many connections as the transfer manager makes requests.
+        assert uploader._get_upload_connections(10 * 1024**3) == 50
+        assert uploader._get_upload_connections(3 * 8 * 1024 * 1024) == 3
+        assert uploader._get_upload_connections(100) == 1
+
+    @pytest.mark.parametrize(
+        "large_file_upload_mode, expected_max_large_uploads_at_once",
+        [
+            (LargeFileUploadMode.SERIAL, 1),
+            (LargeFileUploadMode.CONCURRENT, 3),
+        ],
+    )
+    def test_upload_input_files_large_file_upload_mode(
+        self,
+        tmpdir,
+        fresh_deadline_config,
+        large_file_upload_mode: LargeFileUploadMode,
+        expected_max_large_uploads_at_once: int,
+    ):
+        """
+        Test that large files are uploaded one at a time in SERIAL mode, and several at a time in
+        CONCURRENT mode.
+        """
+        # GIVEN
+        config.set_setting("settings.large_file_upload_mode", large_file_upload_mode.value)
+        uploader = S3AssetUploader()
+        uploader.small_file_threshold = 1
+        manifest = AssetManifest(
+            hash_alg=HashAlgorithm.XXH128,
+            paths=[
+                ManifestPath(path=f"large{i}", hash=f"hash{i}", size=10, mtime=1) for i in range(3)
+            ],
+            total_size=30,
+        )
+        uploads_in_flight = 0
+        max_uploads_in_flight = 0
+        lock = threading.Lock()
+        all_in_flight = threading.Barrier(3)
+
+        def fake_upload_object_to_cas(*args, **kwargs):
+            nonlocal uploads_in_flight, max_uploads_in_flight
+            with lock:
+                uploads_in_flight += 1
+                max_uploads_in_flight = max(max_uploads_in_flight, uploads_in_flight)
+            try:
+                # Wait briefly for the other uploads to be in flight too, if they can be.
+                all_in_flight.wait(timeout=0.5)
+            except threading.BrokenBarrierError:
+                pass
+            with lock:
+                uploads_in_flight -= 1
+            return (True, 10)
+
+        # WHEN
+        with patch.object(
+            uploader, "upload_object_to_cas", side_effect=fake_upload_object_to_cas
+        ), patch.object(uploader, "_resolve_existing_cas_keys_by_listing", return_value=None):
+            uploader.upload_input_files(
+                manifest=manifest,
+                s3_bucket="test-bucket",
+                source_root=Path(tmpdir),
+                s3_cas_prefix="assetRoot/Data",
+                s3_check_cache_dir=str(tmpdir),
+            )
+
+        # THEN
+        assert max_uploads_in_flight == expected_max_large_uploads_at_once
+
+    def test_upload_input_files_adaptive_concurrency(self, tmpdir, fresh_deadline_config):
+        """
+        Test that with adaptive concurrency, there is a worker for each connection, but only as many
+        uploads run at once as the controller's limit, which starts at the number of upload workers.
+        """
+        # GIVEN
+        config.set_setting("settings.adaptive_transfer_concurrency", "true")
+        config.set_setting("settings.s3_max_pool_connections", "20")
+        uploader = S3AssetUploader()
+        uploader.num_upload_workers = 2
+        manifest = AssetManifest(
+            hash_alg=HashAlgorithm.XXH128,
+            paths=[
+                ManifestPath(path=f"small{i}", hash=f"hash{i}", size=10, mtime=1) for i in range(6)
+            ],
+            total_size=60,
+        )
+        uploads_in_flight = 0
+        max_uploads_in_flight = 0
+        lock = threading.Lock()
+
+        def fake_upload_object_to_cas(*args, **kwargs):
+            nonlocal uploads_in_flight, max_uploads_in_flight
+            with lock:
+                uploads_in_flight += 1
+                max_uploads_in_flight = max(max_uploads_in_flight, uploads_in_flight)
+            time.sleep(0.05)
+            with lock:
+                uploads_in_flight -= 1
+            return (True, 10)
+
+        # WHEN
+        with patch.object(
+            uploader, "upload_object_to_cas", side_effect=fake_upload_object_to_cas
+        ), patch.object(uploader, "_resolve_existing_cas_keys_by_listing", return_value=None):
+            uploader.upload_input_files(
+                manifest=manifest,
+                s3_bucket="test-bucket",
+                source_root=Path(tmpdir),
+                s3_cas_prefix="assetRoot/Data",
+                s3_check_cache_dir=str(tmpdir),
+            )
+
+        # THEN
+        assert max_uploads_in_flight == 2
+
     @mock_aws
     def test_file_already_uploaded_bucket_in_different_account(self):
         """
@@ -1625,6 +1965,8 @@ class TestUpload:
         test_entry = HashCacheEntry(test_file, HashAlgorithm.XXH128, "a", file_time)
         hash_cache = MagicMock()
         hash_cache.get_entry.return_value = test_entry
+        hash_cache.get_entries.return_value = {str(Path(test_file).resolve()): test_entry}
+        hash_cache.WRITE_BATCH_SIZE = HashCache.WRITE_BATCH_SIZE
 
         with patch(f"{deadline.__package__}.job_attachments.upload.hash_file", side_effect=["a"]):
             asset_manager = S3AssetManager(
@@ -1647,6 +1989,110 @@ class TestUpload:
             assert man_path.path == "test.txt"
             assert man_path.hash == "a"
             hash_cache.put_entry.assert_not_called()
+            hash_cache.flush_entries.assert_called_once_with([])
+
+    def test_create_manifest_file_uses_bulk_hash_cache_api(self, farm_id, queue_id, tmpdir):
+        """
+        Test that creating a manifest loads the hash cache entries of the asset root with a single query,
+        and writes the entries of hashed files in batches, so a warm re-run doesn't query per file.
+        """
+        # GIVEN
+        root_dir = tmpdir.mkdir("root")
+        input_paths = []
+        for i in range(5):
+            test_file = root_dir.join(f"test{i}.txt")
+            test_file.write(f"test{i}")
+            input_paths.append(Path(test_file))
+        asset_manager = S3AssetManager(
+            farm_id=farm_id,
+            queue_id=queue_id,
+            job_attachment_settings=self.job_attachment_s3_settings,
+            asset_manifest_version=ManifestVersion.v2023_03_03,
+        )
+        cache_dir = str(tmpdir.mkdir("cache"))
+
+        # WHEN
+        with patch.object(HashCache, "WRITE_BATCH_SIZE", 2), HashCache(cache_dir) as hash_cache:
+            with patch.object(
+                hash_cache, "put_entries", wraps=hash_cache.put_entries
+            ) as mock_put_entries:
+                cold_manifest = asset_manager._create_manifest_file(
+                    input_paths, str(root_dir), hash_cache=hash_cache
+                )
+            written_entries = sum(len(call.args[0]) for call in mock_put_entries.call_args_list)
+
+        with HashCache(cache_dir) as hash_cache:
+            with patch.object(hash_cache, "get_entry") as mock_get_entry, patch(
+                f"{deadline.__package__}.job_attachments.upload.hash_file"
+            ) as mock_hash_file:
+                warm_manifest = asset_manager._create_manifest_file(
+                    input_paths, str(root_dir), hash_cache=hash_cache
+                )
+
+        # THEN
+        assert written_entries == 5
+        assert warm_manifest.paths == cold_manifest.paths
+        assert [path.hash for path in warm_manifest.paths] == [
+            path.hash for path in cold_manifest.paths
+        ]
+        mock_get_entry.assert_not_called()
+        mock_hash_file.assert_not_called()
+
+    def test_prepare_and_hash_with_file_records(self, farm_id, queue_id, tmpdir):
+        """
+        Test that the metadata of input files with records is taken from the records when grouping,
+        totalling and hashing them, rather than queried from the file system again.
+        """
+        # GIVEN
+        root_dir = tmpdir.mkdir("root")
+        test_file = root_dir.join("test.txt")
+        test_file.write("test")
+        file_path = str(Path(test_file).absolute())
+        # The record's size and time differ from the file's, to show where they're taken from.
+        file_record = FileRecord(
+            path=file_path,
+            resolved_path=str(Path(file_path).resolve()),
+            size=1234,
+            mtime_ns=1_700_000_000_123_456_789,
+            is_symlink=False,
+        )
+        asset_manager = S3AssetManager(
+            farm_id=farm_id,
+            queue_id=queue_id,
+            job_attachment_settings=self.job_attachment_s3_settings,
+        )
+
+        # WHEN
+        with patch.object(Path, "exists") as mock_exists, patch.object(
+            Path, "is_dir"
+        ) as mock_is_dir:
+            upload_group = asset_manager.prepare_paths_for_upload(
+                input_paths=[file_path],
+                output_paths=[],
+                referenced_paths=[],
+                file_records={file_path: file_record},
+            )
+        with HashCache(str(tmpdir.mkdir("cache"))) as hash_cache, patch(
+            f"{deadline.__package__}.job_attachments.upload.hash_file", return_value="a"
+        ):
+            group = upload_group.asset_groups[0]
+            manifest = asset_manager._create_manifest_file(
+                sorted(group.inputs),
+                group.root_path,
+                hash_cache,
+                file_records=group.input_file_records,
+            )
+
+        # THEN
+        mock_exists.assert_not_called()
+        mock_is_dir.assert_not_called()
+        assert upload_group.total_input_files == 1
+        assert upload_group.total_input_bytes == 1234
+        assert group.root_path == str(Path(file_path).parent)
+        assert group.input_file_records == {file_path: file_record}
+        assert [(path.path, path.size, path.mtime) for path in manifest.paths] == [
+            ("test.txt", 1234, 1_700_000_000_123_456)
+        ]
 
     @mock_aws
     def test_asset_management_misconfigured_inputs(self, farm_id, queue_id, tmpdir):
@@ -2640,6 +3086,234 @@ class TestUpload:
                 expected_files={"prefix/test-hash.xxh128"},
             )
 
+    @mock_aws
+    def test_get_existing_cas_keys_lists_cas_prefix(self):
+        """
+        Tests that when there are enough objects to check, their existence is resolved by listing the
+        CAS prefix, sharded by the first character of the hashes, rather than a head-object call per object.
+        """
+        # GIVEN
+        s3 = boto3.client("s3")
+        bucket = self.job_attachment_s3_settings.s3BucketName
+        for existing_hash in ["0a", "0b", "f1"]:
+            s3.put_object(Bucket=bucket, Key=f"prefix/{existing_hash}.xxh128", Body=b"")
+        s3.put_object(Bucket=bucket, Key="prefix/ff.xxh128", Body=b"")
+        s3_keys = [f"prefix/{file_hash}.xxh128" for file_hash in ["0a", "0b", "0c", "f1", "e5"]]
+        uploader = S3AssetUploader()
+
+        # WHEN
+        with patch(
+            f"{deadline.__package__}.job_attachments.upload.S3_CAS_LISTING_MIN_OBJECTS", 1
+        ), patch.object(uploader, "file_already_uploaded") as mock_file_already_uploaded:
+            existing_cas_keys = uploader.get_existing_cas_keys(bucket, "prefix", s3_keys)
+
+        # THEN
+        assert existing_cas_keys == {"prefix/0a.xxh128", "prefix/0b.xxh128", "prefix/f1.xxh128"}
+        mock_file_already_uploaded.assert_not_called()
+        assert uploader._get_cas_shard_prefixes("prefix", set(s3_keys)) == [
+            "prefix/0",
+            "prefix/e",
+            "prefix/f",
+        ]
+
+    @mock_aws
+    def test_get_existing_cas_keys_uses_head_object_for_large_cas(self):
+        """
+        Tests that when listing the CAS prefix is estimated to take more requests than checking each
+        object individually, a head-object call is done for each object instead.
+        """
+        # GIVEN
+        s3 = boto3.client("s3")
+        bucket = self.job_attachment_s3_settings.s3BucketName
+        s3.put_object(Bucket=bucket, Key="prefix/0a.xxh128", Body=b"")
+        s3_keys = ["prefix/0a.xxh128", "prefix/0b.xxh128"]
+        uploader = S3AssetUploader()
+
+        # WHEN
+        with patch(
+            f"{deadline.__package__}.job_attachments.upload.S3_CAS_LISTING_MIN_OBJECTS", 1
+        ), patch.object(
+            uploader, "_estimate_cas_object_count", return_value=10_000_000
+        ), patch.object(
+            uploader, "_list_object_keys"
+        ) as mock_list_object_keys:
+            existing_cas_keys = uploader.get_existing_cas_keys(bucket, "prefix", s3_keys)
+
+        # THEN
+        assert existing_cas_keys == {"prefix/0a.xxh128"}
+        mock_list_object_keys.assert_not_called()
+
+    @mock_aws
+    def test_upload_output_files_uploads_while_files_are_produced(
+        self, tmp_path: Path, assert_expected_files_on_s3
+    ):
+        """
+        Tests that output files are uploaded as their batches are taken from the given iterable, before
+        the later batches are produced, and that files that are in S3 already are skipped, with the
+        existence of the files of each batch that aren't known to be in S3 resolved in bulk.
+        """
+        # GIVEN
+        s3 = boto3.client("s3")
+        bucket = self.job_attachment_s3_settings.s3BucketName
+        s3.put_object(Bucket=bucket, Key="prefix/existing.xxh128", Body=b"a")
+        uploader = S3AssetUploader()
+        output_files = []
+        for name in ["first", "known", "existing", "last"]:
+            local_path = tmp_path / f"{name}.txt"
+            local_path.write_text(name)
+            output_files.append(
+                OutputFile(
+                    file_size=len(name),
+                    file_hash=name,
+                    rel_path=f"{name}.txt",
+                    full_path=str(local_path),
+                    s3_key=f"prefix/{name}.xxh128",
+                    in_s3=name == "known",
+                    base_dir=str(tmp_path),
+                )
+            )
+        progress_tracker = ProgressTracker(
+            status=ProgressStatus.UPLOAD_IN_PROGRESS,
+            total_files=len(output_files),
+            total_bytes=sum(output_file.file_size for output_file in output_files),
+        )
+        first_file_uploaded = threading.Event()
+        upload_file_to_s3 = uploader.upload_file_to_s3
+
+        def upload_and_signal(*args, **kwargs):
+            upload_file_to_s3(*args, **kwargs)
+            if kwargs["s3_upload_key"] == "prefix/first.xxh128":
+                first_file_uploaded.set()
+
+        def produce_output_file_batches():
+            yield output_files[:1]
+            # The next files are only produced once the first has been uploaded.
+            assert first_file_uploaded.wait(timeout=10)
+            yield output_files[1:]
+
+        # WHEN
+        with patch.object(
+            uploader, "upload_file_to_s3", side_effect=upload_and_signal
+        ), patch.object(
+            uploader, "get_existing_cas_keys", wraps=uploader.get_existing_cas_keys
+        ) as mock_get_existing_cas_keys:
+            uploader.upload_output_files(
+                produce_output_file_batches(), bucket, "prefix", progress_tracker
+            )
+
+        # THEN
+        assert_expected_files_on_s3(
+            boto3.Session(region_name="us-west-2").resource("s3").Bucket(bucket),
+            expected_files={"prefix/first.xxh128", "prefix/existing.xxh128", "prefix/last.xxh128"},
+        )
+        assert mock_get_existing_cas_keys.call_args_list == [
+            call(bucket, "prefix", ["prefix/first.xxh128"]),
+            call(bucket, "prefix", ["prefix/existing.xxh128", "prefix/last.xxh128"]),
+        ]
+        summary_statistics = progress_tracker.get_summary_statistics()
+        assert (summary_statistics.processed_files, summary_statistics.processed_bytes) == (
+            2,
+            len("first") + len("last"),
+        )
+        assert (summary_statistics.skipped_files, summary_statistics.skipped_bytes) == (
+            2,
+            len("known") + len("existing"),
+        )
+
+    @mock_aws
+    def test_get_existing_cas_keys_uses_head_object_when_listing_is_denied(self):
+        """
+        Tests that when listing the CAS prefix is denied, as it needs the 's3:ListBucket' permission,
+        a head-object call is done for each object instead of failing.
+        """
+        # GIVEN
+        s3 = boto3.client("s3")
+        bucket = self.job_attachment_s3_settings.s3BucketName
+        s3.put_object(Bucket=bucket, Key="prefix/0a.xxh128", Body=b"")
+        s3_keys = ["prefix/0a.xxh128", "prefix/0b.xxh128"]
+        uploader = S3AssetUploader()
+        access_denied = ClientError(
+            {
+                "Error": {"Code": "AccessDenied", "Message": "Access Denied"},
+                "ResponseMetadata": {"HTTPStatusCode": 403},
+            },
+            "ListObjectsV2",
+        )
+
+        # WHEN
+        with patch(
+            f"{deadline.__package__}.job_attachments.upload.S3_CAS_LISTING_MIN_OBJECTS", 1
+        ), patch.object(uploader._s3, "get_paginator", side_effect=access_denied):
+            existing_cas_keys = uploader.get_existing_cas_keys(bucket, "prefix", s3_keys)
+
+        # THEN
+        assert existing_cas_keys == {"prefix/0a.xxh128"}
+
+    @mock_aws
+    def test_estimate_cas_object_count(self):
+        """
+        Tests that the number of objects in the CAS is estimated from the number of objects under the sample prefix.
+        """
+        # GIVEN
+        s3 = boto3.client("s3")
+        bucket = self.job_attachment_s3_settings.s3BucketName
+        for file_hash in ["000a", "000b", "001a"]:
+            s3.put_object(Bucket=bucket, Key=f"prefix/{file_hash}.xxh128", Body=b"")
+
+        # WHEN
+        estimate = S3AssetUploader()._estimate_cas_object_count(bucket, "prefix")
+
+        # THEN
+        assert estimate == 2 * 16**3
+
+    @mock_aws
+    def test_upload_input_files_resolves_existing_objects_by_listing(self, tmpdir, caplog):
+        """
+        Tests that uploading input files with bulk existence resolution skips the objects that were
+        listed in the CAS, and uploads the rest without any head-object calls.
+        """
+        # GIVEN
+        caplog.set_level(DEBUG)
+        asset_root = tmpdir.mkdir("test-root")
+        asset_root.join("a.txt").write("a")
+        asset_root.join("b.txt").write("bb")
+        s3 = boto3.client("s3")
+        bucket = self.job_attachment_s3_settings.s3BucketName
+        s3.put_object(Bucket=bucket, Key="prefix/0a.xxh128", Body=b"a")
+        manifest = AssetManifest(
+            hash_alg=HashAlgorithm.XXH128,
+            paths=[
+                ManifestPath(path="a.txt", hash="0a", size=1, mtime=1),
+                ManifestPath(path="b.txt", hash="0b", size=2, mtime=1),
+            ],
+            total_size=3,
+        )
+        uploader = S3AssetUploader()
+        progress_tracker = ProgressTracker(
+            status=ProgressStatus.UPLOAD_IN_PROGRESS, total_files=2, total_bytes=3
+        )
+
+        # WHEN
+        with patch(
+            f"{deadline.__package__}.job_attachments.upload.S3_CAS_LISTING_MIN_OBJECTS", 1
+        ), patch.object(uploader, "file_already_uploaded") as mock_file_already_uploaded:
+            uploader.upload_input_files(
+                manifest=manifest,
+                s3_bucket=bucket,
+                source_root=Path(asset_root),
+                s3_cas_prefix="prefix",
+                progress_tracker=progress_tracker,
+                s3_check_cache_dir=str(tmpdir.mkdir("cache")),
+            )
+
+        # THEN
+        mock_file_already_uploaded.assert_not_called()
+        assert "a.txt because it has already been uploaded to s3" in caplog.text
+        assert s3.get_object(Bucket=bucket, Key="prefix/0b.xxh128")["Body"].read() == b"bb"
+        assert progress_tracker.processed_files == 1
+        assert progress_tracker.skipped_files == 1
+        assert progress_tracker.skipped_bytes == 1
+
 
 def assert_progress_report_last_callback(
     num_input_files: int,